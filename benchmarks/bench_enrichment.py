@@ -0,0 +1,145 @@
+"""
+End-to-end benchmark of the LLM enrichment stage against the local stub backend.
+
+Runs detection and run_entity_enrichment on a document with LLM_BACKEND=stub,
+so no network or API quota is used, and reports wall time, request throughput
+and per-request latency percentiles (including retries and injected errors).
+Run from project root:
+
+    PYTHONPATH=src python benchmarks/bench_enrichment.py data/sample_document.txt \
+        --latency lognormal:0.4,0.6 --error-rate 0.05 --mode chunked
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+_src = Path(__file__).resolve().parents[1] / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+
+class _TimedBackend:
+    """Wrap a backend and record the latency of every attempt (and of the first streamed piece)."""
+
+    name = "timed"
+
+    def __init__(self, inner):  # noqa: ANN001
+        self.inner = inner
+        self.samples: list[float] = []
+        self.first_piece: list[float] = []
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, temperature: float):  # noqa: ANN201
+        t0 = time.perf_counter()
+        try:
+            return self.inner.generate(prompt, temperature)
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._lock:
+                self.samples.append(time.perf_counter() - t0)
+
+    def generate_stream(self, prompt: str, temperature: float):  # noqa: ANN201
+        from semantic_topic_mapper.llm.backends import stream_response
+
+        t0 = time.perf_counter()
+        first = True
+        try:
+            for piece in stream_response(self.inner, prompt, temperature):
+                if first:
+                    first = False
+                    with self._lock:
+                        self.first_piece.append(time.perf_counter() - t0)
+                yield piece
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._lock:
+                self.samples.append(time.perf_counter() - t0)
+
+
+def _pct(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="Document to enrich.")
+    parser.add_argument("--latency", default="lognormal:0.4,0.6", help="Stub latency spec.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--mode", default=None, help="LLM_ENRICHMENT_MODE override.")
+    parser.add_argument("--combined", action="store_true", help="One request per unit.")
+    parser.add_argument("--no-stream", action="store_true", help="Disable response streaming.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    from semantic_topic_mapper import config
+
+    config.LLM_CACHE_ENABLED = False
+    config.LLM_STREAM_RESPONSES = not args.no_stream
+    config.LLM_RETRY_BASE_DELAY = min(config.LLM_RETRY_BASE_DELAY, 0.2)
+
+    from semantic_topic_mapper.entities.deterministic_entity_detector import detect_entities
+    from semantic_topic_mapper.entities.llm_entity_enricher import (
+        plan_enrichment_units,
+        run_entity_enrichment,
+    )
+    from semantic_topic_mapper.ingestion.loader import load_text_file
+    from semantic_topic_mapper.llm.backends import StubBackend, set_backend
+    from semantic_topic_mapper.structure.header_detector import detect_headers
+    from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
+
+    text = load_text_file(args.input)
+    blocks = segment_into_topic_blocks(text, detect_headers(text))
+    entities = detect_entities(blocks)
+    plan = plan_enrichment_units(entities, text, blocks, args.mode)
+
+    stub = StubBackend(args.latency, args.error_rate, config.LLM_STUB_ERROR_CODES, seed=args.seed)
+    timed = _TimedBackend(stub)
+    set_backend(timed)
+    try:
+        t0 = time.perf_counter()
+        relationships, issues = run_entity_enrichment(
+            entities, text, plan=plan, combined=args.combined or None
+        )
+        wall = time.perf_counter() - t0
+    finally:
+        set_backend(None)
+        stub.close()
+
+    n = len(timed.samples)
+    print(
+        f"{len(entities)} entities, mode {plan.mode}, {len(plan.units)} unit(s), "
+        f"latency {args.latency}, error rate {args.error_rate:g}"
+    )
+    print(f"wall time {wall:7.2f} s   requests {n} ({timed.failures} failed)   {n / wall:6.1f} req/s")
+    if n:
+        print(
+            f"request latency  mean {statistics.fmean(timed.samples) * 1000:7.1f} ms   "
+            f"p50 {_pct(timed.samples, 0.50):7.1f}   p95 {_pct(timed.samples, 0.95):7.1f}   "
+            f"p99 {_pct(timed.samples, 0.99):7.1f}   max {max(timed.samples) * 1000:7.1f}"
+        )
+    if timed.first_piece:
+        print(
+            f"first piece      p50 {_pct(timed.first_piece, 0.50):7.1f} ms   "
+            f"p95 {_pct(timed.first_piece, 0.95):7.1f}"
+        )
+    print(f"results: {len(relationships)} relationships, {len(issues)} issues")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Microbenchmark: per-call overhead of a fresh genai.Client vs the pooled client.
+
+Runs against the local stub server (llm/stub_server.py), so no network or API
+quota is used. Run from project root:
+
+    PYTHONPATH=src python benchmarks/bench_llm_client.py --calls 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_src = Path(__file__).resolve().parents[1] / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+
+def _time_calls(n: int, call) -> list[float]:  # noqa: ANN001
+    samples: list[float] = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _summary(label: str, samples: list[float]) -> float:
+    mean_ms = statistics.fmean(samples) * 1000
+    p50_ms = statistics.median(samples) * 1000
+    p95_ms = sorted(samples)[int(0.95 * (len(samples) - 1))] * 1000
+    print(f"{label:<22} mean {mean_ms:7.2f} ms   p50 {p50_ms:7.2f} ms   p95 {p95_ms:7.2f} ms")
+    return mean_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100)
+    args = parser.parse_args()
+
+    from semantic_topic_mapper.llm.stub_server import run_stub_server
+
+    with run_stub_server() as server:
+        os.environ["LLM_API_KEY"] = "stub-key"
+        os.environ["LLM_BASE_URL"] = server.url
+        from semantic_topic_mapper import config
+
+        config.LLM_API_KEY = "stub-key"
+        config.LLM_BASE_URL = server.url
+
+        from semantic_topic_mapper.llm import client as llm_client
+
+        def fresh_call() -> None:
+            client = llm_client._create_client("stub-key", server.url, config.LLM_MAX_CONCURRENCY)
+            client.models.generate_content(model=config.LLM_MODEL, contents="ping")
+            client.close()
+
+        def pooled_call() -> None:
+            llm_client.get_genai_client().models.generate_content(
+                model=config.LLM_MODEL, contents="ping"
+            )
+
+        # Warm-up (imports, first connection)
+        fresh_call()
+        pooled_call()
+
+        print(f"{args.calls} sequential generateContent calls against {server.url}")
+        fresh = _summary("new client per call", _time_calls(args.calls, fresh_call))
+        pooled = _summary("pooled client", _time_calls(args.calls, pooled_call))
+        print(f"overhead saved per call: {fresh - pooled:.2f} ms ({(1 - pooled / fresh) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,27 @@
 Ambiguity and consistency audit layer.
 
 Aggregates structural and semantic signals (synthetic topics, reference issues,
-undefined entities, single-mention entities) into a unified list of AuditIssue
-records for reporting. Surfaces structural and semantic ambiguity for human or
-downstream review; does not resolve issues or use LLMs.
+undefined entities, single-mention entities, vague wording, unresolved
+obligations, inconsistent definitions and usage, repeated blocks) into a
+unified list of AuditIssue records for reporting. Surfaces structural and
+semantic ambiguity for human or downstream review; does not resolve issues or
+use LLMs.
+
+Each check is an AuditRule evaluated by the single-pass engine in
+audit/rule_engine.py; default_rules() lists the rules run_audit applies.
 """
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 
-from semantic_topic_mapper.entities.entity_models import Entity
-from semantic_topic_mapper.models.topic_models import TopicID, TopicNode
+from semantic_topic_mapper.audit.rule_engine import AuditContext, AuditEngine, AuditRule, AuditRun
+from semantic_topic_mapper.entities.entity_models import Entity, TermDefinition
+from semantic_topic_mapper.models.reference_models import TopicReference
+from semantic_topic_mapper.models.topic_models import TopicBlock, TopicID, TopicNode
 from semantic_topic_mapper.references.reference_graph_builder import ReferenceIssue
+from semantic_topic_mapper.structure.duplicate_detector import DuplicateBlock
 
 
 @dataclass
@@ -33,36 +42,29 @@ class AuditIssue:
     end_char: int | None
 
 
-def run_audit(
-    nodes: dict[str, TopicNode],
-    reference_issues: list[ReferenceIssue],
-    entities: list[Entity],
-) -> list[AuditIssue]:
-    """
-    Run the ambiguity and consistency audit.
+class SyntheticTopicRule(AuditRule):
+    """Synthetic (placeholder) topic nodes: missing_topic_content (warning)."""
 
-    Aggregates synthetic topic nodes, reference issues (missing/synthetic
-    targets), undefined entities, and single-mention entities into a unified
-    list of AuditIssue records. This layer surfaces structural and semantic
-    ambiguity; it does not fix or resolve issues.
-    """
-    issues: list[AuditIssue] = []
+    name = "missing_topic_content"
 
-    for raw, node in nodes.items():
-        if not node.synthetic:
-            continue
-        issues.append(
-            AuditIssue(
+    def visit_topic(self, node: TopicNode, ctx: AuditContext) -> Iterator[AuditIssue]:
+        if node.synthetic:
+            yield AuditIssue(
                 issue_type="missing_topic_content",
                 severity="warning",
-                message=f"Topic {raw} has no content (placeholder for structural gap).",
+                message=f"Topic {node.topic_id.raw} has no content (placeholder for structural gap).",
                 topic_id=node.topic_id,
                 start_char=None,
                 end_char=None,
             )
-        )
 
-    for ref_issue in reference_issues:
+
+class ReferenceIssueRule(AuditRule):
+    """Structural reference issues: missing_topic (error), synthetic_target (warning)."""
+
+    name = "reference_issues"
+
+    def visit_reference_issue(self, ref_issue: ReferenceIssue, ctx: AuditContext) -> Iterator[AuditIssue]:
         if ref_issue.issue_type == "missing_topic":
             severity = "error"
             message = f"Reference from {ref_issue.source_topic_id.raw} to missing topic {ref_issue.target_topic_id.raw}."
@@ -72,39 +74,133 @@ def run_audit(
         else:
             severity = "warning"
             message = f"Reference issue: {ref_issue.issue_type}."
-        issues.append(
-            AuditIssue(
-                issue_type=ref_issue.issue_type,
-                severity=severity,
-                message=message,
-                topic_id=ref_issue.source_topic_id,
-                start_char=ref_issue.start_char,
-                end_char=ref_issue.end_char,
-            )
+        yield AuditIssue(
+            issue_type=ref_issue.issue_type,
+            severity=severity,
+            message=message,
+            topic_id=ref_issue.source_topic_id,
+            start_char=ref_issue.start_char,
+            end_char=ref_issue.end_char,
         )
 
-    for entity in entities:
+
+class UndefinedEntityRule(AuditRule):
+    """Entities without an explicit definition: undefined_entity (warning)."""
+
+    name = "undefined_entity"
+
+    def visit_entity(self, entity: Entity, ctx: AuditContext) -> Iterator[AuditIssue]:
         if entity.definition_text is None:
-            issues.append(
-                AuditIssue(
-                    issue_type="undefined_entity",
-                    severity="warning",
-                    message=f'Entity "{entity.canonical_name}" has no explicit definition.',
-                    topic_id=entity.first_seen_topic,
-                    start_char=None,
-                    end_char=None,
-                )
+            yield AuditIssue(
+                issue_type="undefined_entity",
+                severity="warning",
+                message=f'Entity "{entity.canonical_name}" has no explicit definition.',
+                topic_id=entity.first_seen_topic,
+                start_char=None,
+                end_char=None,
             )
+
+
+class SingleMentionEntityRule(AuditRule):
+    """Entities mentioned once: single_mention_entity (info)."""
+
+    name = "single_mention_entity"
+
+    def visit_entity(self, entity: Entity, ctx: AuditContext) -> Iterator[AuditIssue]:
         if len(entity.mentions) == 1:
-            issues.append(
-                AuditIssue(
-                    issue_type="single_mention_entity",
-                    severity="info",
-                    message=f'Entity "{entity.canonical_name}" appears only once.',
-                    topic_id=entity.first_seen_topic,
-                    start_char=None,
-                    end_char=None,
-                )
+            yield AuditIssue(
+                issue_type="single_mention_entity",
+                severity="info",
+                message=f'Entity "{entity.canonical_name}" appears only once.',
+                topic_id=entity.first_seen_topic,
+                start_char=None,
+                end_char=None,
             )
 
-    return issues
+
+class DuplicateBlockRule(AuditRule):
+    """Blocks repeating an earlier block (structure/duplicate_detector.py): duplicate_block (info)."""
+
+    name = "duplicate_block"
+
+    def finish(self, ctx: AuditContext) -> Iterator[AuditIssue]:
+        for dup in ctx.duplicates:
+            if dup.exact:
+                detail = "verbatim"
+            else:
+                detail = f"nearly (similarity {dup.similarity:.2f})"
+            yield AuditIssue(
+                issue_type="duplicate_block",
+                severity="info",
+                message=f"Topic {dup.topic_id.raw} repeats Topic {dup.canonical_topic_id.raw} {detail}.",
+                topic_id=dup.topic_id,
+                start_char=dup.start_char,
+                end_char=dup.end_char,
+            )
+
+
+def default_rules() -> list[AuditRule]:
+    """Fresh instances of the rules run_audit applies, in output order."""
+    from semantic_topic_mapper.audit.consistency_checker import ConsistencyRule
+    from semantic_topic_mapper.audit.gap_analyzer import SiblingGapRule
+    from semantic_topic_mapper.audit.unresolved_detector import UnresolvedObligationRule
+    from semantic_topic_mapper.audit.vague_language import VagueLanguageRule
+
+    return [
+        SyntheticTopicRule(),
+        SiblingGapRule(),
+        ReferenceIssueRule(),
+        UndefinedEntityRule(),
+        SingleMentionEntityRule(),
+        VagueLanguageRule(),
+        UnresolvedObligationRule(),
+        ConsistencyRule(),
+        DuplicateBlockRule(),
+    ]
+
+
+def audit_document(
+    nodes: dict[str, TopicNode],
+    reference_issues: list[ReferenceIssue],
+    entities: list[Entity],
+    references: list[TopicReference] | None = None,
+    blocks: list[TopicBlock] | None = None,
+    text: str = "",
+    rules: list[AuditRule] | None = None,
+    workers: int = 1,
+    duplicates: list[DuplicateBlock] | None = None,
+    definitions: list[TermDefinition] | None = None,
+) -> AuditRun:
+    """
+    Run the audit rules (default_rules() unless given) in one traversal and
+    return the issues with per-rule timings. references, blocks, text,
+    duplicates and definitions are optional context for rules that need them.
+    """
+    ctx = AuditContext(
+        nodes=nodes,
+        reference_issues=reference_issues,
+        entities=entities,
+        references=references or [],
+        blocks=blocks or [],
+        text=text,
+        duplicates=duplicates or [],
+        definitions=definitions or [],
+    )
+    engine = AuditEngine(default_rules() if rules is None else rules, workers=workers)
+    return engine.run(ctx)
+
+
+def run_audit(
+    nodes: dict[str, TopicNode],
+    reference_issues: list[ReferenceIssue],
+    entities: list[Entity],
+) -> list[AuditIssue]:
+    """
+    Run the ambiguity and consistency audit.
+
+    Aggregates synthetic topic nodes, sibling numbering gaps, reference issues
+    (missing/synthetic targets), undefined entities, and single-mention entities into a unified
+    list of AuditIssue records. This layer surfaces structural and semantic
+    ambiguity; it does not fix or resolve issues.
+    """
+    return audit_document(nodes, reference_issues, entities).issues
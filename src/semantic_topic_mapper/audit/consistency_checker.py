@@ -1 +1,178 @@
-# Check structural and reference consistency.
+"""
+Consistency checker: terms and topics the document names in more than one way.
+
+- Conflicting definitions: every explicit definition found by the definition
+  linker (not just the first per term) is grouped under a normalized term key
+  (case-folded, whitespace collapsed). Definition texts are normalized the same
+  way and hashed into a per-term dict, so identical restatements collapse and
+  each definition whose text differs from all earlier ones is reported as
+  inconsistent_definition (warning) at its own span.
+- Usage variants: the defined terms are compiled into one case-insensitive
+  word-trie regex (the phrase compiler of audit/vague_language.py) and the
+  text is swept once with finditer; a Counter per term key tallies each
+  spelling seen ("Client", "client"). Spellings other than the defined one
+  are reported as one inconsistent_usage issue (info) per term, located at
+  the first variant. Upper-casing the first letter at a sentence start and
+  ALL-CAPS text (headings) are not counted as variants.
+- Title conflicts: a reference followed by a name, as in 'Topic 2.2
+  (Annual Review)' or 'Topic 2.2 "Annual Review"', is checked against the
+  target topic's title. The name is consistent when its words (lowercased,
+  singular, articles and conjunctions dropped) all occur in the title;
+  otherwise inconsistent_usage (warning). Parentheticals that are not names
+  ("(see below)", "(as amended)") are skipped.
+
+Issues are attributed to their topic by bisecting block start offsets.
+
+Deterministic; does not use LLMs.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Iterator
+
+from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue
+from semantic_topic_mapper.audit.rule_engine import AuditContext, AuditRule
+from semantic_topic_mapper.audit.vague_language import compile_phrase_pattern
+from semantic_topic_mapper.entities.entity_models import TermDefinition
+from semantic_topic_mapper.models.reference_models import TopicReference
+from semantic_topic_mapper.models.topic_models import TopicID
+
+# Name right after a reference: Topic 2.2 (Annual Review) / Topic 2.2 "Annual Review".
+_NAMED_AFTER = re.compile(r"[ \t]*(?:\(([^()\n]{1,80})\)|[\"“]([^\"“”\n]{1,80})[\"”])")
+_NAME_WORD = re.compile(r"[^\W_]+")
+# Words ignored when comparing a name with a title.
+_FILLER_WORDS = frozenset({"the", "a", "an", "and", "or", "of", "on", "for", "to", "in", "&"})
+# Parentheticals starting with these are remarks, not names.
+_REMARK_WORDS = frozenset(
+    """see as and or if which where when unless including includes inclusive e g i eg ie
+    above below herein hereof hereunder each other if any this that these those""".split()
+)
+# Characters after which an upper-cased first letter is ordinary sentence case.
+_SENTENCE_BREAK = frozenset('.!?:;"(\n“')
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def _definition_key(text: str) -> str:
+    """Definition text compared ignoring case, spacing and trailing punctuation."""
+    return _norm(text).rstrip(" .;,")
+
+
+def _name_words(text: str) -> set[str]:
+    """Lowercased, singular words of a topic name or title, without filler words."""
+    words = {w.lower() for w in _NAME_WORD.findall(text)}
+    return {w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w for w in words} - _FILLER_WORDS
+
+
+def _at_sentence_start(text: str, start: int) -> bool:
+    before = text[max(0, start - 8) : start].rstrip(" \t")
+    return not before or before[-1] in _SENTENCE_BREAK
+
+
+class ConsistencyRule(AuditRule):
+    """Conflicting definitions, term spelling variants and reference/title conflicts."""
+
+    name = "consistency"
+
+    def prepare(self, ctx: AuditContext) -> None:
+        self._blocks = sorted((b for b in ctx.blocks if b.topic_id is not None), key=lambda b: b.start_char)
+        self._starts = [b.start_char for b in self._blocks]
+
+    def _topic_at(self, start: int) -> TopicID | None:
+        i = bisect_right(self._starts, start) - 1
+        if i < 0 or start >= self._blocks[i].end_char:
+            return None
+        return self._blocks[i].topic_id
+
+    def visit_reference(self, ref: TopicReference, ctx: AuditContext) -> Iterator[AuditIssue]:
+        if not ctx.text or ref.source_topic_id.raw == ref.target_topic_id.raw:
+            return
+        m = _NAMED_AFTER.match(ctx.text, ref.end_char)
+        if m is None:
+            return
+        node = ctx.nodes.get(ref.target_topic_id.raw)
+        if node is None or node.synthetic or node.block is None or not node.block.title:
+            return
+        name = " ".join((m.group(1) or m.group(2)).split())
+        first = _NAME_WORD.match(name)
+        if first is None or first.group(0).lower() in _REMARK_WORDS or not any(c.isalpha() for c in name):
+            return
+        named = _name_words(name)
+        title = node.block.title.strip()
+        if not named or named <= _name_words(title):
+            return
+        yield AuditIssue(
+            issue_type="inconsistent_usage",
+            severity="warning",
+            message=f'Topic {ref.target_topic_id.raw} is referred to as "{name}" but titled "{title}".',
+            topic_id=ref.source_topic_id,
+            start_char=ref.start_char,
+            end_char=m.end(),
+        )
+
+    def finish(self, ctx: AuditContext) -> Iterator[AuditIssue]:
+        by_term: dict[str, list[TermDefinition]] = {}
+        for definition in ctx.definitions:
+            by_term.setdefault(_norm(definition.term), []).append(definition)
+
+        for defs in by_term.values():
+            texts: dict[str, TermDefinition] = {}
+            for definition in defs:
+                key = _definition_key(definition.text)
+                if key in texts:
+                    continue
+                if texts:
+                    first = defs[0]
+                    variants = len({_definition_key(d.text) for d in defs})
+                    yield AuditIssue(
+                        issue_type="inconsistent_definition",
+                        severity="warning",
+                        message=(
+                            f'Term "{first.term}" has {variants} different definitions '
+                            f"(first in {first.topic_id.raw}); this definition differs."
+                        ),
+                        topic_id=definition.topic_id,
+                        start_char=definition.start_char,
+                        end_char=definition.end_char,
+                    )
+                texts[key] = definition
+
+        if ctx.text and by_term:
+            yield from self._usage_variants(ctx.text, {key: defs[0].term for key, defs in by_term.items()})
+
+    def _usage_variants(self, text: str, terms: dict[str, str]) -> Iterator[AuditIssue]:
+        """One sweep over the text for all defined terms; variants counted per term key."""
+        pattern = compile_phrase_pattern(tuple(sorted(terms.values())))
+        if pattern is None:
+            return
+        counts: dict[str, Counter[str]] = {}
+        first_at: dict[str, tuple[int, int]] = {}
+        for m in pattern.finditer(text):
+            spelling = " ".join(m.group(0).split())
+            key = spelling.casefold()
+            defined = terms.get(key)
+            if defined is None or spelling == defined:
+                continue
+            if spelling.isupper() and not defined.isupper():
+                continue
+            if spelling == defined[:1].upper() + defined[1:] and _at_sentence_start(text, m.start()):
+                continue
+            counts.setdefault(key, Counter())[spelling] += 1
+            first_at.setdefault(key, (m.start(), m.end()))
+
+        for key, variants in counts.items():
+            start, end = first_at[key]
+            listed = ", ".join(f'"{s}" ({n}x)' for s, n in variants.most_common())
+            yield AuditIssue(
+                issue_type="inconsistent_usage",
+                severity="info",
+                message=f'Defined term "{terms[key]}" is also written as {listed}.',
+                topic_id=self._topic_at(start),
+                start_char=start,
+                end_char=end,
+            )
@@ -1 +1,88 @@
-# Missing topic numbers (e.g. 18.2).
+"""
+Sibling gap analyzer: missing topic numbers between siblings.
+
+hierarchy_builder only synthesizes missing ancestors (18.2 for 18.2.1). A
+jump between siblings (2.1, 2.2, 2.7) leaves no trace in the tree, so this
+rule checks each node's children (and the top-level topics) once, in
+numeric-aware order, and reports each run of missing numbers as one
+topic_number_gap issue ("Topics 2.3–2.6 missing") instead of one issue per
+number. Numbering is expected to start at 1 (or "a" for letter parts). The
+issue points at the header of the first topic after the gap.
+
+Deterministic; does not use LLMs.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue
+from semantic_topic_mapper.audit.rule_engine import AuditContext, AuditRule
+from semantic_topic_mapper.models.topic_models import TopicBlock, TopicID, TopicNode
+from semantic_topic_mapper.structure.hierarchy_builder import topic_sort_key
+
+
+def _ordinal(part: str) -> int:
+    """Position of a numbering part in its sequence: 1, 2, ... or a=1, b=2, ..."""
+    return int(part) if part.isdigit() else ord(part) - ord("a") + 1
+
+
+def _label(prefix: tuple[str, ...], ordinal: int, numeric: bool) -> str:
+    return ".".join(prefix + (str(ordinal) if numeric else chr(ord("a") + ordinal - 1),))
+
+
+def find_gaps(siblings: list[TopicID]) -> Iterator[tuple[str, str, int, TopicID]]:
+    """
+    Yield (first_missing, last_missing, count, next_sibling) for each run of
+    missing numbers among siblings sharing a parent. One sort, then one pass.
+    Letter siblings are checked only when there are no numeric ones (a lone
+    "12.f" among 12.1-12.5 is a numbering inconsistency, not five missing topics).
+    """
+    numeric = any(tid.parts[-1].isdigit() for tid in siblings)
+    previous = 0
+    for tid in sorted(siblings, key=topic_sort_key):
+        last = tid.parts[-1]
+        if last.isdigit() != numeric:
+            continue
+        ordinal = _ordinal(last)
+        if ordinal > previous + 1:
+            prefix = tid.parts[:-1]
+            yield (
+                _label(prefix, previous + 1, numeric),
+                _label(prefix, ordinal - 1, numeric),
+                ordinal - previous - 1,
+                tid,
+            )
+        previous = max(previous, ordinal)
+
+
+def _header_end(block: TopicBlock) -> int:
+    """End offset of the block's header line (raw_text starts with it)."""
+    return block.start_char + len(block.raw_text.partition("\n")[0])
+
+
+class SiblingGapRule(AuditRule):
+    """Runs of missing sibling topic numbers: topic_number_gap (warning), one issue per run."""
+
+    name = "topic_number_gap"
+
+    def visit_topic(self, node: TopicNode, ctx: AuditContext) -> Iterator[AuditIssue]:
+        yield from self._gap_issues(node.children_ids, ctx)
+
+    def finish(self, ctx: AuditContext) -> Iterator[AuditIssue]:
+        roots = [node.topic_id for node in ctx.nodes.values() if node.parent_id is None]
+        yield from self._gap_issues(roots, ctx)
+
+    def _gap_issues(self, siblings: list[TopicID], ctx: AuditContext) -> Iterator[AuditIssue]:
+        for first, last, count, following in find_gaps(siblings):
+            missing = f"Topic {first} missing" if count == 1 else f"Topics {first}–{last} missing ({count} numbers)"
+            node = ctx.nodes.get(following.raw)
+            block = node.block if node is not None else None
+            yield AuditIssue(
+                issue_type="topic_number_gap",
+                severity="warning",
+                message=f"{missing} before {following.raw}.",
+                topic_id=following,
+                start_char=block.start_char if block is not None else None,
+                end_char=_header_end(block) if block is not None else None,
+            )
@@ -0,0 +1,196 @@
+"""
+Pluggable single-pass audit engine.
+
+Audit rules (AuditRule subclasses) implement only the visitor hooks they need:
+visit_topic, visit_reference_issue, visit_reference, visit_entity, plus
+prepare() before and finish() after the traversal. The engine walks each
+collection once and hands every item to all rules that visit that kind of
+item, so adding a rule adds its per-item work, not another pass over the
+document. Rules share the indexes precomputed once on AuditContext (reverse
+references, entity <-> topic maps) instead of rebuilding their own.
+
+Issues come out in a fixed order: phase by phase (topics, reference issues,
+references, entities, finish), item by item within a phase, and rule by rule
+(registration order) within an item. With workers > 1 each phase's items are
+split into contiguous chunks evaluated on a thread pool and merged in chunk
+order, so the output is identical; visit hooks must then not mutate shared
+state (collect in finish() instead). Per-rule wall time is reported on the
+AuditRun.
+
+Deterministic; does not use LLMs.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from semantic_topic_mapper.entities.entity_models import Entity, TermDefinition
+from semantic_topic_mapper.models.reference_models import TopicReference
+from semantic_topic_mapper.models.topic_models import TopicBlock, TopicNode
+from semantic_topic_mapper.references.reference_graph_builder import ReferenceIssue
+
+if TYPE_CHECKING:
+    from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue
+    from semantic_topic_mapper.structure.duplicate_detector import DuplicateBlock
+
+
+@dataclass
+class AuditContext:
+    """
+    Everything rules may inspect, plus shared indexes built once by build_indexes():
+
+    - incoming_references / outgoing_references: topic raw -> references (document order)
+    - entities_by_topic: topic raw -> entities mentioned there (entity order)
+    - topics_by_entity: entity_id -> topic raws it is mentioned in (first-mention order)
+    """
+
+    nodes: dict[str, TopicNode]
+    reference_issues: list[ReferenceIssue] = field(default_factory=list)
+    entities: list[Entity] = field(default_factory=list)
+    references: list[TopicReference] = field(default_factory=list)
+    blocks: list[TopicBlock] = field(default_factory=list)
+    text: str = ""
+    duplicates: list[DuplicateBlock] = field(default_factory=list)
+    definitions: list[TermDefinition] = field(default_factory=list)
+    incoming_references: dict[str, list[TopicReference]] = field(default_factory=dict)
+    outgoing_references: dict[str, list[TopicReference]] = field(default_factory=dict)
+    entities_by_topic: dict[str, list[Entity]] = field(default_factory=dict)
+    topics_by_entity: dict[str, list[str]] = field(default_factory=dict)
+
+    def build_indexes(self) -> None:
+        self.incoming_references = {}
+        self.outgoing_references = {}
+        for ref in self.references:
+            self.incoming_references.setdefault(ref.target_topic_id.raw, []).append(ref)
+            self.outgoing_references.setdefault(ref.source_topic_id.raw, []).append(ref)
+        self.entities_by_topic = {}
+        self.topics_by_entity = {}
+        for entity in self.entities:
+            topics = list(dict.fromkeys(m.topic_id.raw for m in entity.mentions))
+            self.topics_by_entity[entity.entity_id] = topics
+            for raw in topics:
+                self.entities_by_topic.setdefault(raw, []).append(entity)
+
+
+class AuditRule:
+    """
+    Base class for audit rules. Override any hooks; each returns the issues
+    it finds (an iterable of AuditIssue). name labels the rule in timings.
+    """
+
+    name = "rule"
+
+    def prepare(self, ctx: AuditContext) -> None:
+        """Called once before the traversal (e.g. to build rule-specific lookups)."""
+
+    def visit_topic(self, node: TopicNode, ctx: AuditContext) -> Iterable[AuditIssue]:
+        return ()
+
+    def visit_reference_issue(self, issue: ReferenceIssue, ctx: AuditContext) -> Iterable[AuditIssue]:
+        return ()
+
+    def visit_reference(self, ref: TopicReference, ctx: AuditContext) -> Iterable[AuditIssue]:
+        return ()
+
+    def visit_entity(self, entity: Entity, ctx: AuditContext) -> Iterable[AuditIssue]:
+        return ()
+
+    def finish(self, ctx: AuditContext) -> Iterable[AuditIssue]:
+        """Called once after the traversal, for findings that need the whole document."""
+        return ()
+
+
+# (hook name, items on the context) per traversal phase, in output order.
+_PHASES: tuple[tuple[str, Callable[[AuditContext], Sequence[Any]]], ...] = (
+    ("visit_topic", lambda ctx: list(ctx.nodes.values())),
+    ("visit_reference_issue", lambda ctx: ctx.reference_issues),
+    ("visit_reference", lambda ctx: ctx.references),
+    ("visit_entity", lambda ctx: ctx.entities),
+)
+
+
+@dataclass
+class AuditRun:
+    """Issues from one audit run, with wall time per rule (seconds) and for the shared indexes."""
+
+    issues: list[AuditIssue]
+    rule_seconds: dict[str, float]
+    index_seconds: float
+    total_seconds: float
+
+
+class AuditEngine:
+    """Runs registered rules over an AuditContext in one traversal (see module docstring)."""
+
+    def __init__(self, rules: Iterable[AuditRule] = (), workers: int = 1):
+        self.rules: list[AuditRule] = []
+        self.workers = max(1, workers)
+        for rule in rules:
+            self.register(rule)
+
+    def register(self, rule: AuditRule) -> AuditRule:
+        if any(r.name == rule.name for r in self.rules):
+            raise ValueError(f"Audit rule {rule.name!r} is already registered")
+        self.rules.append(rule)
+        return rule
+
+    def run(self, ctx: AuditContext) -> AuditRun:
+        started = time.perf_counter()
+        ctx.build_indexes()
+        index_seconds = time.perf_counter() - started
+        timings = {rule.name: 0.0 for rule in self.rules}
+        issues: list[AuditIssue] = []
+
+        for rule in self.rules:
+            t0 = time.perf_counter()
+            rule.prepare(ctx)
+            timings[rule.name] += time.perf_counter() - t0
+
+        for hook, items_of in _PHASES:
+            visitors = [
+                (rule.name, getattr(rule, hook))
+                for rule in self.rules
+                if getattr(type(rule), hook) is not getattr(AuditRule, hook)
+            ]
+            if not visitors:
+                continue
+            items = items_of(ctx)
+            if self.workers == 1 or len(items) < 2 * self.workers:
+                chunks = [_visit_chunk(visitors, items, ctx)]
+            else:
+                size = -(-len(items) // self.workers)
+                parts = [items[i : i + size] for i in range(0, len(items), size)]
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    chunks = list(pool.map(lambda part: _visit_chunk(visitors, part, ctx), parts))
+            for chunk_issues, chunk_timings in chunks:
+                issues.extend(chunk_issues)
+                for name, seconds in chunk_timings.items():
+                    timings[name] += seconds
+
+        for rule in self.rules:
+            t0 = time.perf_counter()
+            issues.extend(rule.finish(ctx))
+            timings[rule.name] += time.perf_counter() - t0
+
+        return AuditRun(issues, timings, index_seconds, time.perf_counter() - started)
+
+
+def _visit_chunk(
+    visitors: list[tuple[str, Callable[[Any, AuditContext], Iterable[AuditIssue]]]],
+    items: Sequence[Any],
+    ctx: AuditContext,
+) -> tuple[list[AuditIssue], dict[str, float]]:
+    """Apply every visitor to each item in order; return issues and time spent per rule."""
+    issues: list[AuditIssue] = []
+    timings = {name: 0.0 for name, _ in visitors}
+    clock = time.perf_counter
+    for item in items:
+        for name, visit in visitors:
+            t0 = clock()
+            issues.extend(visit(item, ctx))
+            timings[name] += clock() - t0
+    return issues, timings
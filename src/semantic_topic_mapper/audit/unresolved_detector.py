@@ -1 +1,213 @@
-# Broken references; undefined entities.
+"""
+Unresolved-obligation detector: obligations that point at something the
+document never supplies.
+
+"Per format specified in Appendix C" with no Appendix C, "within specified
+timeframes" or "the form prescribed by the Commission" with no timeframe or
+form defined anywhere. Every occurrence of a qualifying verb is found in
+one regex sweep over the text; anchored matches a few words before and after
+it decide whether it is a candidate, in one of two shapes:
+
+- post-modified: "<noun phrase> specified|prescribed|designated|stipulated|
+  determined|set out|set forth [in|by|under <target>]"; the target is a
+  container ("Appendix C") or a capitalized agent ("the Commission")
+- pre-modified: "specified|prescribed|designated|stipulated|approved <noun>"
+
+Phrases whose tail points inside the document ("set out below", "herein",
+"in this Topic") or names a general lowercase source ("by law", "in
+writing") are not candidates. Each candidate is then checked with hash
+lookups into indexes built once in prepare(), never by rescanning the
+document:
+
+- reference graph: a "Topic N" / "Section N" target is left to the
+  reference checks when a detected reference starts at the target's offset
+  (broken targets are already reported as reference issues); otherwise it
+  resolves when its ID is a topic in the hierarchy
+- topic titles: an "Appendix C" / "Schedule A" style target resolves when a
+  topic title starts with it
+- definitions index: the head noun resolves when an entity with an explicit
+  definition is named by it (full name or last word, singular or plural)
+- entity index: an agent ("by the Commission") that is not a defined entity
+  is named in the message
+
+Unresolved candidates become unresolved_obligation issues (warning),
+attributed to their topic by bisecting block start offsets.
+
+Deterministic; does not use LLMs.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterator
+
+from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue
+from semantic_topic_mapper.audit.rule_engine import AuditContext, AuditRule
+from semantic_topic_mapper.models.reference_models import TopicReference
+from semantic_topic_mapper.models.topic_models import TopicBlock
+from semantic_topic_mapper.structure.topic_id_parser import parse_topic_id
+
+_POST_VERBS = frozenset({"prescribed", "specified", "designated", "stipulated", "determined", "set out", "set forth"})
+_PRE_VERBS = frozenset({"prescribed", "specified", "designated", "stipulated", "approved"})
+_TAIL_WORDS = frozenset({"in", "by", "under", "pursuant", "herein", "hereunder", "below", "above", "elsewhere"})
+_CONTAINERS = r"Topic|Section|Schedule|Appendix|Annex|Exhibit|Form"
+
+# The single sweep: every verb occurrence is a candidate.
+_VERB = re.compile(
+    r"\b(?:prescribed|specified|designated|stipulated|determined|approved|set[ \t]+(?:out|forth))\b",
+    re.IGNORECASE,
+)
+# Anchored checks around one verb, each bounded by a few words.
+_PHRASE_BEFORE = re.compile(r"(?<![\w-])((?:[a-z][a-z-]*[ \t]+){1,3})$")
+_WORD_AFTER = re.compile(r"[ \t]+([a-z][a-z-]*)\b")
+# target: a container ("Appendix C") or a capitalized agent ("the Commission").
+# internal: "herein", "below", "in this Topic" and the like point inside the
+# document; source: a lowercase source ("by law", "in writing") is general.
+_TAIL = re.compile(
+    r"[ \t]+(?:(?:in|by|under|pursuant[ \t]+to)[ \t]+"
+    rf"(?:(?P<internal>(?:this|these)[ \t]+(?:{_CONTAINERS})s?\b)"
+    rf"|(?:the[ \t]+)?(?P<target>(?:{_CONTAINERS})[ \t]+[\w.]*\w|[A-Z][\w-]*(?:[ \t]+[A-Z][\w-]*){{0,3}})"
+    r"|(?:the[ \t]+)?(?P<source>[a-z][\w-]*))"
+    r"|(?P<here>herein|hereunder|below|above|elsewhere)\b)"
+)
+_WINDOW = 64  # characters searched before a verb for its noun phrase
+
+# Words that start or make up a candidate phrase without naming a thing.
+_FUNCTION_WORDS = frozenset(
+    """a an the any all each every such this that these those its their his her our your
+    be is are was were been being has have had must shall should may will would can could
+    to of in on at by for from with within per as or and nor not no unless until upon under
+    than then if when where which who whom whose other otherwise also only""".split()
+)
+
+_CONTAINER_TARGET = re.compile(rf"^(?P<kind>{_CONTAINERS})[ \t]+(?P<id>[\w.]*\w)$")
+# Title words with edge punctuation dropped: "Appendix C: Report" -> appendix, c, report.
+_TITLE_WORD = re.compile(r"\w(?:[\w.]*\w)?")
+
+
+def _singular(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def _key(text: str) -> str:
+    """Lowercased words, last one singular: "Reporting Periods" -> "reporting period"."""
+    words = text.lower().split()
+    return " ".join(words[:-1] + [_singular(words[-1])]) if words else ""
+
+
+def _head_phrase(words: list[str]) -> list[str]:
+    """Words after the last function word or adverb ("file the form" -> ["form"]); [] when none are left."""
+    for i in range(len(words) - 1, -1, -1):
+        if words[i] in _FUNCTION_WORDS or words[i].endswith("ly"):
+            return words[i + 1 :]
+    return words
+
+
+class UnresolvedObligationRule(AuditRule):
+    """Obligations pointing at undefined artifacts or missing parts: unresolved_obligation (warning)."""
+
+    name = "unresolved_obligation"
+
+    def prepare(self, ctx: AuditContext) -> None:
+        self._defined: set[str] = set()
+        self._entities: dict[str, bool] = {}
+        for entity in ctx.entities:
+            key = _key(entity.canonical_name)
+            defined = entity.definition_text is not None
+            self._entities[key] = self._entities.get(key, False) or defined
+            if defined:
+                self._defined.add(key)
+                self._defined.add(key.rsplit(" ", 1)[-1])
+        self._refs_by_start: dict[int, TopicReference] = {ref.start_char: ref for ref in ctx.references}
+        self._titles: set[str] = set()
+        for block in ctx.blocks:
+            words = _TITLE_WORD.findall((block.title or "").lower())
+            for n in range(1, min(3, len(words)) + 1):
+                self._titles.add(" ".join(words[:n]))
+
+    def _container_resolved(self, target: str, start: int, ctx: AuditContext) -> bool | None:
+        """True/False for a container target ("Topic 5", "Appendix C"); None for anything else."""
+        m = _CONTAINER_TARGET.match(target)
+        if m is None:
+            return None
+        if m.group("kind") in ("Topic", "Section"):
+            if start in self._refs_by_start:
+                return True
+            tid = parse_topic_id(m.group("id"))
+            return tid is not None and tid.raw in ctx.nodes
+        return target.lower() in self._titles
+
+    def finish(self, ctx: AuditContext) -> Iterator[AuditIssue]:
+        blocks = sorted((b for b in ctx.blocks if b.topic_id is not None), key=lambda b: b.start_char)
+        if not ctx.text or not blocks:
+            return
+        text = ctx.text
+        starts = [b.start_char for b in blocks]
+
+        for verb in _VERB.finditer(text):
+            found = self._candidate(text, verb)
+            if found is None:
+                continue
+            start, end, head, target = found
+            i = bisect_right(starts, start) - 1
+            if i < 0 or start >= blocks[i].end_char:
+                continue
+            snippet = " ".join(text[start:end].split())
+            agent_note = ""
+            if target is not None:
+                target_text, target_start = target
+                resolved = self._container_resolved(target_text, target_start, ctx)
+                if resolved:
+                    continue
+                if resolved is False:
+                    message = f'"{snippet}" points at {target_text}, which the document does not contain.'
+                    yield _issue(blocks[i], start, end, message)
+                    continue
+                if not self._entities.get(_key(target_text)):
+                    agent_note = f"; {target_text} is not defined either"
+            key = _key(" ".join(head))
+            if key in self._defined or key.rsplit(" ", 1)[-1] in self._defined:
+                continue
+            message = f'"{snippet}": no definition or value is given for "{" ".join(head)}"{agent_note}.'
+            yield _issue(blocks[i], start, end, message)
+
+    @staticmethod
+    def _candidate(text: str, verb: re.Match[str]) -> tuple[int, int, list[str], tuple[str, int] | None] | None:
+        """(start, end, head words, (target, target start)) for an obligation around this verb, or None."""
+        name = " ".join(verb.group(0).lower().split())
+        after = _WORD_AFTER.match(text, verb.end())
+        if after is not None and after.group(1) not in _TAIL_WORDS:
+            # "specified timeframes": the verb modifies the next word.
+            if name in _PRE_VERBS and after.group(1) not in _FUNCTION_WORDS and verb.group(0).islower():
+                return verb.start(), after.end(), [after.group(1)], None
+            return None
+        if name not in _POST_VERBS:
+            return None
+        before = _PHRASE_BEFORE.search(text, max(0, verb.start() - _WINDOW), verb.start())
+        if before is None:
+            return None
+        words = list(re.finditer(r"\S+", before.group(1)))
+        head = _head_phrase([w.group(0) for w in words])
+        if not head:
+            return None
+        start = before.start(1) + words[len(words) - len(head)].start()
+        tail = _TAIL.match(text, verb.end())
+        if tail is not None and tail.group("target") is None:
+            return None  # points inside the document, or names a general source
+        end = tail.end() if tail is not None else verb.end()
+        target = None
+        if tail is not None:
+            target = (tail.group("target"), tail.start("target"))
+        return start, end, head, target
+
+
+def _issue(block: TopicBlock, start: int, end: int, message: str) -> AuditIssue:
+    return AuditIssue(
+        issue_type="unresolved_obligation",
+        severity="warning",
+        message=message,
+        topic_id=block.topic_id,
+        start_char=start,
+        end_char=end,
+    )
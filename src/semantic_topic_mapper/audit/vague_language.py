@@ -0,0 +1,204 @@
+"""
+Vague-language detector: hedged obligations such as "reasonable steps",
+"promptly", "where appropriate" or "as soon as practicable".
+
+The phrase lexicon (built-in, or one phrase per line from VAGUE_LEXICON_PATH)
+is compiled into a single case-insensitive regex shaped as a word trie:
+phrases sharing leading words share one branch ("as soon as (?:possible|
+practicable)"), so the engine tries each start position against the distinct
+first words only, and the whole document is swept once with finditer. Words
+in a phrase match across any whitespace (wrapped lines); a word ending in "*"
+matches any word with that prefix ("reasonabl*" covers reasonable and
+reasonably). Longer phrases win over their prefixes.
+
+Each hit is attributed to its topic by bisecting the sorted block start
+offsets, and to a subclause the same way: the block's subclauses when the
+segmenter provides them, otherwise "(a)" / "(ii)" labels at line starts
+(the labelled line). One vague_language issue (warning) per hit, in document
+order, spanning the matched phrase.
+
+Deterministic; does not use LLMs.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from pathlib import Path
+
+from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue
+from semantic_topic_mapper.audit.rule_engine import AuditContext, AuditRule
+from semantic_topic_mapper.models.topic_models import TopicBlock
+
+
+DEFAULT_VAGUE_PHRASES: tuple[str, ...] = (
+    "reasonabl*",
+    "reasonable steps",
+    "reasonable efforts",
+    "reasonable endeavours",
+    "commercially reasonable",
+    "promptly",
+    "timely",
+    "in a timely manner",
+    "without undue delay",
+    "as soon as practicable",
+    "as soon as possible",
+    "as soon as reasonably practicable",
+    "as appropriate",
+    "where appropriate",
+    "when appropriate",
+    "if appropriate",
+    "appropriate",
+    "as necessary",
+    "where necessary",
+    "if necessary",
+    "as needed",
+    "where possible",
+    "where practicable",
+    "to the extent possible",
+    "to the extent practicable",
+    "sufficient",
+    "adequate",
+    "adequately",
+    "satisfactory",
+    "significant",
+    "substantial",
+    "periodically",
+    "regularly",
+    "from time to time",
+    "best efforts",
+    "endeavour to",
+    "endeavor to",
+    "may be required",
+    "or similar",
+    "and/or",
+)
+
+# "(a)", "(ii)", "(1)" at the start of a line, possibly indented.
+_LINE_LABEL = re.compile(r"^[ \t]*\(([a-zA-Z0-9]{1,4})\)[^\n]*", re.MULTILINE)
+
+
+def load_vague_lexicon(path: str | Path | None = None) -> tuple[str, ...]:
+    """
+    Phrases from a text file (one per line; blank lines and "#" comments
+    skipped), or DEFAULT_VAGUE_PHRASES when no path is given.
+    """
+    if path is None:
+        return DEFAULT_VAGUE_PHRASES
+    phrases = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            phrases.append(line)
+    return tuple(phrases)
+
+
+def _word_pattern(word: str) -> str:
+    if word.endswith("*") and len(word) > 1:
+        return re.escape(word[:-1]) + r"\w*"
+    return re.escape(word)
+
+
+def _trie_pattern(trie: dict[str, dict], end: str) -> str:
+    """
+    Alternation over one trie level (`end` marks a complete phrase). Words with
+    continuations come first and wildcards last, so "reasonable steps" is
+    tried before "reasonabl*" and the longer phrase wins.
+    """
+    branches = []
+    for word, child in sorted(
+        ((w, c) for w, c in trie.items() if w != end),
+        key=lambda kv: (set(kv[1]) <= {end}, kv[0].endswith("*"), kv[0]),
+    ):
+        branch = _word_pattern(word)
+        tail = _trie_pattern(child, end)
+        if tail:
+            branch += r"(?:\s+" + tail + ")" + ("?" if end in child else "")
+        branches.append(branch)
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")" if branches else ""
+
+
+@lru_cache(maxsize=8)
+def compile_phrase_pattern(phrases: tuple[str, ...]) -> re.Pattern[str] | None:
+    """
+    One case-insensitive regex for a phrase list, factored as a word trie (see
+    module docstring). Matches are whole words; None for an empty list. Also
+    used for the defined-term sweep in audit/consistency_checker.py.
+    """
+    end = ""
+    trie: dict[str, dict] = {}
+    for phrase in phrases:
+        words = phrase.lower().split()
+        if not words:
+            continue
+        level = trie
+        for word in words:
+            level = level.setdefault(word, {})
+        level[end] = {}
+    body = _trie_pattern(trie, end)
+    if not body:
+        return None
+    return re.compile(r"(?<![\w/])" + body + r"(?![\w/])", re.IGNORECASE)
+
+
+def _line_subclauses(block: TopicBlock) -> list[tuple[int, int, str]]:
+    """(start, end, label) of labelled lines in the block's text, in offset order."""
+    return [
+        (block.start_char + m.start(), block.start_char + m.end(), m.group(1))
+        for m in _LINE_LABEL.finditer(block.raw_text)
+    ]
+
+
+class VagueLanguageRule(AuditRule):
+    """Hedged or vague wording from the phrase lexicon: vague_language (warning)."""
+
+    name = "vague_language"
+
+    def __init__(self, phrases: Iterable[str] | None = None):
+        self.phrases = tuple(phrases) if phrases is not None else None
+
+    def finish(self, ctx: AuditContext) -> Iterator[AuditIssue]:
+        if not ctx.text:
+            return
+        if self.phrases is None:
+            from semantic_topic_mapper.config import VAGUE_LEXICON_PATH
+
+            self.phrases = load_vague_lexicon(VAGUE_LEXICON_PATH)
+        pattern = compile_phrase_pattern(self.phrases)
+        blocks = sorted((b for b in ctx.blocks if b.topic_id is not None), key=lambda b: b.start_char)
+        if pattern is None or not blocks:
+            return
+        starts = [b.start_char for b in blocks]
+        subclauses: dict[int, tuple[list[int], list[tuple[int, int, str]]]] = {}
+
+        for m in pattern.finditer(ctx.text):
+            i = bisect_right(starts, m.start()) - 1
+            if i < 0 or m.start() >= blocks[i].end_char:
+                continue
+            block = blocks[i]
+            if i not in subclauses:
+                spans = (
+                    [(s.start_char, s.end_char, s.label) for s in block.subclauses]
+                    if block.subclauses
+                    else _line_subclauses(block)
+                )
+                spans.sort()
+                subclauses[i] = ([s for s, _, _ in spans], spans)
+            sub_starts, spans = subclauses[i]
+            j = bisect_right(sub_starts, m.start()) - 1
+            where = block.topic_id.raw
+            if j >= 0 and m.start() < spans[j][1]:
+                where += f"({spans[j][2]})"
+            phrase = " ".join(m.group(0).split())
+            yield AuditIssue(
+                issue_type="vague_language",
+                severity="warning",
+                message=f'Vague wording "{phrase}" in {where}.',
+                topic_id=block.topic_id,
+                start_char=m.start(),
+                end_char=m.end(),
+            )
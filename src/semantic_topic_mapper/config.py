@@ -34,6 +34,11 @@ def _env_int(key: str, default: int) -> int:
     return int(v) if v is not None and v.strip() else default
 
 
+def _env_float(key: str, default: float) -> float:
+    v = _env(key)
+    return float(v) if v is not None and v.strip() else default
+
+
 def _env_bool(key: str, default: bool = False) -> bool:
     v = _env(key)
     if v is None or not v.strip():
@@ -56,6 +61,9 @@ CROSS_REF_GRAPH_FILENAME: str = _env("CROSS_REF_GRAPH_FILENAME") or "cross_refer
 ENTITY_CATALOGUE_FILENAME: str = _env("ENTITY_CATALOGUE_FILENAME") or "entity_catalogue.csv"
 ENTITY_RELATIONSHIPS_FILENAME: str = _env("ENTITY_RELATIONSHIPS_FILENAME") or "entity_relationships.json"
 AMBIGUITY_REPORT_FILENAME: str = _env("AMBIGUITY_REPORT_FILENAME") or "ambiguity_report.csv"
+ENTITY_COOCCURRENCE_FILENAME: str = _env("ENTITY_COOCCURRENCE_FILENAME") or "entity_cooccurrence.json"
+LLM_METRICS_FILENAME: str = _env("LLM_METRICS_FILENAME") or "llm_metrics.json"
+TOPIC_RISK_FILENAME: str = _env("TOPIC_RISK_FILENAME") or "topic_risk.csv"
 
 # ---------------------------------------------------------------------------
 # Ingestion (defaults; override via env if needed)
@@ -67,21 +75,123 @@ ORPHAN_MIN_LENGTH: int = _env_int("ORPHAN_MIN_LENGTH", 20)
 # Structure
 # ---------------------------------------------------------------------------
 CREATE_PLACEHOLDER_FOR_MISSING: bool = _env_bool("CREATE_PLACEHOLDER_FOR_MISSING", True)
+# Near-duplicate block detection (structure/duplicate_detector.py): words per shingle,
+# minimum estimated Jaccard similarity, and minimum body length in words.
+DUPLICATE_SHINGLE_WORDS: int = _env_int("DUPLICATE_SHINGLE_WORDS", 5)
+DUPLICATE_THRESHOLD: float = _env_float("DUPLICATE_THRESHOLD", 0.8)
+DUPLICATE_MIN_WORDS: int = _env_int("DUPLICATE_MIN_WORDS", 20)
+
+# ---------------------------------------------------------------------------
+# Entities
+# ---------------------------------------------------------------------------
+# Minimum number of shared topics for an entity pair to be exported as a co-occurrence edge.
+COOCCURRENCE_MIN_COUNT: int = _env_int("COOCCURRENCE_MIN_COUNT", 2)
+# Process-parallel entity detection: 1 = serial, 0 = one worker per CPU.
+ENTITY_DETECTION_WORKERS: int = _env_int("ENTITY_DETECTION_WORKERS", 1)
+# Documents smaller than this (characters in topic blocks) are always scanned serially.
+ENTITY_PARALLEL_MIN_CHARS: int = _env_int("ENTITY_PARALLEL_MIN_CHARS", 2_000_000)
+# Optional stoplist of non-entity phrases (phrase list or Bloom filter; see entities/entity_stoplist.py).
+ENTITY_STOPLIST_PATH: Optional[Path] = _env_path("ENTITY_STOPLIST_PATH")
+# Cross-document entity type knowledge base: types learned in earlier runs are reused and
+# only unknown names are sent to the LLM for classification (entities/type_knowledge_base.py).
+ENTITY_KB_ENABLED: bool = _env_bool("ENTITY_KB_ENABLED", True)
+ENTITY_KB_PATH: Path = _env_path("ENTITY_KB_PATH") or Path(".cache") / "entity_types.sqlite3"
+# Known types below this confidence (share of document votes for the winning type) are re-asked.
+ENTITY_KB_MIN_CONFIDENCE: float = _env_float("ENTITY_KB_MIN_CONFIDENCE", 0.6)
+ENTITY_KB_READ_ONLY: bool = _env_bool("ENTITY_KB_READ_ONLY", False)
+
+# ---------------------------------------------------------------------------
+# Audit
+# ---------------------------------------------------------------------------
+# Threads evaluating audit rules (audit/rule_engine.py); output is identical for any value.
+AUDIT_WORKERS: int = _env_int("AUDIT_WORKERS", 1)
+# Topic risk weights (audit/risk_scorer.py), "name=value,..."; unnamed features keep their default.
+RISK_WEIGHTS: str = _env("RISK_WEIGHTS") or ""
+# Phrase lexicon for the vague_language audit rule (one phrase per line); built-in list when unset.
+VAGUE_LEXICON_PATH: Optional[Path] = _env_path("VAGUE_LEXICON_PATH")
 
 # ---------------------------------------------------------------------------
 # LLM — Google Gemini via google.genai SDK
 # ---------------------------------------------------------------------------
 LLM_API_KEY: Optional[str] = _env("LLM_API_KEY")
 LLM_MODEL: str = _env("LLM_MODEL") or "gemini-3-flash-preview"
-LLM_TIMEOUT: int = _env_int("LLM_TIMEOUT", 60)
+LLM_TIMEOUT: int = _env_int("LLM_TIMEOUT", 60)  # per-attempt deadline in seconds
+# Backend behind generate_content_text: gemini | record | replay | stub (see llm/backends.py).
+LLM_BACKEND: str = (_env("LLM_BACKEND") or "gemini").strip().lower()
+# Recordings written by the "record" backend and served by "replay" (LLM_DEBUG dumps also work).
+LLM_REPLAY_DIR: Path = _env_path("LLM_REPLAY_DIR") or Path(".cache") / "llm_recordings"
+# Stub backend: latency distribution (seconds; "0.05", "uniform:0.02,0.2", "lognormal:0.5,0.6",
+# "exponential:0.3"), fraction of requests failed, and HTTP statuses used for failures.
+LLM_STUB_LATENCY: str = _env("LLM_STUB_LATENCY") or "lognormal:0.5,0.6"
+LLM_STUB_ERROR_RATE: float = _env_float("LLM_STUB_ERROR_RATE", 0.0)
+LLM_STUB_ERROR_CODES: tuple[int, ...] = tuple(
+    int(c) for c in (_env("LLM_STUB_ERROR_CODES") or "503").split(",") if c.strip()
+)
+# Stream responses and validate JSON items as they arrive (llm/validator.py); false = one response.
+LLM_STREAM_RESPONSES: bool = _env_bool("LLM_STREAM_RESPONSES", True)
+# Retries for transient failures (timeouts, connection errors, HTTP 408/429/5xx), with
+# full-jitter exponential backoff between base and max delay (seconds).
+LLM_MAX_RETRIES: int = _env_int("LLM_MAX_RETRIES", 3)
+LLM_RETRY_BASE_DELAY: float = _env_float("LLM_RETRY_BASE_DELAY", 1.0)
+LLM_RETRY_MAX_DELAY: float = _env_float("LLM_RETRY_MAX_DELAY", 30.0)
+# Send a duplicate request when an attempt is slower than the observed p95 latency.
+LLM_HEDGE_REQUESTS: bool = _env_bool("LLM_HEDGE_REQUESTS", False)
+# Circuit breaker: open after this many consecutive transient failures (0 = off);
+# while open, LLM calls fail fast and the run falls back to deterministic output.
+LLM_BREAKER_THRESHOLD: int = _env_int("LLM_BREAKER_THRESHOLD", 5)
+LLM_BREAKER_COOLDOWN: int = _env_int("LLM_BREAKER_COOLDOWN", 60)  # seconds before a probe call
+# Optional API endpoint override (e.g. a local stub server for benchmarks).
+LLM_BASE_URL: Optional[str] = _env("LLM_BASE_URL") or None
+# Maximum in-flight LLM calls per process (also the shared client's keep-alive pool size).
+LLM_MAX_CONCURRENCY: int = _env_int("LLM_MAX_CONCURRENCY", 8)
+# Token-bucket rate limits shared by all LLM calls (0 = unlimited).
+LLM_REQUESTS_PER_MINUTE: int = _env_int("LLM_REQUESTS_PER_MINUTE", 0)
+LLM_TOKENS_PER_MINUTE: int = _env_int("LLM_TOKENS_PER_MINUTE", 0)
+# Run independent enrichment calls concurrently (asyncio) instead of one after another.
+LLM_CONCURRENT_ENRICHMENT: bool = _env_bool("LLM_CONCURRENT_ENRICHMENT", True)
+# One request per enrichment unit returning types, relationships and ambiguities together
+# (false = three separate requests per unit).
+LLM_COMBINED_ENRICHMENT: bool = _env_bool("LLM_COMBINED_ENRICHMENT", False)
+# Enrichment work units: "chunked" (whole document in topic-aligned chunks), "snippets"
+# (context windows around entity mentions) or "prefix" (first 12k chars).
+LLM_ENRICHMENT_MODE: str = (_env("LLM_ENRICHMENT_MODE") or "chunked").strip().lower()
+# Chunked/snippet modes: token budget per request excerpt (~4 chars/token) and maximum entity names per request.
+LLM_CHUNK_TOKENS: int = _env_int("LLM_CHUNK_TOKENS", 3000)
+LLM_CHUNK_MAX_ENTITIES: int = _env_int("LLM_CHUNK_MAX_ENTITIES", 60)
+# Snippet mode: characters of context on each side of a mention, and mentions sampled per entity.
+LLM_SNIPPET_CHARS: int = _env_int("LLM_SNIPPET_CHARS", 200)
+LLM_SNIPPETS_PER_ENTITY: int = _env_int("LLM_SNIPPETS_PER_ENTITY", 3)
+# Implicit references: LLM linking of cue-phrase sentences ("as described above") to topics.
+LLM_IMPLICIT_REFERENCES: bool = _env_bool("LLM_IMPLICIT_REFERENCES", True)
+LLM_REFERENCE_BATCH_SIZE: int = _env_int("LLM_REFERENCE_BATCH_SIZE", 20)  # candidate sentences per request
+LLM_REFERENCE_TARGETS: int = _env_int("LLM_REFERENCE_TARGETS", 8)  # shortlisted target topics per sentence
+# Topic summaries: bottom-up LLM summaries per topic in topic_map.json, cached by subtree content hash.
+LLM_TOPIC_SUMMARIES: bool = _env_bool("LLM_TOPIC_SUMMARIES", True)
+LLM_SUMMARY_BATCH_SIZE: int = _env_int("LLM_SUMMARY_BATCH_SIZE", 8)  # topics per request
+LLM_SUMMARY_CACHE_PATH: Path = _env_path("LLM_SUMMARY_CACHE_PATH") or Path(".cache") / "topic_summaries.sqlite3"
+# Prices in USD per million tokens, for the cost estimate in llm_metrics.json (0 = not priced).
+LLM_COST_PER_MTOK_INPUT: float = _env_float("LLM_COST_PER_MTOK_INPUT", 0.0)
+LLM_COST_PER_MTOK_OUTPUT: float = _env_float("LLM_COST_PER_MTOK_OUTPUT", 0.0)
 PROMPTS_DIR: Optional[Path] = _env_path("PROMPTS_DIR")
 # When True, save each LLM prompt and raw response under OUTPUT_DIR/llm_debug/ (for debugging).
 LLM_DEBUG: bool = _env_bool("LLM_DEBUG", False)
+# On-disk response cache: identical (model, prompt, temperature, schema version) requests are served locally.
+LLM_CACHE_ENABLED: bool = _env_bool("LLM_CACHE_ENABLED", True)
+LLM_CACHE_PATH: Path = _env_path("LLM_CACHE_PATH") or Path(".cache") / "llm_responses.sqlite3"
+LLM_CACHE_TTL: int = _env_int("LLM_CACHE_TTL", 30 * 24 * 3600)  # seconds; 0 = never expire
+LLM_CACHE_MAX_ENTRIES: int = _env_int("LLM_CACHE_MAX_ENTRIES", 10_000)  # LRU bound; 0 = unbounded
+# Serve cache hits but never write (e.g. CI with a committed cache file).
+LLM_CACHE_READ_ONLY: bool = _env_bool("LLM_CACHE_READ_ONLY", False)
 
 
 def skip_llm() -> bool:
-    """True if LLM enrichment should be skipped (no API key or explicit disable)."""
-    key = _env("LLM_API_KEY")
-    if not key or not key.strip():
+    """
+    True if LLM enrichment should be skipped (explicit disable, or no API key
+    for a backend that needs one; replay and stub backends run offline).
+    """
+    if _env_bool("SKIP_LLM", False):
         return True
-    return _env_bool("SKIP_LLM", False)
+    if LLM_BACKEND in ("replay", "stub"):
+        return False
+    key = _env("LLM_API_KEY")
+    return not key or not key.strip()
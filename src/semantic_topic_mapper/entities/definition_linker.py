@@ -4,18 +4,24 @@ Deterministic entity definition linking.
 Finds explicit definitions in text (e.g. "X" means ..., The term "X" shall
 mean ...) and enriches existing Entity objects with definition metadata. Handles
 only explicit definition patterns; does not use LLMs or infer definitions from
-context. Does not create new entities.
+context. Does not create new entities. Every definition found (including
+repeats of a term) is returned as a TermDefinition for consistency checks.
+
+With the shared DocumentIndex, a definition runs to the end of its sentence
+(so wrapped lines and abbreviations such as "e.g." no longer truncate it);
+without it, definition text stops at the first period or newline.
 """
 
 from __future__ import annotations
 
 import re
 
-from semantic_topic_mapper.entities.entity_models import Entity
+from semantic_topic_mapper.entities.entity_models import Entity, TermDefinition
+from semantic_topic_mapper.ingestion.document_index import DocumentIndex
 from semantic_topic_mapper.models.topic_models import TopicBlock
 
 
-# Definition text runs until first period or newline
+# Definition text runs until first period or newline (extended to sentence end with an index)
 _DEF_TAIL = r"([^.\n]*)"
 
 # Pattern A: "X" means ...
@@ -31,26 +37,44 @@ _PATTERN_C = re.compile(r"The\s+term\s+" r'"([^"]+)"\s+means\s+' + _DEF_TAIL)
 def link_entity_definitions(
     entities: list[Entity],
     blocks: list[TopicBlock],
-) -> None:
+    index: DocumentIndex | None = None,
+) -> list[TermDefinition]:
     """
     Find explicit definition patterns in blocks and attach definition_text and
     definition_topic to matching entities. First occurrence only; later
-    definitions for an entity are ignored (v1). Mutates Entity objects in place.
+    definitions for an entity do not replace it. Mutates Entity objects in place.
+    If index is given, definition text extends to the end of the sentence.
+    Returns every definition found, for all terms, in scan order.
     """
     lookup: dict[str, Entity] = {e.canonical_name: e for e in entities}
+    definitions: list[TermDefinition] = []
 
     for block in blocks:
         if block.topic_id is None:
             continue
         text = block.raw_text
         tid = block.topic_id
+        seen: set[int] = set()  # quote offsets; "The term" matches repeat pattern A
 
         for pattern in (_PATTERN_A, _PATTERN_B, _PATTERN_C):
             for mo in pattern.finditer(text):
                 quoted_term = mo.group(1).strip()
-                definition = mo.group(2).strip()
-                if not quoted_term or not definition:
+                if index is not None:
+                    definition, end = _sentence_tail(text, block.start_char, mo.start(2), index)
+                else:
+                    definition, end = mo.group(2).strip(), mo.end()
+                if not quoted_term or not definition or mo.start(1) in seen:
                     continue
+                seen.add(mo.start(1))
+                definitions.append(
+                    TermDefinition(
+                        term=quoted_term,
+                        text=definition,
+                        topic_id=tid,
+                        start_char=block.start_char + mo.start(),
+                        end_char=block.start_char + end,
+                    )
+                )
                 entity = lookup.get(quoted_term)
                 if entity is None:
                     continue
@@ -58,3 +82,16 @@ def link_entity_definitions(
                     continue
                 entity.definition_text = definition
                 entity.definition_topic = tid
+
+    return definitions
+
+
+def _sentence_tail(text: str, base: int, rel_start: int, index: DocumentIndex) -> tuple[str, int]:
+    """
+    Definition text from rel_start (relative to block text) to the end of its
+    sentence, clipped to the block; whitespace collapsed, final period dropped.
+    Also returns where that text ends (relative to block text).
+    """
+    _, sent_end = index.sentence_span_at(base + rel_start)
+    tail = text[rel_start : max(rel_start, sent_end - base)].rstrip().rstrip(".").rstrip()
+    return " ".join(tail.split()), rel_start + len(tail)
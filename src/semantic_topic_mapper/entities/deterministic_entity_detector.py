@@ -8,12 +8,24 @@ inference. Prioritizes precision over recall; some mentions may be missed.
 Subsequent LLM enrichment can propose more or link implicit mentions; such
 outputs are advisory and surfaced with confidence rather than altering the
 deterministic backbone automatically.
+
+Large documents can be scanned in a process pool: blocks are split into
+contiguous chunks of balanced text size, workers read the blocks from memory
+shared at pool start-up (inherited on fork, sent once per worker otherwise)
+rather than per task, and the per-chunk name→mentions maps are merged in chunk
+order. Merging is associative and preserves block order, so the result
+(including entity ID assignment) is identical to the serial scan.
 """
 
 from __future__ import annotations
 
+import multiprocessing
+import os
 import re
 from collections import defaultdict
+from collections.abc import Container
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
 from typing import cast
 
 from semantic_topic_mapper.entities.entity_models import Entity, EntityMention, RegionType
@@ -29,13 +41,60 @@ _CAP_PHRASE_PATTERN = re.compile(
 _QUOTED_PATTERN = re.compile(r'"([^"]+)"')
 
 
-def detect_entities(blocks: list[TopicBlock]) -> list[Entity]:
+# (start_char, end_char, topic_id, region_type, region_label)
+_MentionTuple = tuple[int, int, TopicID, str, str | None]
+_MentionMap = dict[str, list[_MentionTuple]]
+
+# Chunks per worker: several small chunks keep workers busy when block sizes vary.
+_CHUNKS_PER_WORKER = 4
+
+# Blocks visible to pool workers (set in the parent before fork, or by _init_worker).
+_SHARED_BLOCKS: list[TopicBlock] | None = None
+
+
+def detect_entities(
+    blocks: list[TopicBlock],
+    workers: int | None = None,
+    min_parallel_chars: int | None = None,
+    stoplist: Container[str] | None = None,
+) -> list[Entity]:
     """
     Extract high-confidence entity mentions from blocks and return entities
     with at least two mentions (grouped by exact canonical name match).
+
+    stoplist (see entity_stoplist.load_stoplist) drops candidate names known
+    not to be entities; each distinct candidate costs one O(1) membership test.
+
+    workers > 1 scans blocks in a process pool when the blocks hold at least
+    min_parallel_chars characters (defaults: ENTITY_DETECTION_WORKERS and
+    ENTITY_PARALLEL_MIN_CHARS from config; 0 workers means one per CPU).
+    Output is identical to the serial path.
     """
-    raw_mentions: list[tuple[str, int, int, TopicID, str, str | None]] = []
-    # (canonical_name, start_char, end_char, topic_id, region_type, region_label)
+    if workers is None or min_parallel_chars is None:
+        from semantic_topic_mapper.config import (
+            ENTITY_DETECTION_WORKERS,
+            ENTITY_PARALLEL_MIN_CHARS,
+        )
+
+        workers = ENTITY_DETECTION_WORKERS if workers is None else workers
+        if min_parallel_chars is None:
+            min_parallel_chars = ENTITY_PARALLEL_MIN_CHARS
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    total_chars = sum(len(b.raw_text) for b in blocks)
+    if workers > 1 and len(blocks) > 1 and total_chars >= min_parallel_chars:
+        by_name = _scan_parallel(blocks, workers)
+    else:
+        by_name = _scan_blocks(blocks)
+    if stoplist is not None:
+        by_name = {name: tuples for name, tuples in by_name.items() if name not in stoplist}
+    return _build_entities(by_name)
+
+
+def _scan_blocks(blocks: list[TopicBlock]) -> _MentionMap:
+    """Run Rule A and Rule B over each block's title, paragraph text, and subclauses."""
+    by_name: _MentionMap = defaultdict(list)
 
     for block in blocks:
         if block.topic_id is None:
@@ -45,32 +104,48 @@ def detect_entities(blocks: list[TopicBlock]) -> list[Entity]:
 
         if block.title:
             base = block.start_char
-            for text, rel_start, rel_end in _rule_a_matches(block.title):
-                raw_mentions.append((text, base + rel_start, base + rel_end, tid, "title", None))
+            for text, rel_start, rel_end in capitalized_phrase_matches(block.title):
+                by_name[text].append((base + rel_start, base + rel_end, tid, "title", None))
             for text, rel_start, rel_end in _rule_b_matches(block.title):
-                raw_mentions.append((text, base + rel_start, base + rel_end, tid, "title", None))
+                by_name[text].append((base + rel_start, base + rel_end, tid, "title", None))
 
         base = block.start_char
-        for text, rel_start, rel_end in _rule_a_matches(block.raw_text):
-            raw_mentions.append((text, base + rel_start, base + rel_end, tid, "paragraph", None))
+        for text, rel_start, rel_end in capitalized_phrase_matches(block.raw_text):
+            by_name[text].append((base + rel_start, base + rel_end, tid, "paragraph", None))
         for text, rel_start, rel_end in _rule_b_matches(block.raw_text):
-            raw_mentions.append((text, base + rel_start, base + rel_end, tid, "paragraph", None))
+            by_name[text].append((base + rel_start, base + rel_end, tid, "paragraph", None))
 
         for sub in block.subclauses:
             base = sub.start_char
-            for text, rel_start, rel_end in _rule_a_matches(sub.text):
-                raw_mentions.append(
-                    (text, base + rel_start, base + rel_end, tid, "subclause", sub.label)
+            for text, rel_start, rel_end in capitalized_phrase_matches(sub.text):
+                by_name[text].append(
+                    (base + rel_start, base + rel_end, tid, "subclause", sub.label)
                 )
             for text, rel_start, rel_end in _rule_b_matches(sub.text):
-                raw_mentions.append(
-                    (text, base + rel_start, base + rel_end, tid, "subclause", sub.label)
+                by_name[text].append(
+                    (base + rel_start, base + rel_end, tid, "subclause", sub.label)
                 )
 
-    by_name: dict[str, list[tuple[int, int, TopicID, str, str | None]]] = defaultdict(list)
-    for canonical_name, start_char, end_char, topic_id, region_type, region_label in raw_mentions:
-        by_name[canonical_name].append((start_char, end_char, topic_id, region_type, region_label))
+    return by_name
+
 
+def _merge_mention_maps(left: _MentionMap, right: _MentionMap) -> _MentionMap:
+    """
+    Append right's mentions after left's, per name (mutates and returns left).
+    Associative, so chunk maps can be folded in any grouping as long as chunk
+    order is kept.
+    """
+    for name, mentions in right.items():
+        existing = left.get(name)
+        if existing is None:
+            left[name] = mentions
+        else:
+            existing.extend(mentions)
+    return left
+
+
+def _build_entities(by_name: _MentionMap) -> list[Entity]:
+    """Keep names with at least two mentions; assign IDs in name order."""
     entities: list[Entity] = []
     eligible = [(name, tuples) for name, tuples in by_name.items() if len(tuples) >= 2]
     eligible.sort(key=lambda p: p[0])
@@ -100,8 +175,64 @@ def detect_entities(blocks: list[TopicBlock]) -> list[Entity]:
     return entities
 
 
-def _rule_a_matches(text: str) -> list[tuple[str, int, int]]:
-    """Rule A: capitalized multi-word phrases (2–5 words). Returns (phrase, start, end) relative to text."""
+def _balanced_chunks(blocks: list[TopicBlock], n_chunks: int) -> list[tuple[int, int]]:
+    """Split blocks into at most n_chunks contiguous [lo, hi) ranges of similar text size."""
+    total = sum(len(b.raw_text) for b in blocks)
+    target = max(1, total // max(1, n_chunks))
+    chunks: list[tuple[int, int]] = []
+    lo, size = 0, 0
+    for i, block in enumerate(blocks):
+        size += len(block.raw_text)
+        if size >= target and len(chunks) < n_chunks - 1:
+            chunks.append((lo, i + 1))
+            lo, size = i + 1, 0
+    if lo < len(blocks):
+        chunks.append((lo, len(blocks)))
+    return chunks
+
+
+def _init_worker(blocks: list[TopicBlock]) -> None:
+    global _SHARED_BLOCKS
+    _SHARED_BLOCKS = blocks
+
+
+def _scan_range(bounds: tuple[int, int]) -> _MentionMap:
+    lo, hi = bounds
+    assert _SHARED_BLOCKS is not None
+    return dict(_scan_blocks(_SHARED_BLOCKS[lo:hi]))
+
+
+def _scan_parallel(blocks: list[TopicBlock], workers: int) -> _MentionMap:
+    """Scan balanced block chunks in a process pool and merge the maps in chunk order."""
+    global _SHARED_BLOCKS
+    chunks = _balanced_chunks(blocks, workers * _CHUNKS_PER_WORKER)
+    if "fork" in multiprocessing.get_all_start_methods():
+        # Workers inherit the parent's memory; tasks carry only index ranges.
+        ctx = multiprocessing.get_context("fork")
+        _SHARED_BLOCKS = blocks
+        initializer, initargs = None, ()
+    else:
+        # Spawn: blocks are sent once per worker at start-up, not once per task.
+        ctx = multiprocessing.get_context()
+        initializer, initargs = _init_worker, (blocks,)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=ctx,
+            initializer=initializer,
+            initargs=initargs,
+        ) as pool:
+            partials = list(pool.map(_scan_range, chunks))
+    finally:
+        _SHARED_BLOCKS = None
+    return reduce(_merge_mention_maps, partials, {})
+
+
+def capitalized_phrase_matches(text: str) -> list[tuple[str, int, int]]:
+    """
+    Rule A: capitalized multi-word phrases (2–5 words). Returns (phrase, start, end) relative to text.
+    Public so stoplist building (entities/entity_stoplist.py) sees the same candidates.
+    """
     result: list[tuple[str, int, int]] = []
     for mo in _CAP_PHRASE_PATTERN.finditer(text):
         result.append((mo.group(0), mo.start(), mo.end()))
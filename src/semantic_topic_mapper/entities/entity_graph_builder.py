@@ -1 +1,176 @@
-# Build entity graph and topic–entity edges.
+"""
+Entity graph builder: entity–topic incidence and entity co-occurrence scoring.
+
+Builds a sparse entity×topic incidence matrix from entity mentions (an entity is
+incident to a topic if it is mentioned there at least once) and derives an
+entity×entity co-occurrence matrix, scored with PMI and Jaccard. Deterministic;
+does not use LLMs and does not infer relation semantics (see
+entity_relationship_extractor for typed relationships).
+
+Uses SciPy sparse matrices when available (X @ X.T over a CSR matrix); otherwise
+falls back to an inverted topic→entities index whose cost is the same as the
+sparse product (sum over topics of k_t², k_t = entities in topic t), never
+quadratic in the number of entities.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+
+from semantic_topic_mapper.entities.entity_models import Entity, EntityAssociation
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional; pure-array fallback below
+    np = None
+    sparse = None
+
+
+# Scores are rounded so that the sparse and fallback paths produce identical output.
+_SCORE_DIGITS = 6
+
+
+@dataclass
+class EntityTopicIncidence:
+    """
+    Sparse binary entity×topic incidence in coordinate form.
+
+    - entity_ids: row labels (entity_id, in input entity order)
+    - topic_ids: column labels (topic_id.raw, in order of first mention)
+    - rows, cols: one (row, col) pair per distinct entity–topic incidence
+    """
+
+    entity_ids: list[str]
+    topic_ids: list[str]
+    rows: array
+    cols: array
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (len(self.entity_ids), len(self.topic_ids))
+
+
+def build_entity_topic_incidence(entities: list[Entity]) -> EntityTopicIncidence:
+    """
+    Build the entity×topic incidence from entity mentions. Repeated mentions of
+    an entity in the same topic count once (binary incidence).
+    """
+    topic_index: dict[str, int] = {}
+    rows = array("l")
+    cols = array("l")
+    for row, entity in enumerate(entities):
+        seen: set[int] = set()
+        for mention in entity.mentions:
+            col = topic_index.setdefault(mention.topic_id.raw, len(topic_index))
+            if col in seen:
+                continue
+            seen.add(col)
+            rows.append(row)
+            cols.append(col)
+    return EntityTopicIncidence(
+        entity_ids=[e.entity_id for e in entities],
+        topic_ids=list(topic_index),
+        rows=rows,
+        cols=cols,
+    )
+
+
+def compute_entity_cooccurrence(
+    entities: list[Entity],
+    min_cooccurrence: int = 2,
+) -> list[EntityAssociation]:
+    """
+    Score every entity pair that co-occurs in at least min_cooccurrence topics.
+
+    PMI is computed over topics: log2(c_ab * T / (df_a * df_b)), where c_ab is
+    the number of shared topics, df_x the number of topics mentioning x, and T
+    the number of topics with at least one entity. Returns associations ordered
+    by (source, target) position in the input entity list.
+    """
+    incidence = build_entity_topic_incidence(entities)
+    if not incidence.rows:
+        return []
+    min_cooccurrence = max(1, min_cooccurrence)
+    if sparse is not None:
+        triples = _cooccurrence_sparse(incidence, min_cooccurrence)
+    else:
+        triples = _cooccurrence_arrays(incidence, min_cooccurrence)
+    ids = incidence.entity_ids
+    return [
+        EntityAssociation(
+            source_entity_id=ids[a],
+            target_entity_id=ids[b],
+            cooccurrence=count,
+            pmi=pmi,
+            jaccard=jaccard,
+        )
+        for a, b, count, pmi, jaccard in triples
+    ]
+
+
+def _cooccurrence_sparse(
+    incidence: EntityTopicIncidence,
+    min_cooccurrence: int,
+) -> list[tuple[int, int, int, float, float]]:
+    """Vectorized path: C = X @ X.T on a CSR incidence matrix; upper triangle only."""
+    n_entities, n_topics = incidence.shape
+    rows = np.frombuffer(incidence.rows, dtype=np.dtype(f"i{incidence.rows.itemsize}"))
+    cols = np.frombuffer(incidence.cols, dtype=np.dtype(f"i{incidence.cols.itemsize}"))
+    x = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+        shape=(n_entities, n_topics),
+    )
+    df = np.asarray(x.sum(axis=1)).ravel().astype(np.float64)
+    co = sparse.triu(x @ x.T, k=1).tocoo()
+    keep = co.data >= min_cooccurrence
+    a, b, n = co.row[keep], co.col[keep], co.data[keep].astype(np.float64)
+    if len(n) == 0:
+        return []
+    pmi = np.round(np.log2(n * n_topics / (df[a] * df[b])), _SCORE_DIGITS)
+    jaccard = np.round(n / (df[a] + df[b] - n), _SCORE_DIGITS)
+    order = np.lexsort((b, a))
+    return list(
+        zip(
+            a[order].tolist(),
+            b[order].tolist(),
+            n[order].astype(np.int64).tolist(),
+            pmi[order].tolist(),
+            jaccard[order].tolist(),
+        )
+    )
+
+
+def _cooccurrence_arrays(
+    incidence: EntityTopicIncidence,
+    min_cooccurrence: int,
+) -> list[tuple[int, int, int, float, float]]:
+    """Fallback path: count pairs per topic via an inverted topic→entities index."""
+    n_entities, n_topics = incidence.shape
+    by_topic: list[list[int]] = [[] for _ in range(n_topics)]
+    df = [0] * n_entities
+    for row, col in zip(incidence.rows, incidence.cols):
+        by_topic[col].append(row)
+        df[row] += 1
+
+    pair_counts: Counter[int] = Counter()
+    for members in by_topic:
+        members.sort()
+        for i, a in enumerate(members):
+            base = a * n_entities
+            for b in members[i + 1 :]:
+                pair_counts[base + b] += 1
+
+    result: list[tuple[int, int, int, float, float]] = []
+    for key in sorted(pair_counts):
+        count = pair_counts[key]
+        if count < min_cooccurrence:
+            continue
+        a, b = divmod(key, n_entities)
+        pmi = math.log2(count * n_topics / (df[a] * df[b]))
+        jaccard = count / (df[a] + df[b] - count)
+        result.append((a, b, count, round(pmi, _SCORE_DIGITS), round(jaccard, _SCORE_DIGITS)))
+    return result
@@ -5,7 +5,9 @@ These models represent entities, their mentions, and relationships in the
 document. They are part of the semantic layer (entity extraction and
 enrichment), not the structural hierarchy (topics, blocks, nodes).
 EntityRelationship is a core model (source/target entity IDs, relation_type,
-topic_id) used by the entity graph and entity_relationship_exporter. This
+topic_id) used by the entity graph and entity_relationship_exporter.
+EntityAssociation is an undirected, statistically scored co-occurrence edge
+produced by entity_graph_builder (no relation semantics implied). This
 module defines data structures only; detection and grouping logic live elsewhere.
 """
 
@@ -62,6 +64,21 @@ class Entity:
     definition_topic: TopicID | None = None  # topic where definition appears
 
 
+@dataclass
+class TermDefinition:
+    """
+    One explicit definition found in the text ("X" means ...). A term may be
+    defined more than once; Entity.definition_text keeps the first.
+    start_char/end_char span the definition pattern match.
+    """
+
+    term: str
+    text: str
+    topic_id: TopicID
+    start_char: int
+    end_char: int
+
+
 @dataclass
 class EntityRelationship:
     """
@@ -73,3 +90,23 @@ class EntityRelationship:
     target_entity_id: str
     relation_type: str
     topic_id: TopicID  # topic where the relationship is expressed
+
+
+@dataclass
+class EntityAssociation:
+    """
+    An undirected association between two entities derived from topic
+    co-occurrence (not a semantic relationship).
+
+    - cooccurrence: number of topics in which both entities are mentioned.
+    - pmi: pointwise mutual information, log2(P(a,b) / (P(a) * P(b))) over topics.
+    - jaccard: |topics(a) & topics(b)| / |topics(a) | topics(b)|.
+
+    source_entity_id is always the entity listed first in the input entity list.
+    """
+
+    source_entity_id: str
+    target_entity_id: str
+    cooccurrence: int
+    pmi: float
+    jaccard: float
@@ -1,22 +1,164 @@
 """
-Entity relationship extraction.
+Deterministic entity relationship extraction.
 
-Produces list of EntityRelationship from entities and blocks. v1: returns
-empty list; relationship inference may be added later (deterministic or LLM).
+Produces a list of EntityRelationship from entities and blocks using precompiled
+verb-pattern rules ("X shall report to Y", "X oversees Y", "X must notify Y").
+Each verb match is resolved against the document-wide sentence index: the
+source is the nearest entity mention ending before the verb and the target the
+nearest mention starting after it, both within the same sentence. Mentions are
+looked up by bisecting a sorted mention-start array, so cost is linear in the
+document length (one regex pass per block) plus O(log m) per verb match.
+Does not use LLMs; relation types are the same closed set the LLM enricher uses.
 """
 
 from __future__ import annotations
 
-from semantic_topic_mapper.entities.entity_models import Entity, EntityRelationship
+import re
+from array import array
+from bisect import bisect_left
+
+from semantic_topic_mapper.entities.entity_models import (
+    Entity,
+    EntityMention,
+    EntityRelationship,
+)
+from semantic_topic_mapper.ingestion.document_index import DocumentIndex, build_document_index
 from semantic_topic_mapper.models.topic_models import TopicBlock
 
 
+# Verb rules: relation_type -> verb phrase. An optional modal ("shall", "must", ...)
+# is shared by all rules; the named group that matches gives the relation type.
+_RELATION_RULES: tuple[tuple[str, str], ...] = (
+    (
+        "reports_to",
+        r"(?:report|reports)\s+(?:directly\s+|promptly\s+)?to"
+        r"|(?:is|are|be|remain|remains)\s+(?:directly\s+)?(?:accountable|answerable|responsible)\s+to",
+    ),
+    ("oversees", r"oversee|oversees|supervise|supervises|monitor|monitors"),
+    (
+        "obligation_to",
+        r"(?:notify|notifies|inform|informs)"
+        r"|(?:submit|submits|provide|provides|deliver|delivers|disclose|discloses|file|files)"
+        r"(?:\s+[a-z][\w-]*){0,3}\s+(?:to|with)",
+    ),
+    ("advises", r"advise|advises"),
+    ("governs", r"govern|governs|regulate|regulates"),
+)
+
+_RELATION_PATTERN = re.compile(
+    r"\b(?:(?:shall|must|will|should|may)\s+(?:also\s+|promptly\s+|immediately\s+)?)?(?:"
+    + "|".join(f"(?P<{name}>{verb})" for name, verb in _RELATION_RULES)
+    + r")\b"
+)
+
+# Maximum characters between source mention and verb, and between verb and target.
+_MAX_GAP = 80
+# Text between an entity and the verb must not cross a clause separator.
+_CLAUSE_BREAK = re.compile(r"[;:]")
+
+
 def extract_entity_relationships(
     entities: list[Entity],
     blocks: list[TopicBlock],
+    index: DocumentIndex | None = None,
 ) -> list[EntityRelationship]:
     """
-    Extract directed relationships between entities (e.g. source reports to
-    target). v1: returns empty list; no inference implemented yet.
+    Extract directed relationships between entities from verb patterns.
+
+    index is the document-wide sentence index (built once by the pipeline). When
+    None, each block is indexed on its own, which gives the same sentences for
+    blocks whose boundaries coincide with sentence boundaries (the common case).
+    Returns one relationship per distinct (source, target, relation_type), in
+    document order of first occurrence; topic_id is the topic of that occurrence.
+    """
+    if not entities:
+        return []
+
+    owners: list[int] = []
+    mentions: list[EntityMention] = []
+    for idx, entity in enumerate(entities):
+        for mention in entity.mentions:
+            owners.append(idx)
+            mentions.append(mention)
+    order = sorted(range(len(mentions)), key=lambda i: (mentions[i].start_char, mentions[i].end_char))
+    starts = array("q", (mentions[i].start_char for i in order))
+    ends = array("q", (mentions[i].end_char for i in order))
+    owner_of = [owners[i] for i in order]
+    sorted_mentions = [mentions[i] for i in order]
+
+    seen: set[tuple[str, str, str]] = set()
+    result: list[EntityRelationship] = []
+    for block in blocks:
+        if block.topic_id is None:
+            continue
+        if index is None:
+            local_index, index_base = build_document_index(block.raw_text), block.start_char
+        else:
+            local_index, index_base = index, 0
+        text = block.raw_text
+        base = block.start_char
+
+        for mo in _RELATION_PATTERN.finditer(text):
+            relation_type = mo.lastgroup
+            if relation_type is None:
+                continue
+            verb_start = base + mo.start()
+            verb_end = base + mo.end()
+            sent_start, sent_end = local_index.sentence_span_at(verb_start - index_base)
+            sent_start += index_base
+            sent_end += index_base
+
+            source = _mention_before(starts, ends, verb_start, sent_start)
+            target = _mention_after(starts, verb_end, sent_end)
+            if source is None or target is None:
+                continue
+            if not _close_enough(text, base, ends[source], verb_start):
+                continue
+            if not _close_enough(text, base, verb_end, starts[target]):
+                continue
+            source_entity = entities[owner_of[source]]
+            target_entity = entities[owner_of[target]]
+            if source_entity is target_entity:
+                continue
+            key = (source_entity.entity_id, target_entity.entity_id, relation_type)
+            if key in seen:
+                continue
+            seen.add(key)
+            result.append(
+                EntityRelationship(
+                    source_entity_id=source_entity.entity_id,
+                    target_entity_id=target_entity.entity_id,
+                    relation_type=relation_type,
+                    topic_id=sorted_mentions[source].topic_id,
+                )
+            )
+    return result
+
+
+def _mention_before(starts: array, ends: array, offset: int, lower: int) -> int | None:
+    """
+    Index of the mention ending nearest before offset and starting at or after
+    lower. Walks back past mentions that overlap offset (nested/overlapping spans).
     """
-    return []
+    i = bisect_left(starts, offset) - 1
+    while i >= 0 and starts[i] >= lower:
+        if ends[i] <= offset:
+            return i
+        i -= 1
+    return None
+
+
+def _mention_after(starts: array, offset: int, upper: int) -> int | None:
+    """Index of the first mention starting at or after offset and before upper."""
+    i = bisect_left(starts, offset)
+    if i < len(starts) and starts[i] < upper:
+        return i
+    return None
+
+
+def _close_enough(text: str, base: int, start: int, end: int) -> bool:
+    """True if the gap [start, end) is short and does not cross a clause break."""
+    if end - start > _MAX_GAP:
+        return False
+    gap = text[max(0, start - base) : max(0, end - base)]
+    return _CLAUSE_BREAK.search(gap) is None
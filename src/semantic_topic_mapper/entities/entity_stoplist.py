@@ -0,0 +1,227 @@
+"""
+Entity stoplist: corpus-learned non-entity phrases for false-positive suppression.
+
+Rule A of the deterministic detector picks up phrases that are capitalized only
+because of where they sit (sentence starts, list items, Title Case headings),
+e.g. "The Firm" or "In Accordance". This module learns such phrases from
+frequency statistics over many documents and stores them either as a plain
+phrase list (loaded as a frozenset) or as a compact Bloom filter. Both give an
+O(1) membership test that detect_entities applies to each candidate name.
+
+Build from the command line:
+
+  python -m semantic_topic_mapper.entities.entity_stoplist data/corpus/ -o output/entity_stoplist.bloom --bloom
+  python -m semantic_topic_mapper.entities.entity_stoplist a.txt b.txt -o output/entity_stoplist.txt
+
+Deterministic; does not use LLMs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import math
+import re
+import struct
+from collections import Counter
+from collections.abc import Container, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from semantic_topic_mapper.entities.deterministic_entity_detector import capitalized_phrase_matches
+from semantic_topic_mapper.ingestion.document_index import build_document_index
+
+
+_BLOOM_MAGIC = b"STMBLM1\n"
+_BLOOM_HEADER = struct.Struct("<QQQ")  # m_bits, k_hashes, n_items
+
+# Text allowed between a sentence start and a phrase for the phrase to count as
+# positionally capitalized: nothing, a subclause label, or a topic ID / "TOPIC N:".
+_POSITIONAL_PREFIX = re.compile(
+    r"\s*(?:\([a-zA-Z0-9]{1,4}\)|(?i:topic)\s+[\w.]+\s*:|\d+(?:\.\d+)*(?:\.[a-zA-Z])?)?\s*"
+)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings (no false negatives; false-positive
+    rate set at construction). Uses double hashing over one BLAKE2b digest.
+    """
+
+    def __init__(self, m_bits: int, k_hashes: int, bits: bytearray | None = None, n_items: int = 0):
+        self.m_bits = max(8, m_bits)
+        self.k_hashes = max(1, k_hashes)
+        self.bits = bits if bits is not None else bytearray((self.m_bits + 7) // 8)
+        self.n_items = n_items
+
+    @classmethod
+    def for_capacity(cls, n_items: int, fp_rate: float = 0.001) -> BloomFilter:
+        """Size a filter for n_items at the given false-positive rate."""
+        n = max(1, n_items)
+        m = math.ceil(-n * math.log(fp_rate) / (math.log(2) ** 2))
+        k = max(1, round(m / n * math.log(2)))
+        return cls(m, k)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.m_bits for i in range(self.k_hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.n_items += 1
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def to_bytes(self) -> bytes:
+        return _BLOOM_MAGIC + _BLOOM_HEADER.pack(self.m_bits, self.k_hashes, self.n_items) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> BloomFilter:
+        if not data.startswith(_BLOOM_MAGIC):
+            raise ValueError("Not an entity stoplist Bloom filter file")
+        offset = len(_BLOOM_MAGIC)
+        m_bits, k_hashes, n_items = _BLOOM_HEADER.unpack_from(data, offset)
+        bits = bytearray(data[offset + _BLOOM_HEADER.size :])
+        if len(bits) != (m_bits + 7) // 8:
+            raise ValueError("Truncated entity stoplist Bloom filter file")
+        return cls(m_bits, k_hashes, bits, n_items)
+
+
+@dataclass
+class PhraseStats:
+    """Corpus statistics for one Rule A candidate phrase."""
+
+    occurrences: int = 0
+    positional: int = 0  # occurrences at a sentence/list-item start or heading
+    documents: int = 0
+
+
+def load_stoplist(path: Path | str) -> Container[str]:
+    """
+    Load a stoplist file: a Bloom filter (binary, written with bloom=True) or a
+    UTF-8 phrase list (one phrase per line; blank lines and # comments ignored).
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Entity stoplist not found: {path}")
+    data = path.read_bytes()
+    if data.startswith(_BLOOM_MAGIC):
+        return BloomFilter.from_bytes(data)
+    lines = data.decode("utf-8").splitlines()
+    return frozenset(
+        line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")
+    )
+
+
+def save_stoplist(
+    phrases: Iterable[str],
+    path: Path | str,
+    bloom: bool = False,
+    fp_rate: float = 0.001,
+) -> Path:
+    """Write phrases as a Bloom filter (bloom=True) or a sorted phrase list."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    unique = sorted(set(phrases))
+    if bloom:
+        bf = BloomFilter.for_capacity(len(unique), fp_rate)
+        for phrase in unique:
+            bf.add(phrase)
+        path.write_bytes(bf.to_bytes())
+    else:
+        body = "".join(f"{p}\n" for p in unique)
+        path.write_text("# Entity stoplist: one phrase per line\n" + body, encoding="utf-8")
+    return path
+
+
+def collect_phrase_stats(texts: Iterable[str]) -> tuple[dict[str, PhraseStats], int]:
+    """
+    Count Rule A candidates across documents: total occurrences, positional
+    occurrences, and document frequency. Returns (stats, number of documents).
+    """
+    stats: dict[str, PhraseStats] = {}
+    n_docs = 0
+    for text in texts:
+        n_docs += 1
+        index = build_document_index(text)
+        seen: Counter[str] = Counter()
+        for phrase, start, _ in capitalized_phrase_matches(text):
+            entry = stats.get(phrase)
+            if entry is None:
+                entry = stats[phrase] = PhraseStats()
+            entry.occurrences += 1
+            sent_start, _ = index.sentence_span_at(start)
+            if _POSITIONAL_PREFIX.fullmatch(text, sent_start, start):
+                entry.positional += 1
+            seen[phrase] += 1
+        for phrase in seen:
+            stats[phrase].documents += 1
+    return stats, n_docs
+
+
+def build_stoplist(
+    texts: Iterable[str],
+    min_documents: int = 2,
+    min_occurrences: int = 3,
+    positional_ratio: float = 0.8,
+) -> list[str]:
+    """
+    Learn non-entity phrases: candidates seen in at least min_documents
+    documents and min_occurrences times overall, of which at least
+    positional_ratio occur where capitalization is positional (sentence or
+    list-item start, heading). Real entities keep their capitalization
+    mid-sentence and fall below the ratio.
+    """
+    stats, _ = collect_phrase_stats(texts)
+    return sorted(
+        phrase
+        for phrase, s in stats.items()
+        if s.documents >= min_documents
+        and s.occurrences >= min_occurrences
+        and s.positional / s.occurrences >= positional_ratio
+    )
+
+
+def _iter_input_texts(paths: list[str], encoding: str) -> Iterable[str]:
+    """Yield document texts from files and directories (*.txt, recursively)."""
+    from semantic_topic_mapper.ingestion.loader import load_text
+
+    for raw in paths:
+        p = Path(raw)
+        files = sorted(p.rglob("*.txt")) if p.is_dir() else [p]
+        for f in files:
+            yield load_text(f, encoding=encoding)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Build an entity stoplist from corpus frequency statistics.",
+    )
+    parser.add_argument("inputs", nargs="+", help="Input .txt files or directories of .txt files.")
+    parser.add_argument("-o", "--output", required=True, help="Stoplist file to write.")
+    parser.add_argument("--bloom", action="store_true", help="Write a Bloom filter instead of a phrase list.")
+    parser.add_argument("--fp-rate", type=float, default=0.001, help="Bloom filter false-positive rate.")
+    parser.add_argument("--min-documents", type=int, default=2)
+    parser.add_argument("--min-occurrences", type=int, default=3)
+    parser.add_argument("--positional-ratio", type=float, default=0.8)
+    parser.add_argument("--encoding", default="utf-8")
+    args = parser.parse_args(argv)
+
+    phrases = build_stoplist(
+        _iter_input_texts(args.inputs, args.encoding),
+        min_documents=args.min_documents,
+        min_occurrences=args.min_occurrences,
+        positional_ratio=args.positional_ratio,
+    )
+    out = save_stoplist(phrases, args.output, bloom=args.bloom, fp_rate=args.fp_rate)
+    print(f"[Stoplist] {len(phrases)} phrases written to {out}")
+
+
+if __name__ == "__main__":
+    main()
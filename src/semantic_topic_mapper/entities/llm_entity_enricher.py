@@ -2,68 +2,109 @@
 LLM-based entity enrichment: entity type classification, relationship extraction,
 and entity ambiguity detection.
 
-Uses Gemini (google.genai) only. All prompts request JSON; outputs are
-validated before applying. LLM never invents new entities or modifies topic structure.
+Uses Gemini (google.genai) only. All prompts request JSON; responses are
+streamed and each item is validated against llm/schemas.py as it arrives
+(llm/validator.py), before applying. LLM never invents new entities or modifies topic structure.
+
+run_entity_enrichment() is map-reduce: the document is split into units (an
+excerpt plus the entities to ask about; see plan_enrichment_units), the three
+calls run per unit (or one combined call returning all three sections), and
+results are reduced per entity. In "chunked" mode the units are token-budgeted
+topic chunks, so the whole document is covered and each request stays
+bounded; "prefix" mode sends the first 12k characters with
+every entity in one unit; "snippets" mode sends short windows around each
+entity's mentions, so prompt size follows the entity count. Calls are issued
+concurrently (asyncio over worker threads, under the shared rate limiter and
+concurrency cap in llm/) and merged in a fixed order.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
-import re
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
 
 from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue
 from semantic_topic_mapper.entities.entity_models import Entity, EntityRelationship
+from semantic_topic_mapper.entities.type_knowledge_base import get_type_knowledge_base
+from semantic_topic_mapper.llm.chunking import (
+    EnrichmentUnit,
+    batch_entities_by_chunk,
+    pack_topic_chunks,
+)
+from semantic_topic_mapper.llm.rate_limiter import estimate_tokens
+from semantic_topic_mapper.llm.resilience import get_circuit_breaker
+from semantic_topic_mapper.llm.schemas import (
+    ENTITY_TYPES,
+    RELATION_TYPES,
+    AmbiguityItem,
+    EntityTypeItem,
+    RelationshipItem,
+)
+from semantic_topic_mapper.llm.snippets import build_snippet_units
+from semantic_topic_mapper.llm.telemetry import llm_stage
+from semantic_topic_mapper.llm.validator import StreamingItemParser, iter_response_items
+from semantic_topic_mapper.models.topic_models import TopicBlock
 
 logger = logging.getLogger(__name__)
 
-VALID_ENTITY_TYPES = frozenset({
-    "organization",
-    "role",
-    "temporal",
-    "legal_construct",
-    "other",
-})
-
-VALID_RELATION_TYPES = frozenset({
-    "reports_to",
-    "oversees",
-    "obligation_to",
-    "advises",
-    "governs",
-})
-
-
-def _extract_json_from_response(text: str) -> str:
-    """Strip markdown code fences if present and return inner string."""
-    text = text.strip()
-    match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
-    if match:
-        return match.group(1).strip()
-    return text
-
-
-def _call_gemini_json(prompt: str, description: str) -> dict[str, Any] | None:
-    """Call Gemini with temperature 0; parse and return JSON dict or None on failure."""
+VALID_ENTITY_TYPES = frozenset(ENTITY_TYPES)
+
+# Bump when a prompt's expected JSON response shape changes (invalidates cached responses).
+RESPONSE_SCHEMA_VERSION = "1"
+
+VALID_RELATION_TYPES = frozenset(RELATION_TYPES)
+
+# Document prefix sent with each prompt in "prefix" mode.
+PREFIX_EXCERPT_CHARS = 12000
+
+
+def _stream_llm_text(prompt: str, description: str) -> Iterable[str]:
+    """Response text pieces for a prompt (temperature 0), as they arrive."""
+    from semantic_topic_mapper.llm.client import stream_content_text
+
+    return stream_content_text(
+        prompt,
+        temperature=0.0,
+        debug_label=description,
+        schema_version=RESPONSE_SCHEMA_VERSION,
+    )
+
+
+def _llm_items(
+    prompt: str,
+    description: str,
+    sections: tuple[str, ...],
+    stage: str,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Yield (section, item) for each schema-valid item of the response sections
+    as the response streams in (llm/validator.py). Failures are logged and end
+    the stream; items already yielded stand. The call is counted under `stage`
+    in LLM telemetry.
+    """
+    parser = StreamingItemParser(sections)
     try:
-        from semantic_topic_mapper.llm.client import generate_content_text
-
-        text = generate_content_text(prompt, temperature=0.0, debug_label=description)
-        if not text:
-            logger.warning("LLM %s: empty response", description)
-            return None
-        raw = _extract_json_from_response(text)
-        return json.loads(raw)
+        with llm_stage(stage):
+            yield from iter_response_items(_stream_llm_text(prompt, description), sections, parser)
     except ValueError as e:
         logger.warning("LLM %s: config/API key issue: %s", description, e)
-        return None
-    except json.JSONDecodeError as e:
-        logger.warning("LLM %s: invalid JSON: %s", description, e)
-        return None
+        return
     except Exception as e:
         logger.warning("LLM %s: %s", description, e)
-        return None
+        return
+    if not parser.saw_object:
+        logger.warning("LLM %s: empty response or no JSON object", description)
+
+
+def _description(description: str, label: str) -> str:
+    return f"{description} {label}" if label else description
 
 
 def enrich_entity_types(entities: list[Entity], full_text: str) -> None:
@@ -72,8 +113,29 @@ def enrich_entity_types(entities: list[Entity], full_text: str) -> None:
     legal_construct, other. Only updates entity.entity_type where it is currently None.
     Ignores names not in the deterministic entity list. In-place only; no new entities.
     """
+    apply_entity_types(entities, classify_entity_types(entities, full_text))
+
+
+def apply_entity_types(entities: list[Entity], types_by_name: dict[str, str]) -> None:
+    """Set entity_type from a name -> type mapping where it is currently None."""
+    for entity in entities:
+        typ = types_by_name.get(entity.canonical_name)
+        if typ is not None and entity.entity_type is None:
+            entity.entity_type = typ
+
+
+def classify_entity_types(
+    entities: list[Entity],
+    full_text: str,
+    excerpt_chars: int | None = PREFIX_EXCERPT_CHARS,
+    label: str = "",
+) -> dict[str, str]:
+    """
+    Ask Gemini for entity types and return validated name -> type for names in
+    the entity list. Does not modify entities (see apply_entity_types).
+    """
     if not entities:
-        return
+        return {}
 
     names = [e.canonical_name for e in entities]
     name_set = frozenset(names)
@@ -83,7 +145,7 @@ def enrich_entity_types(entities: list[Entity], full_text: str) -> None:
 Allowed types only: organization, role, temporal, legal_construct, other.
 
 Document excerpt (for context, length limited):
-{full_text[:12000]}
+{full_text[:excerpt_chars]}
 
 Entity names to classify (use these exact strings):
 {json.dumps(names)}
@@ -93,26 +155,25 @@ Respond with ONLY a single JSON object, no other text:
 
 Every name in the list must appear exactly once. Use the exact name string from the list."""
 
-    data = _call_gemini_json(prompt, "entity type enrichment")
-    if not data or "entities" not in data or not isinstance(data["entities"], list):
-        return
+    result: dict[str, str] = {}
+    for _, item in _llm_items(
+        prompt, _description("entity type enrichment", label), ("entities",), "entity_types"
+    ):
+        _add_entity_type(result, item, name_set)
+    return result
 
-    by_name = {e.canonical_name: e for e in entities}
-    for item in data["entities"]:
-        if not isinstance(item, dict):
-            continue
-        name = item.get("name")
-        typ = item.get("type")
-        if name not in name_set or typ not in VALID_ENTITY_TYPES:
-            continue
-        entity = by_name.get(name)
-        if entity is not None and entity.entity_type is None:
-            entity.entity_type = typ
+
+def _add_entity_type(result: dict[str, str], item: EntityTypeItem, name_set: frozenset[str]) -> None:
+    """Keep a schema-valid type answer for a known name; first answer wins."""
+    if item.name in name_set:
+        result.setdefault(item.name, item.type)
 
 
 def extract_llm_entity_relationships(
     entities: list[Entity],
     full_text: str,
+    excerpt_chars: int | None = PREFIX_EXCERPT_CHARS,
+    label: str = "",
 ) -> list[EntityRelationship]:
     """
     Use Gemini to extract relationships only between the given entities.
@@ -123,7 +184,6 @@ def extract_llm_entity_relationships(
         return []
 
     names = [e.canonical_name for e in entities]
-    name_set = frozenset(names)
     by_name = {e.canonical_name: e for e in entities}
 
     prompt = f"""You are a document analyst. Extract relationships between the following entities only. Do not add any entity not in the list.
@@ -131,7 +191,7 @@ def extract_llm_entity_relationships(
 Allowed relation_type values only: reports_to, oversees, obligation_to, advises, governs.
 
 Document excerpt (for context, length limited):
-{full_text[:12000]}
+{full_text[:excerpt_chars]}
 
 Entity names (use these exact strings; source and target must be from this list):
 {json.dumps(names)}
@@ -141,57 +201,71 @@ Respond with ONLY a single JSON object, no other text:
 
 Only include relationships explicitly supported by the document. Both source and target must be from the entity list above."""
 
-    data = _call_gemini_json(prompt, "LLM relationship extraction")
-    if not data or "relationships" not in data or not isinstance(data["relationships"], list):
-        return []
-
     result: list[EntityRelationship] = []
-    for item in data["relationships"]:
-        if not isinstance(item, dict):
-            continue
-        source_name = item.get("source")
-        target_name = item.get("target")
-        relation_type = item.get("relation_type")
-        if (
-            source_name not in name_set
-            or target_name not in name_set
-            or relation_type not in VALID_RELATION_TYPES
-        ):
-            continue
-        source_entity = by_name[source_name]
-        target_entity = by_name[target_name]
-        result.append(
-            EntityRelationship(
-                source_entity_id=source_entity.entity_id,
-                target_entity_id=target_entity.entity_id,
-                relation_type=relation_type,
-                topic_id=source_entity.first_seen_topic,
-            )
-        )
+    for _, item in _llm_items(
+        prompt, _description("LLM relationship extraction", label), ("relationships",), "relationships"
+    ):
+        _add_relationship(result, item, by_name)
     return result
 
 
+def _add_relationship(
+    result: list[EntityRelationship],
+    item: RelationshipItem,
+    by_name: dict[str, Entity],
+) -> None:
+    """Keep a schema-valid relationship whose source and target are in the entity list."""
+    if item.source not in by_name or item.target not in by_name:
+        return
+    source_entity = by_name[item.source]
+    target_entity = by_name[item.target]
+    result.append(
+        EntityRelationship(
+            source_entity_id=source_entity.entity_id,
+            target_entity_id=target_entity.entity_id,
+            relation_type=item.relation_type,
+            topic_id=source_entity.first_seen_topic,
+        )
+    )
+
+
 def detect_entity_ambiguities(
     entities: list[Entity],
     full_text: str,
+    excerpt_chars: int | None = PREFIX_EXCERPT_CHARS,
+    label: str = "",
 ) -> list[AuditIssue]:
     """
     Use Gemini to identify entities that appear ambiguous: undefined modifiers,
     referenced but never clearly defined, or possibly referring to multiple concepts.
     Returns AuditIssue list with issue_type="entity_ambiguity", severity="warning".
     """
+    reasons = find_ambiguous_entities(entities, full_text, excerpt_chars, label)
+    return _ambiguity_issues(entities, reasons)
+
+
+def find_ambiguous_entities(
+    entities: list[Entity],
+    full_text: str,
+    excerpt_chars: int | None = PREFIX_EXCERPT_CHARS,
+    label: str = "",
+) -> dict[str, str]:
+    """
+    Ask Gemini which entities are ambiguous; return name -> reason (response
+    order, first reason per name) for names in the entity list.
+    """
     if not entities:
-        return []
+        return {}
 
     names = [e.canonical_name for e in entities]
-    by_name = {e.canonical_name: e for e in entities}
+    name_set = frozenset(names)
 
     prompt = f"""You are a document analyst. Identify entities that are ambiguous in the document.
 
 Consider: entities that appear to include undefined modifiers; are referenced but never clearly defined; or might refer to multiple concepts.
 
 Document excerpt (for context, length limited):
-{full_text[:12000]}
+{full_text[:excerpt_chars]}
 
 Entity names to consider (from our extraction):
 {json.dumps(names)}
@@ -201,29 +275,393 @@ Respond with ONLY a single JSON object, no other text:
 
 Only include entities from the list above. Leave ambiguous_entities empty if none are ambiguous."""
 
-    data = _call_gemini_json(prompt, "entity ambiguity detection")
-    if not data or "ambiguous_entities" not in data or not isinstance(data["ambiguous_entities"], list):
-        return []
+    result: dict[str, str] = {}
+    description = _description("entity ambiguity detection", label)
+    for _, item in _llm_items(prompt, description, ("ambiguous_entities",), "ambiguities"):
+        _add_ambiguity(result, item, name_set)
+    return result
 
-    result: list[AuditIssue] = []
-    for item in data["ambiguous_entities"]:
-        if not isinstance(item, dict):
-            continue
-        name = item.get("name")
-        reason = item.get("reason")
-        if not name or not reason:
-            continue
-        entity = by_name.get(name)
-        if entity is None:
+
+def _add_ambiguity(result: dict[str, str], item: AmbiguityItem, name_set: frozenset[str]) -> None:
+    """Keep a schema-valid reason for a known name; first reason wins."""
+    if item.name in name_set:
+        result.setdefault(item.name, item.reason)
+
+
+def enrich_unit_combined(
+    entities: list[Entity],
+    full_text: str,
+    excerpt_chars: int | None = PREFIX_EXCERPT_CHARS,
+    label: str = "",
+    classify: list[Entity] | None = None,
+) -> tuple[dict[str, str], list[EntityRelationship], dict[str, str]]:
+    """
+    One request returning entity types, relationships and ambiguities in a
+    single JSON object. Items are validated as they stream in, with the same
+    rules as the separate calls. Returns (types by name,
+    relationships, ambiguity reasons by name); a missing or invalid section
+    yields an empty result for that section only. classify limits type
+    classification to a subset of the entities (default: all).
+    """
+    if not entities:
+        return {}, [], {}
+
+    names = [e.canonical_name for e in entities]
+    by_name = {e.canonical_name: e for e in entities}
+    to_classify = names if classify is None else [e.canonical_name for e in classify]
+    name_set = frozenset(to_classify)
+    if len(to_classify) == len(names):
+        classify_task = "1. Classify each entity into exactly one type."
+        classify_list = ""
+        classify_rule = 'Every name in the list must appear exactly once in "entities".'
+    else:
+        classify_task = '1. Classify only the entities under "Entity names to classify" into exactly one type.'
+        classify_list = f"\n\nEntity names to classify (types of the others are already known):\n{json.dumps(to_classify)}"
+        classify_rule = 'Every name to classify must appear exactly once in "entities" (empty if there are none).'
+
+    prompt = f"""You are a document analyst. For the following entities from the document, do three tasks and answer in one JSON object. Do not add any entity not in the list.
+
+{classify_task} Allowed types only: organization, role, temporal, legal_construct, other.
+2. Extract relationships between the entities. Allowed relation_type values only: reports_to, oversees, obligation_to, advises, governs. Only include relationships explicitly supported by the document.
+3. Identify ambiguous entities: entities that appear to include undefined modifiers; are referenced but never clearly defined; or might refer to multiple concepts.
+
+Document excerpt (for context, length limited):
+{full_text[:excerpt_chars]}
+
+Entity names (use these exact strings):
+{json.dumps(names)}{classify_list}
+
+Respond with ONLY a single JSON object, no other text:
+{{"entities": [{{"name": "<exact name>", "type": "<one of: organization, role, temporal, legal_construct, other>"}}],
+ "relationships": [{{"source": "<entity name>", "target": "<entity name>", "relation_type": "<one of: reports_to, oversees, obligation_to, advises, governs>"}}],
+ "ambiguous_entities": [{{"name": "<exact entity name from list>", "reason": "<short explanation>"}}]}}
+
+{classify_rule} Leave "relationships" or "ambiguous_entities" empty if there are none."""
+
+    types: dict[str, str] = {}
+    relationships: list[EntityRelationship] = []
+    reasons: dict[str, str] = {}
+    sections = ("entities", "relationships", "ambiguous_entities")
+    for section, item in _llm_items(
+        prompt, _description("combined entity enrichment", label), sections, "combined_enrichment"
+    ):
+        if section == "entities":
+            _add_entity_type(types, item, name_set)
+        elif section == "relationships":
+            _add_relationship(relationships, item, by_name)
+        else:
+            _add_ambiguity(reasons, item, name_set)
+    return types, relationships, reasons
+
+
+def _ambiguity_issues(entities: list[Entity], reasons: dict[str, str]) -> list[AuditIssue]:
+    by_name = {e.canonical_name: e for e in entities}
+    return [
+        AuditIssue(
+            issue_type="entity_ambiguity",
+            severity="warning",
+            message=reason,
+            topic_id=by_name[name].first_seen_topic,
+            start_char=None,
+            end_char=None,
+        )
+        for name, reason in reasons.items()
+        if name in by_name
+    ]
+
+
+# The three separate map calls issued per enrichment unit, in merge order
+# (enrich_unit_combined returns the same three results from one request).
+_ENRICHMENT_CALLS = (classify_entity_types, extract_llm_entity_relationships, find_ambiguous_entities)
+
+ENRICHMENT_MODES = ("prefix", "chunked", "snippets")
+
+
+@dataclass
+class EnrichmentPlan:
+    """
+    Enrichment work units for one document. excerpt_chars is the limit applied
+    to each unit's text in prompts (None = send as is). prompt_tokens and
+    prefix_tokens estimate the per-call-type context (excerpt + entity names)
+    of this plan and of the single-request "prefix" plan, for comparison;
+    tokens_saved is the difference, 0 when this plan is not smaller.
+    known_types holds names whose type comes from the entity type knowledge
+    base; they are not sent for classification.
+    """
+
+    mode: str
+    units: list[EnrichmentUnit]
+    excerpt_chars: int | None
+    prompt_tokens: int
+    prefix_tokens: int
+    known_types: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.prefix_tokens - self.prompt_tokens)
+
+    def unknown_entities(self, unit: EnrichmentUnit) -> list[Entity]:
+        """Entities of a unit that still need type classification."""
+        return [e for e in unit.entities if e.canonical_name not in self.known_types]
+
+    def request_count(self, combined: bool) -> int:
+        """LLM requests this plan issues (a unit with nothing to classify skips that call)."""
+        if combined:
+            return len(self.units)
+        return sum(2 + bool(self.unknown_entities(u)) for u in self.units)
+
+
+def plan_enrichment_units(
+    entities: list[Entity],
+    full_text: str,
+    blocks: list[TopicBlock] | None = None,
+    mode: str | None = None,
+) -> EnrichmentPlan:
+    """
+    Split enrichment into units (excerpt + entity subset), one request per call
+    type each.
+
+    - "prefix": one unit with every entity and the first PREFIX_EXCERPT_CHARS
+      characters of the document (the original behaviour).
+    - "chunked": topic blocks packed into LLM_CHUNK_TOKENS chunks along the
+      hierarchy, each with the entities mentioned in it (at most
+      LLM_CHUNK_MAX_ENTITIES per request). Covers the whole document.
+    - "snippets": entities batched in first-mention order, each unit's excerpt
+      built from short windows around its entities' mentions (llm/snippets.py).
+      Prompt size scales with the number of entities.
+
+    "chunked" falls back to "prefix" when no blocks are given. Types already
+    in the entity type knowledge base are looked up here (plan.known_types).
+    """
+    from semantic_topic_mapper.config import (
+        LLM_CHUNK_MAX_ENTITIES,
+        LLM_CHUNK_TOKENS,
+        LLM_ENRICHMENT_MODE,
+        LLM_SNIPPET_CHARS,
+        LLM_SNIPPETS_PER_ENTITY,
+    )
+
+    mode = mode or LLM_ENRICHMENT_MODE
+    if mode not in ENRICHMENT_MODES:
+        raise ValueError(f"Unknown LLM enrichment mode {mode!r}; expected one of {ENRICHMENT_MODES}")
+    prefix_unit = EnrichmentUnit(label="", text=full_text, entities=list(entities))
+    excerpt_chars: int | None = None
+    if mode == "snippets":
+        units = build_snippet_units(
+            entities,
+            full_text,
+            window_chars=LLM_SNIPPET_CHARS,
+            per_entity=LLM_SNIPPETS_PER_ENTITY,
+            max_tokens=LLM_CHUNK_TOKENS,
+            max_entities=LLM_CHUNK_MAX_ENTITIES,
+        )
+    elif mode == "chunked" and blocks:
+        chunks = pack_topic_chunks(blocks, full_text, LLM_CHUNK_TOKENS)
+        units = batch_entities_by_chunk(entities, chunks, full_text, LLM_CHUNK_MAX_ENTITIES)
+    else:
+        mode, units, excerpt_chars = "prefix", [prefix_unit], PREFIX_EXCERPT_CHARS
+    return EnrichmentPlan(
+        mode=mode,
+        units=units,
+        excerpt_chars=excerpt_chars,
+        prompt_tokens=sum(_context_tokens(u, excerpt_chars) for u in units),
+        prefix_tokens=_context_tokens(prefix_unit, PREFIX_EXCERPT_CHARS),
+        known_types=lookup_known_types(entities),
+    )
+
+
+def lookup_known_types(entities: list[Entity]) -> dict[str, str]:
+    """Name -> type for entities the knowledge base knows (empty when it is disabled)."""
+    kb = get_type_knowledge_base()
+    if kb is None or not entities:
+        return {}
+    return {name: known.entity_type for name, known in kb.lookup(e.canonical_name for e in entities).items()}
+
+
+def _learn_entity_types(types_by_name: dict[str, str], document: str | None) -> None:
+    """Add types the LLM assigned in this run to the knowledge base (not for stub output)."""
+    from semantic_topic_mapper.config import LLM_MODEL
+    from semantic_topic_mapper.llm.backends import get_backend
+
+    kb = get_type_knowledge_base()
+    if kb is None or get_backend().name == "stub":
+        return
+    kb.record(types_by_name, document=document, model=LLM_MODEL)
+
+
+def _context_tokens(unit: EnrichmentUnit, excerpt_chars: int | None) -> int:
+    names = json.dumps([e.canonical_name for e in unit.entities])
+    return estimate_tokens(unit.text[:excerpt_chars]) + estimate_tokens(names)
+
+
+_UnitResult = tuple[dict[str, str], list[EntityRelationship], dict[str, str]]
+
+
+def _unit_calls(plan: EnrichmentPlan, combined: bool) -> list[Callable[[], Any]]:
+    """
+    Zero-argument calls for every unit: one combined call, or the three
+    separate ones. Only entities with no known type are classified.
+    """
+    calls: list[Callable[[], Any]] = []
+    for unit in plan.units:
+        unknown = plan.unknown_entities(unit)
+        args = (unit.text, plan.excerpt_chars, unit.label)
+        if combined:
+            calls.append(functools.partial(enrich_unit_combined, unit.entities, *args, classify=unknown))
             continue
-        result.append(
-            AuditIssue(
-                issue_type="entity_ambiguity",
-                severity="warning",
-                message=reason if isinstance(reason, str) else str(reason),
-                topic_id=entity.first_seen_topic,
-                start_char=None,
-                end_char=None,
+        calls.append(functools.partial(classify_entity_types, unknown, *args))
+        calls.extend(functools.partial(call, unit.entities, *args) for call in _ENRICHMENT_CALLS[1:])
+    return calls
+
+
+def _group_unit_results(results: list[Any], combined: bool) -> list[_UnitResult]:
+    """Regroup flat call results into one (types, relationships, reasons) per unit."""
+    if combined:
+        return list(results)
+    n = len(_ENRICHMENT_CALLS)
+    return [tuple(results[i : i + n]) for i in range(0, len(results), n)]  # type: ignore[misc]
+
+
+def _reduce_unit_results(
+    entities: list[Entity],
+    unit_results: list[_UnitResult],
+    known_types: dict[str, str] | None = None,
+) -> tuple[list[EntityRelationship], list[AuditIssue], dict[str, str]]:
+    """
+    Merge per-unit results (units in document order): majority vote on entity
+    type (ties go to the earliest unit), union of relationships by (source,
+    target, relation_type), first ambiguity reason per entity. Applies the
+    voted types and known_types in place; returns (relationships, issues,
+    voted types by name).
+    """
+    votes: dict[str, Counter[str]] = {}
+    relationships: list[EntityRelationship] = []
+    seen_relationships: set[tuple[str, str, str]] = set()
+    reasons: dict[str, str] = {}
+    for types_by_name, unit_relationships, unit_reasons in unit_results:
+        for name, typ in types_by_name.items():
+            votes.setdefault(name, Counter())[typ] += 1
+        for rel in unit_relationships:
+            key = (rel.source_entity_id, rel.target_entity_id, rel.relation_type)
+            if key not in seen_relationships:
+                seen_relationships.add(key)
+                relationships.append(rel)
+        for name, reason in unit_reasons.items():
+            reasons.setdefault(name, reason)
+    voted = {name: c.most_common(1)[0][0] for name, c in votes.items()}
+    apply_entity_types(entities, {**voted, **(known_types or {})})
+    return relationships, _ambiguity_issues(entities, reasons), voted
+
+
+def _finish_enrichment(
+    entities: list[Entity],
+    plan: EnrichmentPlan,
+    results: list[Any],
+    combined: bool,
+    breaker_opened: bool,
+    document: str | None,
+) -> tuple[list[EntityRelationship], list[AuditIssue]]:
+    """Reduce results and learn new types, or drop everything if the breaker opened."""
+    if breaker_opened:
+        return [], [_skipped_issue()]
+    relationships, issues, voted = _reduce_unit_results(
+        entities, _group_unit_results(results, combined), plan.known_types
+    )
+    _learn_entity_types(voted, document)
+    return relationships, issues
+
+
+def run_entity_enrichment(
+    entities: list[Entity],
+    full_text: str,
+    concurrent: bool | None = None,
+    blocks: list[TopicBlock] | None = None,
+    mode: str | None = None,
+    plan: EnrichmentPlan | None = None,
+    combined: bool | None = None,
+    document: str | None = None,
+) -> tuple[list[EntityRelationship], list[AuditIssue]]:
+    """
+    Run all three enrichment tasks: classify entity types (applied in place),
+    extract relationships, detect ambiguities. Returns (relationships, issues).
+
+    Work is split into units by plan_enrichment_units (mode defaults to
+    LLM_ENRICHMENT_MODE) unless a precomputed plan is given, and the per-unit
+    results are reduced. combined (default LLM_COMBINED_ENRICHMENT) sends one
+    request per unit for all three tasks instead of three. concurrent (default
+    LLM_CONCURRENT_ENRICHMENT) issues all requests at once; results are
+    identical to running them one after another.
+
+    Entity types found in the entity type knowledge base are applied without
+    asking the LLM; types the LLM assigns are added to it, with document
+    (see type_knowledge_base.document_id()) as provenance.
+
+    If the LLM circuit breaker opens during the run, all LLM results are
+    discarded (a partial enrichment would be inconsistent across the document)
+    and a single llm_enrichment_skipped issue is returned instead.
+    """
+    from semantic_topic_mapper.config import LLM_COMBINED_ENRICHMENT, LLM_CONCURRENT_ENRICHMENT
+
+    if concurrent is None:
+        concurrent = LLM_CONCURRENT_ENRICHMENT
+    if combined is None:
+        combined = LLM_COMBINED_ENRICHMENT
+    if not entities:
+        return [], []
+    if concurrent:
+        return asyncio.run(
+            enrich_entities_async(
+                entities, full_text, blocks=blocks, mode=mode, plan=plan, combined=combined, document=document
             )
         )
-    return result
+    plan = plan or plan_enrichment_units(entities, full_text, blocks, mode)
+    breaker = get_circuit_breaker()
+    opened_before = breaker.open_count
+    results = [call() for call in _unit_calls(plan, combined)]
+    opened = breaker.is_open or breaker.open_count > opened_before
+    return _finish_enrichment(entities, plan, results, combined, opened, document)
+
+
+async def enrich_entities_async(
+    entities: list[Entity],
+    full_text: str,
+    blocks: list[TopicBlock] | None = None,
+    mode: str | None = None,
+    plan: EnrichmentPlan | None = None,
+    combined: bool = False,
+    document: str | None = None,
+) -> tuple[list[EntityRelationship], list[AuditIssue]]:
+    """
+    Async enrichment path: every request runs concurrently in worker threads
+    (rate limiting and the concurrency cap are enforced per call by the LLM
+    client). Entity types are applied only after all requests finish, so every
+    request sees the same input as in the serial path.
+    """
+    from semantic_topic_mapper.config import LLM_MAX_CONCURRENCY
+
+    plan = plan or plan_enrichment_units(entities, full_text, blocks, mode)
+    calls = _unit_calls(plan, combined)
+    if not calls:
+        apply_entity_types(entities, plan.known_types)
+        return [], []
+    breaker = get_circuit_breaker()
+    opened_before = breaker.open_count
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(1, min(len(calls), LLM_MAX_CONCURRENCY))) as pool:
+        results = await asyncio.gather(*(loop.run_in_executor(pool, c) for c in calls))
+    opened = breaker.is_open or breaker.open_count > opened_before
+    return _finish_enrichment(entities, plan, list(results), combined, opened, document)
+
+
+def _skipped_issue() -> AuditIssue:
+    return AuditIssue(
+        issue_type="llm_enrichment_skipped",
+        severity="warning",
+        message=(
+            "LLM enrichment skipped: the circuit breaker opened after repeated LLM failures, "
+            "so entity types, LLM relationships and entity ambiguities are deterministic only."
+        ),
+        topic_id=None,
+        start_char=None,
+        end_char=None,
+    )
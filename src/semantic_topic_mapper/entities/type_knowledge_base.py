@@ -0,0 +1,330 @@
+"""
+Cross-document entity type knowledge base (SQLite).
+
+Maps normalized canonical names ("the Commission" and "Commission" share a
+key) to entity types learned in earlier runs, so LLM enrichment only asks the
+model about names it has not seen. Each (name, type) pair keeps provenance:
+source ("llm" or "manual"), the first and last document it came from
+(document_id(): file name plus text digest), the model, and how many
+documents voted for it. A document votes at most once per name: recording
+the same document again is a no-op, and a changed answer moves its vote to
+the new type. A name's confidence is the share of its votes held by the
+winning type; a manual entry always wins with confidence 1.0. Safe to share
+across threads.
+
+Inspect or curate from the command line:
+
+  python -m semantic_topic_mapper.entities.type_knowledge_base --list
+  python -m semantic_topic_mapper.entities.type_knowledge_base --set "Compliance Officer" role
+
+Deterministic; does not call LLMs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entity_types (
+    name_key TEXT NOT NULL,
+    entity_type TEXT NOT NULL,
+    canonical_name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    votes INTEGER NOT NULL,
+    first_document TEXT,
+    last_document TEXT,
+    model TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (name_key, entity_type)
+);
+CREATE TABLE IF NOT EXISTS entity_type_votes (
+    name_key TEXT NOT NULL,
+    document TEXT NOT NULL,
+    entity_type TEXT NOT NULL,
+    PRIMARY KEY (name_key, document)
+);
+"""
+
+_LEADING_ARTICLE = re.compile(r"^(?:the|a|an)\s+")
+_EDGE_PUNCT = re.compile(r"^[\W_]+|[\W_]+$")
+_SPACES = re.compile(r"\s+")
+
+# SQLite's default limit on host parameters per statement is 999.
+_LOOKUP_BATCH = 500
+
+
+def normalize_entity_name(name: str) -> str:
+    """Knowledge base key: NFKC, case-folded, no leading article or edge punctuation, single spaces."""
+    key = unicodedata.normalize("NFKC", name).casefold()
+    key = _SPACES.sub(" ", _EDGE_PUNCT.sub("", key))
+    return _LEADING_ARTICLE.sub("", key)
+
+
+def document_id(name: str, text: str) -> str:
+    """Vote provenance for a document: its name plus a digest of its text, so same-named files stay apart."""
+    return f"{name}@{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}"
+
+
+@dataclass
+class KnownType:
+    """A name's best-supported type in the knowledge base, with provenance."""
+
+    entity_type: str
+    confidence: float
+    votes: int
+    source: str
+    first_document: str | None
+
+
+@dataclass
+class KnowledgeBaseStats:
+    """Counters for one knowledge base instance (process lifetime)."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+
+class EntityTypeKnowledgeBase:
+    """
+    SQLite-backed store of validated entity types.
+
+    - min_confidence: lookups below this confidence count as unknown
+    - read_only: never write; a missing file means every name is unknown
+    """
+
+    def __init__(self, path: Path | str, min_confidence: float = 0.0, read_only: bool = False):
+        self.path = Path(path)
+        self.min_confidence = min_confidence
+        self.read_only = read_only
+        self.stats = KnowledgeBaseStats()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if read_only:
+            if self.path.exists():
+                self._conn = sqlite3.connect(
+                    f"{self.path.resolve().as_uri()}?mode=ro",
+                    uri=True,
+                    check_same_thread=False,
+                )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def lookup(self, names: Iterable[str]) -> dict[str, KnownType]:
+        """Known types for the given names (original spelling -> KnownType) at or above min_confidence."""
+        keys: dict[str, list[str]] = {}
+        for name in names:
+            keys.setdefault(normalize_entity_name(name), []).append(name)
+        rows: list[tuple] = []
+        with self._lock:
+            if self._conn is not None:
+                key_list = list(keys)
+                for i in range(0, len(key_list), _LOOKUP_BATCH):
+                    batch = key_list[i : i + _LOOKUP_BATCH]
+                    rows.extend(self._conn.execute(
+                        "SELECT name_key, entity_type, source, votes, first_document FROM entity_types "
+                        f"WHERE name_key IN ({','.join('?' * len(batch))})",
+                        batch,
+                    ))
+        by_key: dict[str, list[tuple]] = {}
+        for row in rows:
+            by_key.setdefault(row[0], []).append(row)
+        result: dict[str, KnownType] = {}
+        for key, names_for_key in keys.items():
+            known = _best_type(by_key.get(key, []))
+            if known is None or known.confidence < self.min_confidence:
+                self.stats.misses += len(names_for_key)
+                continue
+            self.stats.hits += len(names_for_key)
+            for name in names_for_key:
+                result[name] = known
+        return result
+
+    def record(
+        self,
+        types_by_name: dict[str, str],
+        document: str | None = None,
+        model: str | None = None,
+        source: str = "llm",
+    ) -> None:
+        """
+        Record one document's answer: one vote per name for its type; no-op in
+        read-only mode. Re-recording a document does not add votes (its earlier
+        vote for a name is replaced); without a document every call votes.
+        """
+        if self.read_only or not types_by_name:
+            return
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                return
+            votes = []
+            for name, typ in types_by_name.items():
+                key = normalize_entity_name(name)
+                if document is not None:
+                    previous = self._conn.execute(
+                        "SELECT entity_type FROM entity_type_votes WHERE name_key = ? AND document = ?",
+                        (key, document),
+                    ).fetchone()
+                    if previous is not None and previous[0] == typ:
+                        continue
+                    if previous is not None:
+                        self._withdraw_vote(key, previous[0])
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entity_type_votes (name_key, document, entity_type) VALUES (?, ?, ?)",
+                        (key, document, typ),
+                    )
+                votes.append((key, typ, name, source, document, document, model, now, now))
+            self._conn.executemany(
+                "INSERT INTO entity_types (name_key, entity_type, canonical_name, source, votes, "
+                "first_document, last_document, model, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (name_key, entity_type) DO UPDATE SET votes = votes + 1, "
+                "last_document = excluded.last_document, model = excluded.model, "
+                "updated_at = excluded.updated_at",
+                votes,
+            )
+            self._conn.commit()
+            self.stats.writes += len(votes)
+
+    def _withdraw_vote(self, key: str, entity_type: str) -> None:
+        """Take back one learned vote (caller holds the lock); a type left without votes is dropped."""
+        assert self._conn is not None
+        self._conn.execute(
+            "UPDATE entity_types SET votes = votes - 1 WHERE name_key = ? AND entity_type = ? AND source != 'manual'",
+            (key, entity_type),
+        )
+        self._conn.execute(
+            "DELETE FROM entity_types WHERE name_key = ? AND entity_type = ? AND source != 'manual' AND votes <= 0",
+            (key, entity_type),
+        )
+
+    def set_type(self, name: str, entity_type: str) -> None:
+        """Curate a name's type by hand; a manual entry overrides learned votes."""
+        if self.read_only:
+            return
+        key = normalize_entity_name(name)
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute("DELETE FROM entity_types WHERE name_key = ? AND source = 'manual'", (key,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entity_types (name_key, entity_type, canonical_name, source, votes, "
+                "first_document, last_document, model, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'manual', 1, NULL, NULL, NULL, ?, ?)",
+                (key, entity_type, name, now, now),
+            )
+            self._conn.commit()
+
+    def entries(self) -> list[tuple[str, KnownType]]:
+        """Every name in the knowledge base (canonical spelling) with its best type, sorted by name."""
+        with self._lock:
+            if self._conn is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT name_key, entity_type, source, votes, first_document, canonical_name "
+                "FROM entity_types ORDER BY name_key, created_at"
+            ).fetchall()
+        by_key: dict[str, list[tuple]] = {}
+        spelling: dict[str, str] = {}
+        for row in rows:
+            by_key.setdefault(row[0], []).append(row[:5])
+            spelling.setdefault(row[0], row[5])
+        out = []
+        for key, key_rows in by_key.items():
+            known = _best_type(key_rows)
+            if known is not None:
+                out.append((spelling[key], known))
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _best_type(rows: list[tuple]) -> KnownType | None:
+    """Winning type among (name_key, type, source, votes, first_document) rows; manual beats votes."""
+    if not rows:
+        return None
+    for _, typ, source, votes, first_document in rows:
+        if source == "manual":
+            return KnownType(typ, 1.0, votes, source, first_document)
+    total = sum(r[3] for r in rows)
+    _, typ, source, votes, first_document = max(rows, key=lambda r: r[3])  # ties: first stored
+    return KnownType(typ, votes / total if total else 0.0, votes, source, first_document)
+
+
+_kb: EntityTypeKnowledgeBase | None = None
+_kb_lock = threading.Lock()
+
+
+def get_type_knowledge_base() -> EntityTypeKnowledgeBase | None:
+    """
+    Return the process-wide knowledge base configured from ENTITY_KB_* settings,
+    or None when disabled. Created lazily on first use.
+    """
+    global _kb
+    from semantic_topic_mapper.config import (
+        ENTITY_KB_ENABLED,
+        ENTITY_KB_MIN_CONFIDENCE,
+        ENTITY_KB_PATH,
+        ENTITY_KB_READ_ONLY,
+    )
+    from semantic_topic_mapper.llm.backends import store_path
+
+    if not ENTITY_KB_ENABLED:
+        return None
+    with _kb_lock:
+        if _kb is None:
+            _kb = EntityTypeKnowledgeBase(
+                store_path(ENTITY_KB_PATH),
+                min_confidence=ENTITY_KB_MIN_CONFIDENCE,
+                read_only=ENTITY_KB_READ_ONLY,
+            )
+        return _kb
+
+
+def main(argv: list[str] | None = None) -> None:
+    from semantic_topic_mapper.config import ENTITY_KB_PATH
+    from semantic_topic_mapper.llm.schemas import ENTITY_TYPES
+
+    parser = argparse.ArgumentParser(description="Inspect or curate the entity type knowledge base.")
+    parser.add_argument("--path", default=str(ENTITY_KB_PATH), help="Knowledge base file.")
+    parser.add_argument("--list", action="store_true", help="Print every name with its type and confidence.")
+    parser.add_argument("--set", nargs=2, metavar=("NAME", "TYPE"), help="Set a name's type by hand.")
+    args = parser.parse_args(argv)
+
+    kb = EntityTypeKnowledgeBase(args.path)
+    if args.set:
+        name, typ = args.set
+        if typ not in ENTITY_TYPES:
+            parser.error(f"TYPE must be one of {', '.join(ENTITY_TYPES)}")
+        kb.set_type(name, typ)
+        print(f"[EntityKB] {name!r} set to {typ}")
+    if args.list or not args.set:
+        entries = kb.entries()
+        for name, known in entries:
+            print(f"{name}\t{known.entity_type}\t{known.confidence:.2f}\t{known.votes}\t{known.source}")
+        print(f"[EntityKB] {len(entries)} names in {kb.path}")
+    kb.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
-# ingestion: load and normalize raw text; optional PDF→txt utility
+# ingestion: load and normalize raw text; document boundary index; optional PDF→txt utility
 
+from semantic_topic_mapper.ingestion.document_index import DocumentIndex, build_document_index
 from semantic_topic_mapper.ingestion.loader import load_text, load_text_from_config
 from semantic_topic_mapper.ingestion.text_normalizer import normalize, normalize_for_parsing
 
 __all__ = [
+    "DocumentIndex",
+    "build_document_index",
     "load_text",
     "load_text_from_config",
     "normalize",
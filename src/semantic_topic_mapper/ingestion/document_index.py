@@ -0,0 +1,142 @@
+"""
+Document-wide line and sentence boundary index.
+
+Built once after loading and shared by all stages. Stores line-start and
+sentence-start offsets in compact integer arrays so any character offset can be
+mapped to (line, column, sentence) with a binary search, instead of each stage
+re-splitting the text. Line boundaries follow str.splitlines() semantics.
+Sentence boundaries are heuristic and tuned for regulatory text: terminal
+punctuation followed by a capitalized word, line-ending colons (list intros),
+blank lines, header lines ("2.1 Title"), and line starts that look structural
+(topic headers, (a)/(i) subclause labels). Wrapped lines inside a sentence are
+not treated as breaks.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import NamedTuple
+
+
+# Sentence break candidates. Each alternative consumes the whitespace that
+# follows the break, so match.end() is the start of the next sentence.
+_SENTENCE_BREAK = re.compile(
+    r"(?P<terminal>[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])"
+    r"|:[ \t]*\n\s*"
+    r"|\n[ \t]*\n\s*"
+    r"|^[ \t]*\d+(?:\.\d+)*(?:\.[a-zA-Z])?[ \t]+[A-Z][^\n]*?[^\s.][ \t]*\n\s*"  # header line
+    r"|\n[ \t]*(?="
+    r"\([a-zA-Z0-9]{1,4}\)"  # subclause label: (a), (ii), (1)
+    r"|\d+(?:\.\d+)*(?:\.[a-zA-Z])?(?:[ \t]+[A-Z]|[ \t]*$)"  # topic header: "2.1 Title", "3.5.2"
+    r"|(?i:topic)[ \t]+[0-9][0-9.a-zA-Z]*[ \t]*:"  # "TOPIC 3: ..."
+    r")",
+    re.MULTILINE,
+)
+
+# Line terminators recognised by str.splitlines(); "\r\n" counts as one.
+_LINE_BREAK = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# A period after one of these words does not end a sentence.
+_ABBREVIATION_TAIL = re.compile(
+    r"\b(?:e\.g|i\.e|etc|cf|vs|viz|no|nos|art|arts|sec|secs|para|paras|ch|"
+    r"mr|mrs|ms|dr|jr|sr|st|inc|ltd|co|corp|approx|u\.s|u\.k)$",
+    re.IGNORECASE,
+)
+
+
+class TextPosition(NamedTuple):
+    """Location of a character offset: 1-based line and column, 0-based sentence index."""
+
+    line: int
+    column: int
+    sentence: int
+
+
+@dataclass
+class DocumentIndex:
+    """
+    Boundary offsets for one document.
+
+    - text_length: length of the indexed text
+    - line_starts: ascending start offsets of lines; always begins with 0
+    - sentence_starts: ascending start offsets of sentences; always begins with 0
+
+    Offsets are character offsets into the same text the pipeline passes to
+    every stage (TopicBlock.start_char, EntityMention.start_char, ...).
+    """
+
+    text_length: int
+    line_starts: array
+    sentence_starts: array
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_starts)
+
+    def line_of(self, offset: int) -> int:
+        """Return the 0-based index of the line containing offset (O(log n))."""
+        return max(0, bisect_right(self.line_starts, offset) - 1)
+
+    def line_span(self, line: int) -> tuple[int, int]:
+        """Return (start, end) offsets of a line, including its terminator; end is exclusive."""
+        start = self.line_starts[line]
+        if line + 1 < len(self.line_starts):
+            return (start, self.line_starts[line + 1])
+        return (start, self.text_length)
+
+    def locate(self, offset: int) -> TextPosition:
+        """Map a character offset to its 1-based line/column and 0-based sentence."""
+        line = self.line_of(offset)
+        return TextPosition(
+            line=line + 1,
+            column=offset - self.line_starts[line] + 1,
+            sentence=self.sentence_of(offset),
+        )
+
+    def sentence_of(self, offset: int) -> int:
+        """Return the index of the sentence containing offset (O(log n))."""
+        return max(0, bisect_right(self.sentence_starts, offset) - 1)
+
+    def sentence_span(self, sentence: int) -> tuple[int, int]:
+        """Return (start, end) offsets of a sentence; end is exclusive."""
+        start = self.sentence_starts[sentence]
+        if sentence + 1 < len(self.sentence_starts):
+            return (start, self.sentence_starts[sentence + 1])
+        return (start, self.text_length)
+
+    def sentence_span_at(self, offset: int) -> tuple[int, int]:
+        """Return (start, end) of the sentence containing offset."""
+        return self.sentence_span(self.sentence_of(offset))
+
+
+def build_document_index(text: str) -> DocumentIndex:
+    """
+    Build a DocumentIndex for text: one regex pass for line breaks and one for
+    sentence breaks. Cost is linear in the length of the document.
+    """
+    line_starts = array("q", [0])
+    for mo in _LINE_BREAK.finditer(text):
+        if mo.end() < len(text):
+            line_starts.append(mo.end())
+
+    starts = array("q", [0])
+    for mo in _SENTENCE_BREAK.finditer(text):
+        if mo.group("terminal") == "." and _ABBREVIATION_TAIL.search(
+            text, max(0, mo.start() - 8), mo.start()
+        ):
+            continue
+        end = mo.end()
+        if end < len(text) and end > starts[-1]:
+            starts.append(end)
+    return DocumentIndex(
+        text_length=len(text),
+        line_starts=line_starts,
+        sentence_starts=starts,
+    )
@@ -0,0 +1,308 @@
+"""
+Pluggable LLM backends behind generate_content_text().
+
+A backend turns one prompt into a BackendResponse (response text plus a
+JSON-serializable raw payload for LLM_DEBUG dumps) or raises; retries,
+deadlines and the circuit breaker in llm/resilience.py and the call slots in
+llm/client.py wrap every call, so failure behaviour and the concurrency cap
+are identical across backends. Selected with LLM_BACKEND:
+
+- "gemini": the live API through the shared pooled client (default).
+- "record": gemini, and every answered prompt is also written to LLM_REPLAY_DIR.
+- "replay": answers only from recordings in LLM_REPLAY_DIR (no network). Also
+  reads LLM_DEBUG dumps (<label>_prompt.txt + <label>_response.json), so an
+  existing output/llm_debug/ directory can be replayed as is.
+- "stub": starts the local stub server (llm/stub_server.py) with
+  LLM_STUB_LATENCY / LLM_STUB_ERROR_RATE / LLM_STUB_ERROR_CODES and talks to it
+  over HTTP with a real genai client, for offline throughput and tail-latency
+  measurements of the full client path. Its synthetic answers never reach
+  .cache/: the persistent stores (response cache, topic summary cache, entity
+  type knowledge base) open in a throwaway directory instead (store_path()).
+
+Backends may also implement generate_stream(), yielding the response as a
+series of BackendResponse pieces (text deltas) as they arrive; gemini, record
+and stub do. stream_response() falls back to generate() for the others.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import tempfile
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+
+@dataclass
+class BackendResponse:
+    """Response text ("" if the model returned nothing usable) and raw payload."""
+
+    text: str
+    raw: dict[str, Any]
+
+
+class LLMBackend(Protocol):
+    name: str
+
+    def generate(self, prompt: str, temperature: float) -> BackendResponse:
+        """Answer one prompt; raise on transport or API errors."""
+        ...
+
+
+class ReplayMissError(LookupError):
+    """The replay backend has no recording for a prompt (not retryable)."""
+
+
+def prompt_digest(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def stream_response(backend: LLMBackend, prompt: str, temperature: float) -> Iterator[BackendResponse]:
+    """The backend's streamed response, or its whole response as one piece."""
+    generate_stream = getattr(backend, "generate_stream", None)
+    if generate_stream is not None:
+        yield from generate_stream(prompt, temperature)
+    else:
+        yield backend.generate(prompt, temperature)
+
+
+class GeminiBackend:
+    """Live Gemini calls through the process-wide client (llm/client.py)."""
+
+    name = "gemini"
+
+    def __init__(self, client: Any = None):
+        self._client = client
+
+    def generate(self, prompt: str, temperature: float) -> BackendResponse:
+        from semantic_topic_mapper.config import LLM_MODEL
+        from semantic_topic_mapper.llm.client import _serialize_response, get_genai_client
+
+        client = self._client or get_genai_client()
+        response = client.models.generate_content(
+            model=LLM_MODEL,
+            contents=prompt,
+            config={"temperature": temperature},
+        )
+        return BackendResponse(_response_text(response, strip=True), _serialize_response(response))
+
+    def generate_stream(self, prompt: str, temperature: float) -> Iterator[BackendResponse]:
+        """Yield text deltas as the server sends them."""
+        from semantic_topic_mapper.config import LLM_MODEL
+        from semantic_topic_mapper.llm.client import _serialize_response, get_genai_client
+
+        client = self._client or get_genai_client()
+        for response in client.models.generate_content_stream(
+            model=LLM_MODEL,
+            contents=prompt,
+            config={"temperature": temperature},
+        ):
+            yield BackendResponse(_response_text(response, strip=False), _serialize_response(response))
+
+
+def _response_text(response: Any, strip: bool) -> str:
+    """Text of the first candidate; "" for a prompt-level block (e.g. safety) or no candidates."""
+    from semantic_topic_mapper.llm.client import _parts_to_text
+
+    feedback = getattr(response, "prompt_feedback", None)
+    if feedback is not None:
+        reason = getattr(feedback, "block_reason", None)
+        if reason is not None and str(reason) != "BLOCK_REASON_UNSPECIFIED":
+            return ""
+    if not response or not getattr(response, "candidates", None):
+        return ""
+    return _parts_to_text(response.candidates[0], strip=strip)
+
+
+class ReplayBackend:
+    """
+    Serve recorded responses by exact prompt. Recordings are <sha256>.json
+    files ({"prompt", "text", "raw"}) written by RecordingBackend, plus any
+    LLM_DEBUG prompt/response file pairs in the same directory.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory)
+        self._responses: dict[str, BackendResponse] = {}
+        if self.directory.is_dir():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def _load(self) -> None:
+        for path in sorted(self.directory.glob("*.json")):
+            if path.name.endswith("_response.json"):
+                continue
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+                self._responses[prompt_digest(record["prompt"])] = BackendResponse(
+                    record.get("text") or "", record.get("raw") or {}
+                )
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        for prompt_path in sorted(self.directory.glob("*_prompt.txt")):
+            response_path = prompt_path.with_name(
+                prompt_path.name[: -len("_prompt.txt")] + "_response.json"
+            )
+            if not response_path.exists():
+                continue
+            try:
+                prompt = prompt_path.read_text(encoding="utf-8")
+                raw = json.loads(response_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            self._responses.setdefault(prompt_digest(prompt), BackendResponse(_debug_text(raw), raw))
+
+    def generate(self, prompt: str, temperature: float) -> BackendResponse:
+        response = self._responses.get(prompt_digest(prompt))
+        if response is None:
+            raise ReplayMissError(f"No recorded response for prompt {prompt_digest(prompt)[:12]}")
+        return response
+
+
+def _debug_text(raw: dict[str, Any]) -> str:
+    """Response text from an LLM_DEBUG payload (first candidate's parts)."""
+    candidates = raw.get("candidates") or []
+    if not candidates:
+        return ""
+    parts = candidates[0].get("parts") or []
+    return "".join(p.get("text") or "" for p in parts if isinstance(p, dict)).strip()
+
+
+class RecordingBackend:
+    """Delegate to another backend and record each answered prompt for replay."""
+
+    name = "record"
+
+    def __init__(self, inner: LLMBackend, directory: Path | str):
+        self.inner = inner
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def generate(self, prompt: str, temperature: float) -> BackendResponse:
+        response = self.inner.generate(prompt, temperature)
+        self._record(prompt, temperature, response)
+        return response
+
+    def generate_stream(self, prompt: str, temperature: float) -> Iterator[BackendResponse]:
+        """Pass pieces through; record the joined response once the stream has ended."""
+        from semantic_topic_mapper.llm.client import _merge_stream_raw
+
+        pieces: list[BackendResponse] = []
+        for piece in stream_response(self.inner, prompt, temperature):
+            pieces.append(piece)
+            yield piece
+        text = "".join(p.text for p in pieces).strip()
+        self._record(prompt, temperature, BackendResponse(text, _merge_stream_raw([p.raw for p in pieces])))
+
+    def _record(self, prompt: str, temperature: float, response: BackendResponse) -> None:
+        if response.text:
+            record = {"prompt": prompt, "temperature": temperature, "text": response.text, "raw": response.raw}
+            path = self.directory / f"{prompt_digest(prompt)}.json"
+            path.write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+class StubBackend:
+    """
+    Gemini client pointed at an in-process stub server. The server runs for
+    the life of the backend; close() (also registered at exit) stops it.
+    """
+
+    name = "stub"
+
+    def __init__(
+        self,
+        latency: float | str = 0.0,
+        error_rate: float = 0.0,
+        error_codes: tuple[int, ...] = (503,),
+        seed: int | None = None,
+    ):
+        from semantic_topic_mapper.config import LLM_MAX_CONCURRENCY, LLM_TIMEOUT
+        from semantic_topic_mapper.llm.client import _create_client
+        from semantic_topic_mapper.llm.stub_server import enrichment_responder, start_stub_server
+
+        self.server = start_stub_server(
+            enrichment_responder,
+            latency=latency,
+            error_rate=error_rate,
+            error_codes=error_codes,
+            seed=seed,
+        )
+        self.scratch_dir = tempfile.TemporaryDirectory(prefix="stm-stub-")
+        atexit.register(self.close)
+        client = _create_client("stub-key", self.server.url, LLM_MAX_CONCURRENCY, LLM_TIMEOUT)
+        self._gemini = GeminiBackend(client)
+
+    def generate(self, prompt: str, temperature: float) -> BackendResponse:
+        return self._gemini.generate(prompt, temperature)
+
+    def generate_stream(self, prompt: str, temperature: float) -> Iterator[BackendResponse]:
+        return self._gemini.generate_stream(prompt, temperature)
+
+    def close(self) -> None:
+        self.server.stop()
+        self.scratch_dir.cleanup()
+        atexit.unregister(self.close)
+
+
+BACKENDS = ("gemini", "record", "replay", "stub")
+
+_backend: LLMBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(name: str) -> LLMBackend:
+    """Build a backend from its LLM_BACKEND name and the related settings."""
+    from semantic_topic_mapper.config import (
+        LLM_REPLAY_DIR,
+        LLM_STUB_ERROR_CODES,
+        LLM_STUB_ERROR_RATE,
+        LLM_STUB_LATENCY,
+    )
+
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "record":
+        return RecordingBackend(GeminiBackend(), LLM_REPLAY_DIR)
+    if name == "replay":
+        return ReplayBackend(LLM_REPLAY_DIR)
+    if name == "stub":
+        return StubBackend(LLM_STUB_LATENCY, LLM_STUB_ERROR_RATE, LLM_STUB_ERROR_CODES)
+    raise ValueError(f"Unknown LLM backend {name!r}; expected one of {BACKENDS}")
+
+
+def get_backend() -> LLMBackend:
+    """Process-wide backend selected by LLM_BACKEND (created on first use)."""
+    global _backend
+    if _backend is None:
+        from semantic_topic_mapper.config import LLM_BACKEND
+
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(LLM_BACKEND)
+    return _backend
+
+
+def store_path(path: Path) -> Path:
+    """
+    Where a persistent store configured at `path` opens: `path` itself, or the
+    same file name in the backend's throwaway directory (stub).
+    """
+    scratch = getattr(get_backend(), "scratch_dir", None)
+    return Path(scratch.name) / path.name if scratch is not None else path
+
+
+def set_backend(backend: LLMBackend | None) -> None:
+    """Install a backend for this process (None = rebuild from config on next use)."""
+    global _backend
+    with _backend_lock:
+        old, _backend = _backend, backend
+    if old is not None and old is not backend and hasattr(old, "close"):
+        old.close()
@@ -0,0 +1,182 @@
+"""
+Persistent on-disk LLM response cache (SQLite).
+
+Responses are keyed by a hash of (backend, model, temperature, schema version,
+prompt), so a byte-identical prompt from an earlier run is answered locally
+without a network call, and answers from one backend (e.g. the synthetic
+"stub") are never served to another. Entries expire after a TTL and the cache is bounded by entry
+count with least-recently-used eviction. A read-only mode (for CI) serves hits
+but never writes, refreshes, or evicts. Safe to share across threads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_accessed ON llm_responses (accessed_at);
+"""
+
+
+@dataclass
+class CacheStats:
+    """Counters for one cache instance (process lifetime)."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache.
+
+    - ttl_seconds: entries older than this are treated as misses (0 = no expiry)
+    - max_entries: LRU bound on stored entries (0 = unbounded)
+    - read_only: never write; a missing cache file means every lookup misses
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        ttl_seconds: int = 0,
+        max_entries: int = 0,
+        read_only: bool = False,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.read_only = read_only
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        if read_only:
+            if self.path.exists():
+                self._conn = sqlite3.connect(
+                    f"{self.path.resolve().as_uri()}?mode=ro",
+                    uri=True,
+                    check_same_thread=False,
+                )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, schema_version: str, backend: str) -> str:
+        """Stable cache key for one request to `backend` (its LLM_BACKEND name)."""
+        h = hashlib.sha256()
+        for part in (backend, model, repr(float(temperature)), schema_version):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        h.update(prompt.encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response text, or None on miss or expiry."""
+        with self._lock:
+            if self._conn is None:
+                self.stats.misses += 1
+                return None
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl_seconds > 0 and now - created_at > self.ttl_seconds:
+                self.stats.expired += 1
+                self.stats.misses += 1
+                if not self.read_only:
+                    self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                return None
+            if not self.read_only:
+                self._conn.execute(
+                    "UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+            self.stats.hits += 1
+            return response
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a response (no-op in read-only mode) and evict LRU entries over the bound."""
+        if self.read_only:
+            return
+        with self._lock:
+            if self._conn is None:
+                return
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            self.stats.writes += 1
+            if self.max_entries > 0:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+                excess = count - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM llm_responses WHERE key IN ("
+                        "SELECT key FROM llm_responses ORDER BY accessed_at ASC LIMIT ?)",
+                        (excess,),
+                    )
+                    self.stats.evictions += excess
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache | None:
+    """
+    Return the process-wide cache configured from LLM_CACHE_* settings, or None
+    when caching is disabled. Created lazily on first use.
+    """
+    global _cache
+    from semantic_topic_mapper.config import (
+        LLM_CACHE_ENABLED,
+        LLM_CACHE_MAX_ENTRIES,
+        LLM_CACHE_PATH,
+        LLM_CACHE_READ_ONLY,
+        LLM_CACHE_TTL,
+    )
+    from semantic_topic_mapper.llm.backends import store_path
+
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(
+                store_path(LLM_CACHE_PATH),
+                ttl_seconds=LLM_CACHE_TTL,
+                max_entries=LLM_CACHE_MAX_ENTRIES,
+                read_only=LLM_CACHE_READ_ONLY,
+            )
+        return _cache
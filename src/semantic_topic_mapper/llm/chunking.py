@@ -0,0 +1,161 @@
+"""
+Token-budgeted work units for map-reduce LLM enrichment.
+
+pack_topic_chunks() groups consecutive TopicBlocks into document spans that fit a
+token budget, cutting only at hierarchy boundaries where possible: whole
+top-level sections are packed together, a section too large for one chunk is
+split at its subsection boundaries (recursively), and only a single block that
+alone exceeds the budget is split inside its text (at line breaks).
+
+batch_entities_by_chunk() assigns each entity to every chunk its mentions fall
+in, in first-mention order, and caps the entity list per request. The result is
+a list of EnrichmentUnit (excerpt text + entity subset), one LLM request each.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
+from semantic_topic_mapper.entities.entity_models import Entity
+from semantic_topic_mapper.models.topic_models import TopicBlock
+
+
+@dataclass
+class TextChunk:
+    """A contiguous document span [start_char, end_char) and the topics it covers."""
+
+    start_char: int
+    end_char: int
+    topic_ids: list[str] = field(default_factory=list)
+
+
+@dataclass
+class EnrichmentUnit:
+    """One enrichment request: an excerpt and the entities to ask about."""
+
+    label: str
+    text: str
+    entities: list[Entity]
+
+
+def pack_topic_chunks(blocks: list[TopicBlock], text: str, max_tokens: int) -> list[TextChunk]:
+    """
+    Pack blocks (document order) into chunks of at most max_tokens estimated
+    tokens, preferring hierarchy boundaries. Chunks are contiguous, ordered and
+    non-overlapping; together they cover every block.
+    """
+    max_chars = max(1, max_tokens) * 4  # same ~4 chars/token as rate_limiter.estimate_tokens
+    chunks: list[TextChunk] = []
+    current: list[TopicBlock] = []
+
+    def size(group: list[TopicBlock]) -> int:
+        return group[-1].end_char - group[0].start_char
+
+    def flush() -> None:
+        if current:
+            chunks.append(_chunk_of(current))
+            current.clear()
+
+    def place(group: list[TopicBlock], depth: int) -> None:
+        if size(group) <= max_chars:
+            if current and group[-1].end_char - current[0].start_char > max_chars:
+                flush()
+            current.extend(group)
+            return
+        flush()
+        if len(group) == 1:
+            chunks.extend(_split_block(group[0], text, max_chars))
+            return
+        subgroups = _group_by_prefix(group, depth + 1)
+        if len(subgroups) == 1:
+            # Deeper prefixes do not separate these blocks; fall back to block boundaries.
+            subgroups = [[b] for b in group]
+        for sub in subgroups:
+            place(sub, depth + 1)
+
+    for group in _group_by_prefix(blocks, 1):
+        place(group, 1)
+    flush()
+    return chunks
+
+
+def _group_by_prefix(blocks: list[TopicBlock], depth: int) -> list[list[TopicBlock]]:
+    """Split blocks into runs sharing the first `depth` topic ID parts (orphans attach to the run before)."""
+    groups: list[list[TopicBlock]] = []
+    last_key: tuple[str, ...] | None = None
+    for block in blocks:
+        if block.topic_id is None:
+            key = last_key
+        else:
+            key = block.topic_id.parts[:depth]
+        if not groups or key != last_key:
+            groups.append([])
+        groups[-1].append(block)
+        last_key = key
+    return groups
+
+
+def _chunk_of(blocks: list[TopicBlock]) -> TextChunk:
+    return TextChunk(
+        start_char=blocks[0].start_char,
+        end_char=blocks[-1].end_char,
+        topic_ids=[b.topic_id.raw for b in blocks if b.topic_id is not None],
+    )
+
+
+def _split_block(block: TopicBlock, text: str, max_chars: int) -> list[TextChunk]:
+    """Split one oversized block at line breaks (hard cut for a single over-long line)."""
+    topic_ids = [block.topic_id.raw] if block.topic_id is not None else []
+    result: list[TextChunk] = []
+    start = block.start_char
+    while start < block.end_char:
+        end = min(block.end_char, start + max_chars)
+        if end < block.end_char:
+            cut = text.rfind("\n", start + 1, end)
+            if cut > start:
+                end = cut + 1
+        result.append(TextChunk(start, end, list(topic_ids)))
+        start = end
+    return result
+
+
+def batch_entities_by_chunk(
+    entities: list[Entity],
+    chunks: list[TextChunk],
+    text: str,
+    max_entities: int,
+) -> list[EnrichmentUnit]:
+    """
+    Build one or more EnrichmentUnits per chunk from the entities mentioned in
+    it (first-mention order, at most max_entities per unit). Entities without
+    any mention inside a chunk are attached to the first chunk so none is lost.
+    Chunks with no entities produce no unit.
+    """
+    if not chunks:
+        return []
+    chunk_starts = [c.start_char for c in chunks]
+    members: list[list[tuple[int, Entity]]] = [[] for _ in chunks]
+    for entity in entities:
+        first_in_chunk: dict[int, int] = {}
+        for mention in entity.mentions:
+            ci = bisect_right(chunk_starts, mention.start_char) - 1
+            if ci >= 0 and mention.start_char < chunks[ci].end_char:
+                first_in_chunk.setdefault(ci, mention.start_char)
+        if not first_in_chunk:
+            first_in_chunk[0] = chunks[0].start_char
+        for ci, pos in first_in_chunk.items():
+            members[ci].append((pos, entity))
+
+    cap = max(1, max_entities)
+    units: list[EnrichmentUnit] = []
+    for ci, chunk in enumerate(chunks):
+        ordered = [e for _, e in sorted(members[ci], key=lambda pe: pe[0])]
+        excerpt = text[chunk.start_char : chunk.end_char]
+        for bi in range(0, len(ordered), cap):
+            batch = ordered[bi : bi + cap]
+            label = f"chunk {ci + 1}/{len(chunks)}"
+            if len(ordered) > cap:
+                label += f" batch {bi // cap + 1}"
+            units.append(EnrichmentUnit(label=label, text=excerpt, entities=batch))
+    return units
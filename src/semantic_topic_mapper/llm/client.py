@@ -2,39 +2,181 @@
 LLM API wrapper (Gemini via google.genai).
 
 Provides get_genai_client() and generate_content_text() for use by enrichment
-modules. All LLM calls are isolated here; deterministic modules do not import this.
+modules; generate_content_text() sends requests through the backend selected by
+LLM_BACKEND (live Gemini, record, replay, or local stub; llm/backends.py). All
+LLM calls are isolated here; deterministic modules do not import this.
+Responses are served from the on-disk response cache (llm/cache.py) when an
+identical request was answered before. stream_content_text() yields the
+response in pieces as they arrive, for incremental parsing (llm/validator.py).
+Every call, cache hits and failures included, is recorded with its tokens,
+latency and attempts in llm/telemetry.py.
+
+One genai.Client is created lazily per process and reused by every call, so the
+HTTP connection pool (keep-alive, TLS session) and parsed config are paid for
+once. The client is shared by threads and asyncio tasks; in-flight calls are
+capped by LLM_MAX_CONCURRENCY call slots. generate_content_text() and
+stream_content_text() take a slot for each attempt before its deadline
+starts (waiting for a slot never counts against LLM_TIMEOUT), hold it until
+the attempt or its stream ends, and only hedge when a slot is free.
+
+Each request runs under llm/resilience.py: an LLM_TIMEOUT deadline per attempt,
+retries with jittered backoff for transient errors, optional hedging, and a
+process-wide circuit breaker.
 """
 
 from __future__ import annotations
 
 import json
+import logging
 import re
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_config: tuple[str, str | None, int] | None = None
+_client_lock = threading.Lock()
+_call_slots: threading.BoundedSemaphore | None = None
 
 
 def get_genai_client():  # noqa: ANN201
     """
-    Return a configured google.genai Client for structured enrichment.
+    Return the process-wide google.genai Client for structured enrichment.
 
-    Reads LLM_API_KEY from environment. Model name is read from LLM_MODEL when
-    generating (default gemini-3-flash-preview). Callers should use
-    config.skip_llm() before calling LLM code.
+    Created on first use from LLM_API_KEY (and LLM_BASE_URL, e.g. a local stub
+    server) and reused afterwards; recreated only if those settings change.
+    Model name is read from LLM_MODEL when generating (default
+    gemini-3-flash-preview). Callers should use config.skip_llm() before
+    calling LLM code.
 
     Returns:
-        genai.Client instance.
+        genai.Client instance (shared; safe to use from multiple threads).
 
     Raises:
         ValueError: If LLM_API_KEY is not set or empty.
     """
-    from semantic_topic_mapper.config import LLM_API_KEY
+    global _client, _client_config
+    from semantic_topic_mapper.config import (
+        LLM_API_KEY,
+        LLM_BASE_URL,
+        LLM_MAX_CONCURRENCY,
+        LLM_TIMEOUT,
+    )
 
     if not LLM_API_KEY or not LLM_API_KEY.strip():
         raise ValueError(
             "LLM_API_KEY is not set. Set it in .env or disable LLM with SKIP_LLM=true."
         )
 
+    wanted = (LLM_API_KEY.strip(), LLM_BASE_URL, LLM_TIMEOUT)
+    client = _client
+    if client is not None and _client_config == wanted:
+        return client
+    with _client_lock:
+        if _client is None or _client_config != wanted:
+            _client = _create_client(wanted[0], LLM_BASE_URL, LLM_MAX_CONCURRENCY, LLM_TIMEOUT)
+            _client_config = wanted
+        return _client
+
+
+def _create_client(  # noqa: ANN202
+    api_key: str,
+    base_url: str | None,
+    max_connections: int,
+    timeout_seconds: int = 0,
+):
+    """Build a genai.Client whose HTTP pool keeps up to max_connections alive."""
+    import httpx
     from google import genai
+    from google.genai import types
+
+    limits = httpx.Limits(
+        max_connections=max(1, max_connections),
+        max_keepalive_connections=max(1, max_connections),
+    )
+    http_options = types.HttpOptions(
+        base_url=base_url,
+        timeout=timeout_seconds * 1000 if timeout_seconds > 0 else None,  # milliseconds
+        client_args={"limits": limits},
+        async_client_args={"limits": limits},
+    )
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+
+def reset_genai_client() -> None:
+    """Drop the shared client (e.g. after changing config in tests or benchmarks)."""
+    global _client, _client_config
+    with _client_lock:
+        _client = None
+        _client_config = None
+
+
+def _slots() -> threading.BoundedSemaphore:
+    global _call_slots
+    if _call_slots is None:
+        from semantic_topic_mapper.config import LLM_MAX_CONCURRENCY
+
+        with _client_lock:
+            if _call_slots is None:
+                _call_slots = threading.BoundedSemaphore(max(1, LLM_MAX_CONCURRENCY))
+    return _call_slots
+
+
+class _AttemptSlots:
+    """
+    Call slots for the attempts of one request. take() runs before each try,
+    outside its deadline, and waits for a slot; take_for_hedge() takes one
+    only if it is free right away. The attempt that runs on a taken slot
+    gets its release function from release_once().
+    """
+
+    def __init__(self) -> None:
+        self._slots = _slots()
 
-    return genai.Client(api_key=LLM_API_KEY.strip())
+    def take(self) -> None:
+        self._slots.acquire()
+
+    def take_for_hedge(self) -> bool:
+        return self._slots.acquire(blocking=False)
+
+    def release_once(self) -> Callable[[], None]:
+        """Release function for one taken slot; calls after the first do nothing."""
+        once = threading.Lock()  # acquired by the first call only, never released
+
+        def release() -> None:
+            if once.acquire(blocking=False):
+                self._slots.release()
+
+        return release
+
+
+class _HeldStream:
+    """Iterator over the rest of a streamed response; holds its call slot until exhausted, failed or closed."""
+
+    def __init__(self, pieces: Iterator[Any], release: Callable[[], None]):
+        self._pieces = pieces
+        self._release = release
+
+    def __iter__(self) -> _HeldStream:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return next(self._pieces)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        close = getattr(self._pieces, "close", None)
+        if close is not None:
+            close()
+        self._release()
+
+    def __del__(self) -> None:
+        self._release()
 
 
 def _serialize_response(response: object) -> dict:
@@ -60,11 +202,23 @@ def _serialize_response(response: object) -> dict:
                 cand["parts"] = parts
             candidates.append(cand)
         out["candidates"] = candidates
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        out["usage_metadata"] = {
+            field: getattr(usage, field, None)
+            for field in (
+                "prompt_token_count",
+                "candidates_token_count",
+                "thoughts_token_count",
+                "cached_content_token_count",
+                "total_token_count",
+            )
+        }
     return out
 
 
-def _parts_to_text(candidate: object) -> str:
-    """Extract and concatenate text from all parts of a candidate."""
+def _parts_to_text(candidate: object, strip: bool = True) -> str:
+    """Extract and concatenate text from all parts of a candidate (strip=False for stream deltas)."""
     if not getattr(candidate, "content", None) or not getattr(candidate.content, "parts", None):
         return ""
     parts = candidate.content.parts
@@ -75,7 +229,40 @@ def _parts_to_text(candidate: object) -> str:
         t = getattr(part, "text", None) if hasattr(part, "text") else (part.get("text") if isinstance(part, dict) else None)
         if t and isinstance(t, str):
             texts.append(t)
-    return "".join(texts).strip() or ""
+    text = "".join(texts)
+    return (text.strip() if strip else text) or ""
+
+
+def _merge_stream_raw(raws: list[dict]) -> dict:
+    """Debug payload for a streamed response: one candidate holding the joined text."""
+    if len(raws) == 1:
+        return raws[0]
+    out: dict = {"stream_chunks": len(raws)}
+    for raw in raws:
+        if "prompt_feedback" in raw:
+            out["prompt_feedback"] = raw["prompt_feedback"]
+            break
+    texts: list[str] = []
+    finish_reason = None
+    for raw in raws:
+        for cand in (raw.get("candidates") or [])[:1]:
+            texts.extend(p.get("text") or "" for p in cand.get("parts") or [])
+            finish_reason = cand.get("finish_reason", finish_reason)
+    out["candidates"] = [{"finish_reason": finish_reason, "parts": [{"text": "".join(texts)}]}]
+    for raw in reversed(raws):  # usage is cumulative; the last event has the final counts
+        if raw.get("usage_metadata"):
+            out["usage_metadata"] = raw["usage_metadata"]
+            break
+    return out
+
+
+def _finish_reason(raw: dict) -> str | None:
+    """First candidate's finish reason ("STOP", "MAX_TOKENS", ...), or None when not reported."""
+    for cand in (raw.get("candidates") or [])[:1]:
+        reason = cand.get("finish_reason")
+        if reason is not None and reason != "None":
+            return str(reason).rsplit(".", 1)[-1].upper()  # "FinishReason.STOP" -> "STOP"
+    return None
 
 
 def generate_content_text(
@@ -83,18 +270,111 @@ def generate_content_text(
     *,
     temperature: float = 0.0,
     debug_label: str | None = None,
+    schema_version: str = "1",
 ) -> str | None:
     """
-    Call Gemini with the given prompt and return the response text, or None on failure.
+    Call the configured LLM backend (LLM_BACKEND; Gemini by default, see
+    llm/backends.py) and return the response text, or None on failure.
+    Safe to call from several threads at once (rate limit and concurrency cap apply).
+    Transient errors are retried; the final error is logged. Raises ValueError
+    only for configuration problems (missing API key).
 
     Uses LLM_MODEL from config. Temperature defaults to 0 for deterministic JSON.
+    Checks the response cache first (key: backend, model, prompt, temperature,
+    schema_version); callers bump schema_version when the expected response
+    format changes. Only non-empty responses that finished with STOP are
+    cached (not ones cut off at MAX_TOKENS).
     When config.LLM_DEBUG is True and debug_label is set, saves prompt and raw response
     under <output_dir>/llm_debug/ (uses LLM_DEBUG_OUTPUT_DIR from env if set by pipeline, else OUTPUT_DIR).
     """
+    text = "".join(
+        _response_chunks(prompt, temperature, debug_label, schema_version, stream=False)
+    ).strip()
+    return text or None
+
+
+def stream_content_text(
+    prompt: str,
+    *,
+    temperature: float = 0.0,
+    debug_label: str | None = None,
+    schema_version: str = "1",
+) -> Iterator[str]:
+    """
+    Like generate_content_text(), but yield the response text in pieces as
+    they arrive (with LLM_STREAM_RESPONSES and a backend that streams;
+    otherwise, and for cache hits, the whole text as one piece). Yields
+    nothing on failure.
+
+    Retries, deadline and hedging cover opening the stream up to its first
+    piece; an error after that ends the stream early (logged, not cached),
+    since the caller may already have used the pieces it received.
+    """
+    from semantic_topic_mapper.config import LLM_STREAM_RESPONSES
+
+    return _response_chunks(prompt, temperature, debug_label, schema_version, stream=LLM_STREAM_RESPONSES)
+
+
+def _response_chunks(
+    prompt: str,
+    temperature: float,
+    debug_label: str | None,
+    schema_version: str,
+    stream: bool,
+) -> Iterator[str]:
     import os
+    import time
     from pathlib import Path
 
-    from semantic_topic_mapper.config import LLM_DEBUG, LLM_MODEL, OUTPUT_DIR
+    from semantic_topic_mapper.config import LLM_BACKEND, LLM_DEBUG, LLM_MODEL, OUTPUT_DIR
+    from semantic_topic_mapper.llm.cache import LLMResponseCache, get_response_cache
+    from semantic_topic_mapper.llm.rate_limiter import estimate_tokens, get_rate_limiter
+    from semantic_topic_mapper.llm.telemetry import (
+        LLMCallRecord,
+        current_stage,
+        get_llm_telemetry,
+        usage_tokens,
+    )
+
+    telemetry = get_llm_telemetry()
+    started = time.monotonic()
+
+    def record_call(
+        text: str,
+        raws: list[dict],
+        attempts: int,
+        first_piece: float | None,
+        ok: bool,
+        cache_hit: bool = False,
+    ) -> None:
+        usage = usage_tokens(_merge_stream_raw(raws)) if raws else None
+        telemetry.record(LLMCallRecord(
+            stage=current_stage(),
+            document=telemetry.document,
+            model=LLM_MODEL,
+            backend=LLM_BACKEND,
+            prompt_tokens=usage[0] if usage else estimate_tokens(prompt),
+            response_tokens=usage[1] if usage else (estimate_tokens(text) if text else 0),
+            tokens_estimated=usage is None,
+            latency_s=time.monotonic() - started,
+            first_piece_s=first_piece,
+            attempts=attempts,
+            cache_hit=cache_hit,
+            ok=ok,
+        ))
+
+    from semantic_topic_mapper.llm.backends import get_backend, stream_response
+    from semantic_topic_mapper.llm.resilience import CircuitOpenError, call_with_resilience
+
+    backend = get_backend()
+    cache = get_response_cache()
+    cache_key = LLMResponseCache.make_key(LLM_MODEL, prompt, temperature, schema_version, backend.name)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            record_call(cached, [], 0, None, ok=True, cache_hit=True)
+            yield cached
+            return
 
     debug_dir_path: Path | None = None
     if LLM_DEBUG and debug_label:
@@ -104,42 +384,84 @@ def generate_content_text(
         elif OUTPUT_DIR is not None:
             debug_dir_path = Path(OUTPUT_DIR) / "llm_debug"
 
+    limiter = get_rate_limiter()
+    slots = _AttemptSlots()
+    attempts = 0
+
+    def before_attempt() -> None:
+        nonlocal attempts
+        attempts += 1
+        limiter.acquire(estimate_tokens(prompt))
+        slots.take()
+
+    def start() -> tuple[Any, Iterator[Any]]:
+        release = slots.release_once()
+        try:
+            if not stream:
+                return backend.generate(prompt, temperature), iter(())
+            pieces = stream_response(backend, prompt, temperature)
+            first = next(pieces, None)
+        except BaseException:
+            release()
+            raise
+        finally:
+            if not stream:
+                release()
+        return first, _HeldStream(pieces, release)
+
     try:
-        client = get_genai_client()
-        response = client.models.generate_content(
-            model=LLM_MODEL,
-            contents=prompt,
-            config={"temperature": temperature},
-        )
+        first, rest = call_with_resilience(start, before_attempt=before_attempt, before_hedge=slots.take_for_hedge)
+    except CircuitOpenError:
+        record_call("", [], attempts, None, ok=False)
+        return
     except ValueError:
+        record_call("", [], attempts, None, ok=False)
         raise
-    except Exception:
-        return None
+    except Exception as e:
+        logger.warning("LLM call %s failed: %s: %s", debug_label or "", type(e).__name__, e)
+        record_call("", [], attempts, None, ok=False)
+        return
+    first_piece = time.monotonic() - started
+
+    texts: list[str] = []
+    raws: list[dict] = []
+    complete = False
+    response = first
+    try:
+        while response is not None:
+            raws.append(response.raw)
+            if response.text:
+                texts.append(response.text)
+                yield response.text
+            try:
+                response = next(rest, None)
+            except Exception as e:
+                logger.warning("LLM stream %s broke off: %s: %s", debug_label or "", type(e).__name__, e)
+                break
+        else:
+            complete = True
+    finally:
+        # Also runs when the caller stops reading early (generator closed).
+        close = getattr(rest, "close", None)
+        if close is not None:
+            close()
+        record_call("".join(texts), raws, attempts, first_piece, ok=complete)
 
     # Debug: save prompt and response for inspection
-    if debug_dir_path is not None:
+    if debug_dir_path is not None and raws:
         safe_label = re.sub(r"[^\w\-]", "_", debug_label).strip("_") or "llm_call"
         debug_dir_path.mkdir(parents=True, exist_ok=True)
         debug_dir = debug_dir_path
         try:
             (debug_dir / f"{safe_label}_prompt.txt").write_text(prompt, encoding="utf-8")
-            payload = _serialize_response(response)
             (debug_dir / f"{safe_label}_response.json").write_text(
-                json.dumps(payload, indent=2, ensure_ascii=False),
+                json.dumps(_merge_stream_raw(raws), indent=2, ensure_ascii=False),
                 encoding="utf-8",
             )
         except Exception:
             pass
 
-    # Check for prompt-level block (e.g. safety)
-    if hasattr(response, "prompt_feedback") and response.prompt_feedback is not None:
-        reason = getattr(response.prompt_feedback, "block_reason", None)
-        if reason is not None and str(reason) != "BLOCK_REASON_UNSPECIFIED":
-            return None
-
-    if not response or not getattr(response, "candidates", None) or not response.candidates:
-        return None
-
-    # Collect text from all parts of the first candidate
-    text = _parts_to_text(response.candidates[0])
-    return text if text else None
+    text = "".join(texts).strip()
+    # Truncated answers (MAX_TOKENS, SAFETY, ...) are not kept
+    if text and complete and cache is not None and _finish_reason(_merge_stream_raw(raws)) == "STOP":
+        cache.put(cache_key, LLM_MODEL, text)
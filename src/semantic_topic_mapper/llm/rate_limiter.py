@@ -0,0 +1,98 @@
+"""
+Token-bucket rate limiting for LLM calls.
+
+Two buckets, one for requests per minute and one for (estimated) prompt tokens
+per minute, each refilled continuously and allowed to burst up to one minute's
+budget. acquire() blocks the calling thread until both buckets can pay (the
+LLM client calls it before every attempt, on worker threads). One
+process-wide limiter (get_rate_limiter) is shared by all enrichment calls.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class _Bucket:
+    """Continuous-refill token bucket; capacity equals the per-minute budget."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount is available (0 if available now)."""
+        self._refill(now)
+        deficit = min(amount, self.capacity) - self.level
+        return 0.0 if deficit <= 0 else deficit / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class TokenBucketRateLimiter:
+    """
+    Rate limiter over requests/min and tokens/min (0 disables a bucket).
+    Thread-safe; requests larger than a bucket's capacity are clipped to it so
+    they wait for a full bucket instead of forever.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self._buckets: list[tuple[_Bucket, bool]] = []
+        if requests_per_minute > 0:
+            self._buckets.append((_Bucket(requests_per_minute), False))
+        if tokens_per_minute > 0:
+            self._buckets.append((_Bucket(tokens_per_minute), True))
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._buckets)
+
+    def _try_take(self, tokens: int) -> float:
+        """Take from all buckets if possible and return 0, else return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                (b.wait_time(tokens if is_tokens else 1, now) for b, is_tokens in self._buckets),
+                default=0.0,
+            )
+            if wait == 0.0:
+                for b, is_tokens in self._buckets:
+                    b.take(tokens if is_tokens else 1)
+            return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until one request carrying `tokens` prompt tokens may proceed."""
+        if not self._buckets:
+            return
+        while (wait := self._try_take(tokens)) > 0:
+            time.sleep(wait)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) for budgeting, not billing."""
+    return max(1, len(text) // 4)
+
+
+_limiter: TokenBucketRateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucketRateLimiter:
+    """Process-wide limiter configured from LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE."""
+    global _limiter
+    if _limiter is None:
+        from semantic_topic_mapper.config import LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = TokenBucketRateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+    return _limiter
@@ -0,0 +1,273 @@
+"""
+Failure handling for LLM calls: deadlines, retries, hedging, circuit breaker.
+
+- Deadline: each attempt is abandoned after LLM_TIMEOUT seconds (the HTTP
+  client is given the same timeout, so the abandoned request also ends).
+- Retries: retryable failures (timeouts, connection errors, HTTP 408/429/5xx)
+  are retried up to LLM_MAX_RETRIES times with full-jitter exponential backoff.
+- Hedging (optional): if an attempt has not answered after the observed p95
+  latency, a second identical request is sent and the first answer wins.
+- Circuit breaker: after LLM_BREAKER_THRESHOLD consecutive retryable failures
+  further calls fail fast for LLM_BREAKER_COOLDOWN seconds; the enrichment
+  layer then drops LLM output for the run and records an audit issue.
+
+generate_content_text() in llm/client.py is the only caller.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying (request timeout, rate limit, server errors).
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+# Latency samples needed before hedging starts (p95 of fewer is noise).
+HEDGE_MIN_SAMPLES = 20
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the LLM while the circuit breaker is open."""
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """An LLM attempt did not finish within its deadline."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for transient failures: timeouts, connection errors, HTTP 408/429/5xx."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(exc, (httpx.TimeoutException, httpx.TransportError))
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0.0, min(cap, base * (2**attempt)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker. Closed: calls pass. After `threshold`
+    consecutive failures it opens and allow() is False until `cooldown`
+    seconds pass; then one probe call is let through (half-open) and its
+    outcome closes or re-opens the circuit. threshold <= 0 disables it.
+    open_count counts how often it has opened (process lifetime).
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.open_count = 0
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def end_probe(self) -> None:
+        """
+        End a half-open probe whose outcome says nothing about the service
+        (e.g. a rejected request), without closing or re-opening the circuit
+        or touching the failure count.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.threshold):
+                if self._opened_at is None:
+                    self.open_count += 1
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        """q-quantile (0..1) of the window, or None below HEDGE_MIN_SAMPLES samples."""
+        with self._lock:
+            if len(self._samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _attempt_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        from semantic_topic_mapper.config import LLM_MAX_CONCURRENCY
+
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=2 * max(1, LLM_MAX_CONCURRENCY),
+                    thread_name_prefix="llm-attempt",
+                )
+    return _executor
+
+
+def run_with_deadline(
+    attempt: Callable[[], T],
+    deadline: float,
+    hedge_after: float | None = None,
+    before_hedge: Callable[[], bool] | None = None,
+) -> T:
+    """
+    Run attempt() in a worker thread and return its result, raising
+    LLMDeadlineExceeded if no result arrives within `deadline` seconds. With
+    hedge_after, a second attempt() starts if the first has not finished by
+    then, unless before_hedge() returns False (e.g. no free call slot); the
+    first successful result wins and the first error is raised only if both
+    fail. Abandoned attempts finish in the background.
+    """
+    executor = _attempt_executor()
+    started = time.monotonic()
+    pending: set[Future[T]] = {executor.submit(attempt)}
+    hedged = hedge_after is None or hedge_after >= deadline
+    first_error: BaseException | None = None
+    while pending:
+        elapsed = time.monotonic() - started
+        if not hedged:
+            timeout = max(0.0, hedge_after - elapsed)  # type: ignore[operator]
+        else:
+            timeout = max(0.0, deadline - elapsed)
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for fut in done:
+            exc = fut.exception()
+            if exc is None:
+                return fut.result()
+            first_error = first_error or exc
+        if not done:
+            if not hedged:
+                hedged = True
+                if before_hedge is None or before_hedge():
+                    pending.add(executor.submit(attempt))
+            elif time.monotonic() - started >= deadline:
+                break
+    if first_error is not None and not pending:
+        raise first_error
+    raise LLMDeadlineExceeded(f"LLM call exceeded {deadline:g}s deadline")
+
+
+_breaker: CircuitBreaker | None = None
+_latency = LatencyTracker()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Process-wide breaker configured from LLM_BREAKER_THRESHOLD / LLM_BREAKER_COOLDOWN."""
+    global _breaker
+    if _breaker is None:
+        from semantic_topic_mapper.config import LLM_BREAKER_COOLDOWN, LLM_BREAKER_THRESHOLD
+
+        with _executor_lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(LLM_BREAKER_THRESHOLD, LLM_BREAKER_COOLDOWN)
+    return _breaker
+
+
+def call_with_resilience(
+    attempt: Callable[[], T],
+    before_attempt: Callable[[], None] | None = None,
+    before_hedge: Callable[[], bool] | None = None,
+) -> T:
+    """
+    Run one LLM request with deadline, retries, optional hedging and the
+    circuit breaker. before_attempt (e.g. rate limiting, waiting for a call
+    slot) runs before each try, outside the deadline; a hedged duplicate
+    shares its try's rate-limit grant and is only sent if before_hedge()
+    (when given) returns True. Raises CircuitOpenError when the breaker is
+    open, or the last error once retries are exhausted or the error is not
+    retryable. Non-retryable errors leave the breaker's failure count alone.
+    """
+    from semantic_topic_mapper.config import (
+        LLM_HEDGE_REQUESTS,
+        LLM_MAX_RETRIES,
+        LLM_RETRY_BASE_DELAY,
+        LLM_RETRY_MAX_DELAY,
+        LLM_TIMEOUT,
+    )
+
+    breaker = get_circuit_breaker()
+    retry = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError("LLM circuit breaker is open")
+        if before_attempt is not None:
+            before_attempt()
+        hedge_after = _latency.percentile(0.95) if LLM_HEDGE_REQUESTS else None
+        started = time.monotonic()
+        try:
+            result = run_with_deadline(attempt, float(LLM_TIMEOUT), hedge_after, before_hedge)
+        except Exception as e:
+            if not is_retryable(e):
+                breaker.end_probe()  # says nothing about the service's health
+                raise
+            breaker.record_failure()
+            if retry >= LLM_MAX_RETRIES:
+                raise
+            time.sleep(backoff_delay(retry, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY))
+            retry += 1
+            continue
+        _latency.record(time.monotonic() - started)
+        breaker.record_success()
+        return result
+
+
+def reset_resilience_state() -> None:
+    """Forget breaker state and latency samples (tests, benchmarks)."""
+    global _breaker, _latency
+    _breaker = None
+    _latency = LatencyTracker()
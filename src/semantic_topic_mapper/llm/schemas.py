@@ -1 +1,92 @@
-# JSON output schemas for LLM responses.
+"""
+JSON output schemas for LLM responses.
+
+Enrichment responses are one JSON object whose sections are lists of items:
+"entities" (type classification), "relationships", "ambiguous_entities"
+(entity enrichment), "references" (implicit reference linking) and
+"summaries" (topic summaries). Each
+item type is a pydantic model; its TypeAdapter is built once at import and
+reused for every item, so validation cost is a compiled-validator call rather
+than per-response schema construction. Items are validated one at a time (see
+llm/validator.py), so one malformed item is dropped without losing the rest.
+
+Checks that need the request context (e.g. "name must be in the entity list")
+stay with the caller.
+"""
+
+from __future__ import annotations
+
+from typing import Annotated, Any, Literal
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, StringConstraints, TypeAdapter, ValidationError
+
+ENTITY_TYPES = ("organization", "role", "temporal", "legal_construct", "other")
+RELATION_TYPES = ("reports_to", "oversees", "obligation_to", "advises", "governs")
+
+EntityType = Literal["organization", "role", "temporal", "legal_construct", "other"]
+RelationType = Literal["reports_to", "oversees", "obligation_to", "advises", "governs"]
+
+_NonEmpty = Annotated[str, StringConstraints(min_length=1)]
+
+
+def _as_text(value: Any) -> Any:
+    """Accept non-string values (numbers, lists) as their string form, like str(value)."""
+    if value is None or isinstance(value, str) or value == [] or value == {}:
+        return value
+    return str(value)
+
+
+class _Item(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class EntityTypeItem(_Item):
+    name: str
+    type: EntityType
+
+
+class RelationshipItem(_Item):
+    source: str
+    target: str
+    relation_type: RelationType
+
+
+class AmbiguityItem(_Item):
+    name: _NonEmpty
+    reason: Annotated[_NonEmpty, BeforeValidator(_as_text)]
+
+
+class ReferenceItem(_Item):
+    candidate: Annotated[_NonEmpty, BeforeValidator(_as_text)]
+    target: Annotated[_NonEmpty, BeforeValidator(_as_text)]
+
+
+class SummaryItem(_Item):
+    topic_id: Annotated[_NonEmpty, BeforeValidator(_as_text)]
+    summary: _NonEmpty
+
+
+# Response section name -> item model.
+SECTION_ITEMS: dict[str, type[_Item]] = {
+    "entities": EntityTypeItem,
+    "relationships": RelationshipItem,
+    "ambiguous_entities": AmbiguityItem,
+    "references": ReferenceItem,
+    "summaries": SummaryItem,
+}
+
+# Built once; TypeAdapter construction compiles the validator.
+_ITEM_ADAPTERS: dict[str, TypeAdapter[Any]] = {
+    section: TypeAdapter(model) for section, model in SECTION_ITEMS.items()
+}
+
+
+def validate_item(section: str, raw: Any) -> _Item | None:
+    """Validate one raw item of a response section; None if it does not conform."""
+    adapter = _ITEM_ADAPTERS.get(section)
+    if adapter is None:
+        return None
+    try:
+        return adapter.validate_python(raw)
+    except ValidationError:
+        return None
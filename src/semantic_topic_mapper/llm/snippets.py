@@ -0,0 +1,98 @@
+"""
+Mention-context snippet excerpts for LLM enrichment.
+
+Instead of a document prefix, each request carries short windows of text around
+the mentions of the entities it asks about: up to per_entity mentions per entity
+(spread over the document), window_chars of context on each side, snapped to
+word boundaries. Overlapping windows within a request are merged, so prompt
+size grows with the number of entities, not with document length.
+"""
+
+from __future__ import annotations
+
+from semantic_topic_mapper.entities.entity_models import Entity, EntityMention
+from semantic_topic_mapper.llm.chunking import EnrichmentUnit
+
+# Separator between non-adjacent snippets in an excerpt.
+SNIPPET_SEPARATOR = "\n[...]\n"
+
+
+def build_snippet_units(
+    entities: list[Entity],
+    text: str,
+    window_chars: int = 200,
+    per_entity: int = 3,
+    max_tokens: int = 3000,
+    max_entities: int = 60,
+) -> list[EnrichmentUnit]:
+    """
+    Batch entities in first-mention order into EnrichmentUnits whose text is
+    the merged mention windows of the batch. A batch closes when it reaches
+    max_entities or its windows would exceed max_tokens (~4 chars/token);
+    nearby entities share a batch, so their windows overlap and merge.
+    """
+    max_chars = max(1, max_tokens) * 4
+    cap = max(1, max_entities)
+    ordered = sorted(
+        entities,
+        key=lambda e: min((m.start_char for m in e.mentions), default=len(text)),
+    )
+
+    batches: list[tuple[list[Entity], list[tuple[int, int]]]] = []
+    batch: list[Entity] = []
+    windows: list[tuple[int, int]] = []
+    size = 0
+    for entity in ordered:
+        own = [_window(text, m, window_chars) for m in _spread(entity.mentions, per_entity)]
+        own_size = sum(end - start for start, end in own)
+        if batch and (len(batch) >= cap or size + own_size > max_chars):
+            batches.append((batch, windows))
+            batch, windows, size = [], [], 0
+        batch.append(entity)
+        windows.extend(own)
+        size += own_size  # upper bound; merging only shrinks it
+    if batch:
+        batches.append((batch, windows))
+
+    return [
+        EnrichmentUnit(
+            label=f"snippets {i + 1}/{len(batches)}",
+            text=render_snippets(text, windows),
+            entities=batch,
+        )
+        for i, (batch, windows) in enumerate(batches)
+    ]
+
+
+def render_snippets(text: str, windows: list[tuple[int, int]]) -> str:
+    """Merge overlapping or touching windows and join them in document order."""
+    merged: list[list[int]] = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return SNIPPET_SEPARATOR.join(text[start:end].strip() for start, end in merged)
+
+
+def _spread(mentions: list[EntityMention], k: int) -> list[EntityMention]:
+    """Up to k mentions evenly spaced over the document (first and last included)."""
+    ordered = sorted(mentions, key=lambda m: m.start_char)
+    n = len(ordered)
+    if n <= k:
+        return ordered
+    if k <= 1:
+        return ordered[:1]
+    picks = sorted({round(i * (n - 1) / (k - 1)) for i in range(k)})
+    return [ordered[i] for i in picks]
+
+
+def _window(text: str, mention: EntityMention, window_chars: int) -> tuple[int, int]:
+    """Context window around a mention, widened to whole words."""
+    start = max(0, mention.start_char - window_chars)
+    end = min(len(text), mention.end_char + window_chars)
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    while end < len(text) and not text[end].isspace():
+        end += 1
+    return start, end
@@ -0,0 +1,287 @@
+"""
+Local stub of the Gemini generateContent HTTP endpoint.
+
+For offline benchmarks and tests only: answers POST .../models/<model>:generateContent
+with a canned (or computed) text response in the Gemini REST response shape,
+after an artificial latency drawn from a configurable distribution, and fails a
+configurable fraction of requests with HTTP errors. Point the client at it with
+LLM_BASE_URL=<url> (any non-empty LLM_API_KEY), or use LLM_BACKEND=stub
+(llm/backends.py), which starts one in-process. :streamGenerateContent is
+answered as server-sent events, the text split into STREAM_CHUNK_CHARS pieces:
+the first after STREAM_FIRST_FRACTION of the sampled latency, the rest spread
+over the remainder (a model's time to first token, then generation).
+
+Latency specs (seconds): "0.05" or "fixed:0.05", "uniform:0.02,0.2",
+"lognormal:0.5,0.6" (median, sigma), "exponential:0.3" (mean).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+Responder = Callable[[str], str]
+
+# Streamed responses: characters per event, and share of the latency before the first.
+STREAM_CHUNK_CHARS = 256
+STREAM_FIRST_FRACTION = 0.2
+LatencySampler = Callable[[], float]
+
+_STATUS_NAMES = {
+    408: "DEADLINE_EXCEEDED",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    502: "UNAVAILABLE",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+
+
+def parse_latency(spec: str | float, rng: random.Random | None = None) -> LatencySampler:
+    """Build a latency sampler from a spec string (see module docstring)."""
+    rng = rng or random.Random()
+    if isinstance(spec, (int, float)):
+        value = float(spec)
+        return lambda: value
+    kind, _, args = spec.strip().partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    params = [float(x) for x in args.split(",") if x.strip()]
+    kind = kind.lower()
+    if kind == "fixed" and len(params) == 1:
+        return lambda: params[0]
+    if kind == "uniform" and len(params) == 2:
+        return lambda: rng.uniform(params[0], params[1])
+    if kind == "lognormal" and len(params) == 2:
+        mu = math.log(params[0])
+        return lambda: rng.lognormvariate(mu, params[1])
+    if kind == "exponential" and len(params) == 1:
+        return lambda: rng.expovariate(1.0 / params[0])
+    raise ValueError(f"Invalid stub latency spec: {spec!r}")
+
+
+_NAMES_LIST = re.compile(r"^(\[\s*\".*\"\s*\])\s*$", re.MULTILINE)
+_PASSAGE = re.compile(r"^(C\d+) \(in section [^;]*; candidates: ([^,)]+)", re.MULTILINE)
+_SUMMARY_TOPIC = re.compile(r"^### Topic (\S+): (.*)$", re.MULTILINE)
+
+
+def enrichment_responder(prompt: str) -> str:
+    """
+    Plausible answer to an entity enrichment prompt: every entity name found in
+    the prompt's JSON name list typed "other", with no relationships or
+    ambiguities. Implicit reference prompts get each passage linked to its
+    first candidate section, and topic summary prompts a one-sentence summary
+    per topic. Gives realistic response sizes without a model.
+    """
+    topics = _SUMMARY_TOPIC.findall(prompt)
+    if topics:
+        return json.dumps({"summaries": [
+            {"topic_id": t, "summary": f"Section {t} sets out the requirements on {title.strip().lower()}."}
+            for t, title in topics
+        ]})
+    passages = _PASSAGE.findall(prompt)
+    if passages:
+        return json.dumps({"references": [{"candidate": c, "target": t.strip()} for c, t in passages]})
+    match = _NAMES_LIST.search(prompt)
+    names = json.loads(match.group(1)) if match else []
+    return json.dumps({
+        "entities": [{"name": n, "type": "other"} for n in names],
+        "relationships": [],
+        "ambiguous_entities": [],
+    })
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802
+        server: StubServer = self.server  # type: ignore[assignment]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        streaming = ":streamGenerateContent" in self.path
+        if not streaming and ":generateContent" not in self.path:
+            self._send(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+            return
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send(400, {"error": {"code": 400, "message": "bad json", "status": "INVALID_ARGUMENT"}})
+            return
+        prompt = "".join(
+            part.get("text", "")
+            for content in request.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        server.record_request()
+        delay = server.sample_latency()
+        error = server.sample_error()
+        if streaming and error is None:
+            self._stream(prompt, server.responder(prompt), delay)
+            return
+        if delay > 0:
+            time.sleep(delay)
+        if error is not None:
+            status = _STATUS_NAMES.get(error, "UNKNOWN")
+            self._send(error, {"error": {"code": error, "message": "stub error", "status": status}})
+            return
+        text = server.responder(prompt)
+        self._send(200, _response_payload(prompt, text, text))
+
+    def _stream(self, prompt: str, text: str, delay: float) -> None:
+        """Send the response as SSE events over chunked transfer encoding."""
+        pieces = [text[i : i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+        first_delay = delay * STREAM_FIRST_FRACTION
+        gap = (delay - first_delay) / max(1, len(pieces) - 1) if len(pieces) > 1 else 0.0
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        if delay > 0:
+            time.sleep(first_delay if len(pieces) > 1 else delay)
+        for i, piece in enumerate(pieces):
+            if i and gap > 0:
+                time.sleep(gap)
+            event = b"data: " + json.dumps(_response_payload(prompt, text, piece)).encode("utf-8") + b"\r\n\r\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+def _response_payload(prompt: str, text: str, piece: str) -> dict:
+    """Gemini response (or stream event) carrying `piece` of the full response `text`."""
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": piece}]},
+            "finishReason": "STOP",
+        }],
+        "usageMetadata": {
+            "promptTokenCount": max(1, len(prompt) // 4),
+            "candidatesTokenCount": max(1, len(text) // 4),
+            "totalTokenCount": max(1, len(prompt) // 4) + max(1, len(text) // 4),
+        },
+    }
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded stub server; request_count counts generateContent calls received
+    (including failed ones), error_count those answered with an HTTP error.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        responder: Responder,
+        latency: float | str | LatencySampler,
+        error_rate: float = 0.0,
+        error_codes: Sequence[int] = (503,),
+        seed: int | None = None,
+    ):
+        super().__init__(address, _StubHandler)
+        self.responder = responder
+        self._rng = random.Random(seed)
+        self.sample_latency: LatencySampler = (
+            latency if callable(latency) else parse_latency(latency, self._rng)
+        )
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes) or (503,)
+        self.request_count = 0
+        self.error_count = 0
+        self._count_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def stop(self) -> None:
+        """Stop serving (if started by start_stub_server) and close the socket."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self.shutdown()
+            thread.join()
+        self.server_close()
+
+    def sample_error(self) -> int | None:
+        """HTTP status to fail this request with, or None to answer normally."""
+        if self.error_rate <= 0:
+            return None
+        with self._count_lock:
+            if self._rng.random() >= self.error_rate:
+                return None
+            self.error_count += 1
+            return self._rng.choice(self.error_codes)
+
+    def record_request(self) -> None:
+        with self._count_lock:
+            self.request_count += 1
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(
+    responder: Responder | None = None,
+    latency: float | str | LatencySampler = 0.0,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    error_rate: float = 0.0,
+    error_codes: Sequence[int] = (503,),
+    seed: int | None = None,
+) -> StubServer:
+    """
+    Start the stub serving in a background thread; stop it with server.stop().
+    responder maps prompt text to response text (default: an empty JSON object).
+    latency is seconds, a spec string, or a sampler; error_rate is the fraction
+    of requests failed with a status drawn from error_codes. seed makes both
+    reproducible. port=0 picks a free port; use server.url as LLM_BASE_URL.
+    """
+    server = StubServer(
+        (host, port),
+        responder or (lambda _prompt: "{}"),
+        latency,
+        error_rate=error_rate,
+        error_codes=error_codes,
+        seed=seed,
+    )
+    server._thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server._thread.start()
+    return server
+
+
+@contextmanager
+def run_stub_server(
+    responder: Responder | None = None,
+    latency: float | str | LatencySampler = 0.0,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    error_rate: float = 0.0,
+    error_codes: Sequence[int] = (503,),
+    seed: int | None = None,
+) -> Iterator[StubServer]:
+    """Serve the stub for the duration of the block (arguments as start_stub_server)."""
+    server = start_stub_server(responder, latency, host, port, error_rate, error_codes, seed)
+    try:
+        yield server
+    finally:
+        server.stop()
@@ -0,0 +1,173 @@
+"""
+Per-call LLM telemetry: tokens, latency, retries, cache hits and cost.
+
+llm/client.py records one LLMCallRecord for every request it serves (cache
+hits and failures included). Token counts come from the response's usage
+metadata; when a backend returns none (e.g. old recordings), they are
+estimated at ~4 characters per token and the record is flagged.
+
+Calls are attributed to a stage (set by the enrichers with llm_stage()) and
+to the document the pipeline is processing (LLMTelemetry.begin_document()).
+summary() aggregates per stage and per document for the llm_metrics.json
+deliverable; cost uses LLM_COST_PER_MTOK_INPUT / LLM_COST_PER_MTOK_OUTPUT.
+
+Deterministic; does not call LLMs.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+_stage: contextvars.ContextVar[str] = contextvars.ContextVar("llm_stage", default="other")
+
+
+@contextmanager
+def llm_stage(name: str) -> Iterator[None]:
+    """Attribute LLM calls made in this block (same thread or task) to stage `name`."""
+    token = _stage.set(name)
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+def current_stage() -> str:
+    return _stage.get()
+
+
+@dataclass
+class LLMCallRecord:
+    """One LLM request as served: from the cache, by the backend, or failed."""
+
+    stage: str
+    document: str | None
+    model: str
+    backend: str
+    prompt_tokens: int
+    response_tokens: int
+    tokens_estimated: bool
+    latency_s: float
+    first_piece_s: float | None
+    attempts: int
+    cache_hit: bool
+    ok: bool
+
+
+def usage_tokens(raw: dict[str, Any]) -> tuple[int, int] | None:
+    """(prompt, response) token counts from a serialized response's usage metadata, if present."""
+    usage = raw.get("usage_metadata")
+    if not usage or usage.get("prompt_token_count") is None:
+        return None
+    response = (usage.get("candidates_token_count") or 0) + (usage.get("thoughts_token_count") or 0)
+    return int(usage["prompt_token_count"]), int(response)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def aggregate_calls(
+    records: list[LLMCallRecord],
+    cost_per_mtok_input: float = 0.0,
+    cost_per_mtok_output: float = 0.0,
+) -> dict[str, Any]:
+    """Totals for a group of calls: counts, tokens billed (cache hits excluded), latency, cost."""
+    billed = [r for r in records if not r.cache_hit]
+    prompt_tokens = sum(r.prompt_tokens for r in billed)
+    response_tokens = sum(r.response_tokens for r in billed)
+    latencies = [r.latency_s for r in billed if r.ok]
+    first_pieces = [r.first_piece_s for r in billed if r.ok and r.first_piece_s is not None]
+    return {
+        "calls": len(records),
+        "succeeded": sum(1 for r in records if r.ok),
+        "failed": sum(1 for r in records if not r.ok),
+        "cache_hits": len(records) - len(billed),
+        "retries": sum(max(0, r.attempts - 1) for r in billed),
+        "prompt_tokens": prompt_tokens,
+        "response_tokens": response_tokens,
+        "total_tokens": prompt_tokens + response_tokens,
+        "estimated_token_calls": sum(1 for r in billed if r.tokens_estimated),
+        "latency_s": {
+            "total": round(sum(r.latency_s for r in billed), 3),
+            "p50": round(_percentile(latencies, 0.5), 3) if latencies else None,
+            "p95": round(_percentile(latencies, 0.95), 3) if latencies else None,
+            "max": round(max(latencies), 3) if latencies else None,
+            "first_piece_p50": round(_percentile(first_pieces, 0.5), 3) if first_pieces else None,
+        },
+        "cost_usd": round(
+            (prompt_tokens * cost_per_mtok_input + response_tokens * cost_per_mtok_output) / 1e6, 6
+        ),
+    }
+
+
+class LLMTelemetry:
+    """Thread-safe collector of LLMCallRecords for the process."""
+
+    def __init__(self) -> None:
+        self._records: list[LLMCallRecord] = []
+        self._lock = threading.Lock()
+        self.document: str | None = None
+
+    def begin_document(self, name: str | None) -> None:
+        """Attribute subsequent calls to document `name` (documents are processed one at a time)."""
+        self.document = name
+
+    def record(self, record: LLMCallRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> list[LLMCallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def summary(self, cost_per_mtok_input: float = 0.0, cost_per_mtok_output: float = 0.0) -> dict[str, Any]:
+        """
+        JSON-serializable aggregate: totals, per stage, and per document (each
+        with its own per-stage breakdown). Stages and documents keep first-seen order.
+        """
+        records = self.records()
+
+        def totals(group: list[LLMCallRecord]) -> dict[str, Any]:
+            return aggregate_calls(group, cost_per_mtok_input, cost_per_mtok_output)
+
+        def by_stage(group: list[LLMCallRecord]) -> dict[str, Any]:
+            stages: dict[str, list[LLMCallRecord]] = {}
+            for r in group:
+                stages.setdefault(r.stage, []).append(r)
+            return {stage: totals(rs) for stage, rs in stages.items()}
+
+        documents: dict[str, list[LLMCallRecord]] = {}
+        for r in records:
+            documents.setdefault(r.document or "", []).append(r)
+        return {
+            "models": sorted({r.model for r in records}),
+            "backends": sorted({r.backend for r in records}),
+            "pricing_usd_per_million_tokens": {
+                "input": cost_per_mtok_input,
+                "output": cost_per_mtok_output,
+            },
+            "totals": totals(records),
+            "stages": by_stage(records),
+            "documents": {
+                doc: {"totals": totals(rs), "stages": by_stage(rs)} for doc, rs in documents.items()
+            },
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._records.clear()
+        self.document = None
+
+
+_telemetry = LLMTelemetry()
+
+
+def get_llm_telemetry() -> LLMTelemetry:
+    """The process-wide collector used by llm/client.py."""
+    return _telemetry
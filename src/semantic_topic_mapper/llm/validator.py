@@ -1 +1,159 @@
-# Validate LLM responses against schemas before graph inclusion.
+"""
+Validate LLM responses against schemas before graph inclusion.
+
+StreamingItemParser scans a JSON response as it arrives and emits each
+complete item of the requested top-level sections (e.g. every object in
+"entities": [...]) as soon as its closing brace is seen, instead of waiting
+for the whole text and parsing one large document. Text before the first
+"{" (code fences, a preamble sentence) and after the top-level object is
+ignored. Only the unfinished item is kept in memory.
+
+iter_response_items() runs the parser over a chunk stream and validates each
+item with the cached adapters in llm/schemas.py; invalid items are skipped.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from semantic_topic_mapper.llm.schemas import validate_item
+
+# Characters that change parser state outside / inside JSON strings.
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_IN_STRING = re.compile(r'["\\]')
+
+
+class StreamingItemParser:
+    """
+    Incremental extractor of array items from a top-level JSON object.
+
+    feed(chunk) returns the (section, item) pairs completed by that chunk, in
+    response order; items that are not objects or are not valid JSON are
+    dropped. saw_object is True once the top-level "{" has been seen and
+    complete once its matching "}" has.
+    """
+
+    def __init__(self, sections: Iterable[str]):
+        self.sections = frozenset(sections)
+        self.saw_object = False
+        self.complete = False
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = -1
+        self._last_key: str | None = None
+        self._section: str | None = None
+        self._item_start = -1
+
+    def feed(self, chunk: str) -> list[tuple[str, dict[str, Any]]]:
+        if self.complete or not chunk:
+            return []
+        self._buf += chunk
+        out: list[tuple[str, dict[str, Any]]] = []
+        if not self.saw_object:
+            start = self._buf.find("{", self._pos)
+            if start < 0:
+                self._buf, self._pos = "", 0
+                return out
+            self.saw_object = True
+            self._depth = 1
+            self._pos = start + 1
+        self._scan(out)
+        self._trim()
+        return out
+
+    def _scan(self, out: list[tuple[str, dict[str, Any]]]) -> None:
+        buf = self._buf
+        pos = self._pos
+        while True:
+            if self._in_string:
+                m = _IN_STRING.search(buf, pos)
+                if m is None:
+                    pos = len(buf)
+                    break
+                if m.group() == "\\":
+                    if m.end() >= len(buf):  # escaped char not received yet
+                        pos = m.start()
+                        break
+                    pos = m.end() + 1
+                    continue
+                self._in_string = False
+                pos = m.end()
+                if self._depth == 1:
+                    try:
+                        self._last_key = json.loads(buf[self._string_start : pos])
+                    except ValueError:
+                        self._last_key = None
+                continue
+            m = _STRUCTURAL.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            ch = m.group()
+            pos = m.end()
+            if ch == '"':
+                self._in_string = True
+                self._string_start = m.start()
+            elif ch in "{[":
+                if self._depth == 1 and ch == "[":
+                    self._section = self._last_key if self._last_key in self.sections else None
+                elif self._depth == 2 and ch == "{" and self._section is not None:
+                    self._item_start = m.start()
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 2 and self._item_start >= 0:
+                    self._emit(buf[self._item_start : pos], out)
+                    self._item_start = -1
+                elif self._depth == 1:
+                    self._section = None
+                elif self._depth == 0:
+                    self.complete = True
+                    break
+        self._pos = pos
+
+    def _emit(self, raw: str, out: list[tuple[str, dict[str, Any]]]) -> None:
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            return
+        if isinstance(item, dict) and self._section is not None:
+            out.append((self._section, item))
+
+    def _trim(self) -> None:
+        """Drop consumed text, keeping an unfinished item or string."""
+        keep = self._pos
+        if self._item_start >= 0:
+            keep = min(keep, self._item_start)
+        if self._in_string and self._depth == 1:
+            keep = min(keep, self._string_start)
+        if keep <= 0:
+            return
+        self._buf = self._buf[keep:]
+        self._pos -= keep
+        if self._item_start >= 0:
+            self._item_start -= keep
+        if self._in_string:
+            self._string_start -= keep
+
+
+def iter_response_items(
+    chunks: Iterable[str],
+    sections: Iterable[str],
+    parser: StreamingItemParser | None = None,
+) -> Iterator[tuple[str, Any]]:
+    """
+    Yield (section, validated item) for every schema-valid item of the given
+    sections as the response chunks arrive (models from llm/schemas.py). Pass
+    a parser to inspect its state (e.g. saw_object) afterwards.
+    """
+    parser = parser or StreamingItemParser(sections)
+    for chunk in chunks:
+        for section, raw in parser.feed(chunk):
+            item = validate_item(section, raw)
+            if item is not None:
+                yield section, item
@@ -2,7 +2,7 @@
 Ambiguity report exporter: serialize audit issues to CSV.
 
 Maps internal AuditIssue list to the assignment deliverable format (issue_type,
-severity, message, topic_id, start_char, end_char). Thin serializer only;
+severity, message, topic_id, start_char, end_char, line). Thin serializer only;
 no LLM or inference.
 """
 
@@ -11,12 +11,19 @@ from __future__ import annotations
 import csv
 
 from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue
+from semantic_topic_mapper.ingestion.document_index import DocumentIndex
 
 
-def export_ambiguity_report(issues: list[AuditIssue], path: str) -> None:
+def export_ambiguity_report(
+    issues: list[AuditIssue],
+    path: str,
+    index: DocumentIndex | None = None,
+) -> None:
     """
     Write a CSV file with columns: issue_type, severity, message, topic_id,
-    start_char, end_char. Optional fields are written as empty string when None.
+    start_char, end_char, line. line is the 1-based line of start_char, looked
+    up in the shared DocumentIndex. Optional fields are written as empty string
+    when None (line is empty without an index or a start_char).
     """
     columns = [
         "issue_type",
@@ -25,6 +32,7 @@ def export_ambiguity_report(issues: list[AuditIssue], path: str) -> None:
         "topic_id",
         "start_char",
         "end_char",
+        "line",
     ]
     with open(path, "w", encoding="utf-8", newline="") as f:
         w = csv.DictWriter(f, fieldnames=columns)
@@ -37,4 +45,9 @@ def export_ambiguity_report(issues: list[AuditIssue], path: str) -> None:
                 "topic_id": i.topic_id.raw if i.topic_id else "",
                 "start_char": i.start_char if i.start_char is not None else "",
                 "end_char": i.end_char if i.end_char is not None else "",
+                "line": (
+                    index.locate(i.start_char).line
+                    if index is not None and i.start_char is not None
+                    else ""
+                ),
             })
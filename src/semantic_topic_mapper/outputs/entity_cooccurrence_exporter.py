@@ -0,0 +1,35 @@
+"""
+Entity co-occurrence exporter: serialize entity associations to JSON.
+
+Maps internal EntityAssociation list to a weighted edge list (source, target,
+weight, pmi, jaccard), where weight is the number of shared topics. Thin
+serializer only; no LLM or inference.
+"""
+
+from __future__ import annotations
+
+import json
+
+from semantic_topic_mapper.entities.entity_models import EntityAssociation
+
+
+def export_entity_cooccurrence(
+    associations: list[EntityAssociation],
+    path: str,
+) -> None:
+    """
+    Write a JSON list of weighted, undirected edges: source, target (entity
+    IDs), weight (shared topic count), pmi, and jaccard. One object per pair.
+    """
+    data = [
+        {
+            "source": a.source_entity_id,
+            "target": a.target_entity_id,
+            "weight": a.cooccurrence,
+            "pmi": a.pmi,
+            "jaccard": a.jaccard,
+        }
+        for a in associations
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
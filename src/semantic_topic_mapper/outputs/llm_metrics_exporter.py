@@ -0,0 +1,28 @@
+"""
+LLM metrics exporter: serialize LLM call telemetry to JSON.
+
+Writes the aggregate from llm/telemetry.py (tokens, latency, retries, cache
+hits and estimated cost; totals, per stage, per document). Thin serializer
+only; no LLM or inference.
+"""
+
+from __future__ import annotations
+
+import json
+
+from semantic_topic_mapper.llm.telemetry import LLMTelemetry
+
+
+def export_llm_metrics(
+    telemetry: LLMTelemetry,
+    path: str,
+    cost_per_mtok_input: float = 0.0,
+    cost_per_mtok_output: float = 0.0,
+) -> None:
+    """
+    Write a JSON object with models, backends, pricing, totals, stages and
+    documents. Token counts exclude cache hits (nothing was billed).
+    """
+    data = telemetry.summary(cost_per_mtok_input, cost_per_mtok_output)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
@@ -2,7 +2,8 @@
 Topic map exporter: serialize topic hierarchy to JSON.
 
 Maps internal TopicNode dict to the assignment deliverable format (topic_id.raw
--> title, synthetic, children). Thin serializer only; no LLM or inference.
+-> title, synthetic, children, and summary when topic summaries were made).
+Thin serializer only; no LLM or inference.
 """
 
 from __future__ import annotations
@@ -12,10 +13,16 @@ import json
 from semantic_topic_mapper.models.topic_models import TopicNode
 
 
-def export_topic_map(nodes: dict[str, TopicNode], path: str) -> None:
+def export_topic_map(
+    nodes: dict[str, TopicNode],
+    path: str,
+    summaries: dict[str, str] | None = None,
+) -> None:
     """
     Write a JSON file mapping each topic_id.raw to title, synthetic flag,
     and list of child topic_id.raw strings. Block title is used when present.
+    With summaries (structure/llm_topic_summarizer.py), each topic also gets
+    "summary" (null for a topic without one).
     In v1, title is already clean (e.g. "Annual Renewal"); if segmentation
     ever includes full header text, keep title normalized here.
     """
@@ -28,5 +35,7 @@ def export_topic_map(nodes: dict[str, TopicNode], path: str) -> None:
             "synthetic": node.synthetic,
             "children": children,
         }
+        if summaries is not None:
+            out[raw]["summary"] = summaries.get(raw)
     with open(path, "w", encoding="utf-8") as f:
         json.dump(out, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,36 @@
+"""
+Topic risk exporter: serialize ranked topic risk scores to CSV.
+
+One row per topic, highest risk first (rank, topic_id, title, score, then
+the raw signals behind the score). Thin serializer only; scoring lives in
+audit/risk_scorer.py.
+"""
+
+from __future__ import annotations
+
+import csv
+
+from semantic_topic_mapper.audit.risk_scorer import RISK_FEATURES, TopicRisk
+
+
+def export_topic_risk(rows: list[TopicRisk], path: str) -> None:
+    """
+    Write a CSV file with columns: rank, topic_id, title, score, in_degree,
+    broken_refs, undefined_entity_density, ambiguity_issues, text_length.
+    title is empty for synthetic topics; counts are written as integers.
+    """
+    columns = ["rank", "topic_id", "title", "score", *RISK_FEATURES]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=columns)
+        w.writeheader()
+        for r in rows:
+            row: dict[str, object] = {
+                "rank": r.rank,
+                "topic_id": r.topic_id,
+                "title": r.title or "",
+                "score": f"{r.score:.6f}",
+            }
+            for name in RISK_FEATURES:
+                value = r.features[name]
+                row[name] = round(value, 4) if name == "undefined_entity_density" else int(value)
+            w.writerow(row)
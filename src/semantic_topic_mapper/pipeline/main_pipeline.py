@@ -10,30 +10,55 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
-from semantic_topic_mapper.audit.ambiguity_detector import run_audit
-from semantic_topic_mapper.config import skip_llm
+from semantic_topic_mapper.audit.ambiguity_detector import audit_document
+from semantic_topic_mapper.audit.risk_scorer import parse_risk_weights, rank_topic_risk
+from semantic_topic_mapper.config import (
+    AUDIT_WORKERS,
+    COOCCURRENCE_MIN_COUNT,
+    ENTITY_STOPLIST_PATH,
+    LLM_COMBINED_ENRICHMENT,
+    LLM_COST_PER_MTOK_INPUT,
+    LLM_COST_PER_MTOK_OUTPUT,
+    LLM_IMPLICIT_REFERENCES,
+    LLM_TOPIC_SUMMARIES,
+    RISK_WEIGHTS,
+    skip_llm,
+)
 from semantic_topic_mapper.entities.definition_linker import link_entity_definitions
 from semantic_topic_mapper.entities.deterministic_entity_detector import detect_entities
+from semantic_topic_mapper.entities.entity_graph_builder import compute_entity_cooccurrence
 from semantic_topic_mapper.entities.entity_relationship_extractor import (
     extract_entity_relationships,
 )
+from semantic_topic_mapper.entities.entity_stoplist import load_stoplist
 from semantic_topic_mapper.entities.llm_entity_enricher import (
-    detect_entity_ambiguities,
-    enrich_entity_types,
-    extract_llm_entity_relationships,
+    plan_enrichment_units,
+    run_entity_enrichment,
 )
+from semantic_topic_mapper.entities.type_knowledge_base import document_id
+from semantic_topic_mapper.ingestion.document_index import build_document_index
 from semantic_topic_mapper.ingestion.loader import load_text_file
+from semantic_topic_mapper.llm.cache import get_response_cache
+from semantic_topic_mapper.llm.telemetry import get_llm_telemetry
 from semantic_topic_mapper.outputs.ambiguity_report_exporter import export_ambiguity_report
 from semantic_topic_mapper.outputs.entity_catalogue_exporter import export_entity_catalogue
+from semantic_topic_mapper.outputs.entity_cooccurrence_exporter import (
+    export_entity_cooccurrence,
+)
 from semantic_topic_mapper.outputs.entity_relationship_exporter import (
     export_entity_relationships,
 )
+from semantic_topic_mapper.outputs.llm_metrics_exporter import export_llm_metrics
 from semantic_topic_mapper.outputs.reference_graph_exporter import export_reference_graph
 from semantic_topic_mapper.outputs.topic_map_exporter import export_topic_map
+from semantic_topic_mapper.outputs.topic_risk_exporter import export_topic_risk
+from semantic_topic_mapper.references.llm_reference_enricher import enrich_implicit_references
 from semantic_topic_mapper.references.reference_detector import detect_references
 from semantic_topic_mapper.references.reference_graph_builder import build_reference_graph
+from semantic_topic_mapper.structure.duplicate_detector import find_duplicate_blocks
 from semantic_topic_mapper.structure.header_detector import detect_headers
 from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.llm_topic_summarizer import summarize_topics
 from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
 
 
@@ -43,62 +68,157 @@ def run_pipeline(input_path: str, output_dir: str) -> None:
     build hierarchy and reference graph, extract entities, run audit, and
     write all deliverables to output_dir. This is the top-level orchestrator.
     """
+    # Validate settings that are only used late, before any (paid) LLM call
+    risk_weights = parse_risk_weights(RISK_WEIGHTS)
     # So LLM debug (when LLM_DEBUG=true) writes to this run's output dir
     os.environ["LLM_DEBUG_OUTPUT_DIR"] = output_dir
+    use_llm = not skip_llm()
+    document = Path(input_path).name
+    telemetry = get_llm_telemetry()
+    # llm_metrics.json covers this run only
+    telemetry.reset()
+    telemetry.begin_document(document)
     print("[Pipeline] Loading text...")
     text = load_text_file(input_path)
 
+    print("[Pipeline] Indexing line and sentence boundaries...")
+    index = build_document_index(text)
+
     print("[Pipeline] Detecting headers...")
-    headers = detect_headers(text)
+    headers = detect_headers(text, index)
 
     print("[Pipeline] Segmenting into topic blocks...")
     blocks = segment_into_topic_blocks(text, headers)
 
+    print("[Pipeline] Detecting duplicate blocks...")
+    duplicates = find_duplicate_blocks(blocks)
+    print(
+        f"[Pipeline] Duplicate blocks: {len(duplicates)} repeat(s), "
+        f"{sum(1 for d in duplicates if d.exact)} verbatim"
+    )
+
     print("[Pipeline] Building topic hierarchy...")
     nodes = build_topic_hierarchy(blocks)
 
+    summaries: dict[str, str] | None = None
+    if LLM_TOPIC_SUMMARIES and use_llm:
+        print("[Pipeline] LLM topic summaries (bottom-up)...")
+        summary_run = summarize_topics(nodes, duplicates)
+        summaries = summary_run.summaries
+        print(
+            f"[Pipeline] Topic summaries: {len(summaries)} of {len(nodes)} topics, "
+            f"{summary_run.cached} from cache, {summary_run.reused} from repeated topics, "
+            f"{summary_run.requests} request(s)"
+        )
+
     print("[Pipeline] Detecting references...")
     references = detect_references(blocks)
 
+    if LLM_IMPLICIT_REFERENCES and use_llm:
+        print("[Pipeline] LLM implicit references...")
+        implicit = enrich_implicit_references(blocks, text, index, duplicates)
+        references.extend(implicit.references)
+        print(
+            f"[Pipeline] Implicit references: {implicit.candidates} candidate sentence(s), "
+            f"{implicit.requests} request(s), {len(implicit.references)} linked "
+            f"({implicit.reused} copied from repeated blocks)"
+        )
+
     print("[Pipeline] Building reference graph and reference issues...")
     graph, reference_issues = build_reference_graph(nodes, references)
 
     print("[Pipeline] Detecting entities...")
-    entities = detect_entities(blocks)
+    stoplist = load_stoplist(ENTITY_STOPLIST_PATH) if ENTITY_STOPLIST_PATH else None
+    entities = detect_entities(blocks, stoplist=stoplist)
 
     print("[Pipeline] Linking entity definitions...")
-    link_entity_definitions(entities, blocks)
+    definitions = link_entity_definitions(entities, blocks, index)
 
     print("[Pipeline] Extracting entity relationships...")
-    relationships = extract_entity_relationships(entities, blocks)
+    relationships = extract_entity_relationships(entities, blocks, index)
+
+    print("[Pipeline] Scoring entity co-occurrence...")
+    associations = compute_entity_cooccurrence(entities, COOCCURRENCE_MIN_COUNT)
 
-    if not skip_llm():
+    if use_llm:
         print("[Pipeline] LLM enrichment (entity types, relationships, ambiguities)...")
-        enrich_entity_types(entities, text)
-        llm_relationships = extract_llm_entity_relationships(entities, text)
+        plan = plan_enrichment_units(entities, text, blocks)
+        print(
+            f"[Pipeline] LLM plan: {plan.mode}{' (combined)' if LLM_COMBINED_ENRICHMENT else ''}, "
+            f"{len(plan.units)} unit(s), {plan.request_count(LLM_COMBINED_ENRICHMENT)} request(s); "
+            f"~{plan.prompt_tokens} context tokens per task (prefix prompts: ~{plan.prefix_tokens}, "
+            f"saved {plan.tokens_saved})"
+        )
+        if plan.known_types:
+            print(
+                f"[Pipeline] Entity type knowledge base: {len(plan.known_types)} of "
+                f"{len(entities)} types known, {len(entities) - len(plan.known_types)} sent to the LLM"
+            )
+        llm_relationships, llm_issues = run_entity_enrichment(
+            entities, text, plan=plan, document=document_id(document, text)
+        )
         relationships.extend(llm_relationships)
-        llm_issues = detect_entity_ambiguities(entities, text)
+        if any(i.issue_type == "llm_enrichment_skipped" for i in llm_issues):
+            print("[Pipeline] LLM circuit breaker open: enrichment skipped, deterministic output only.")
+        cache = get_response_cache()
+        if cache is not None:
+            print(
+                f"[Pipeline] LLM response cache: {cache.stats.hits} hits, "
+                f"{cache.stats.misses} misses"
+            )
+        summary = telemetry.summary(LLM_COST_PER_MTOK_INPUT, LLM_COST_PER_MTOK_OUTPUT)
+        usage = summary["documents"].get(document, {}).get("totals") or summary["totals"]
+        print(
+            f"[Pipeline] LLM usage: {usage['calls']} call(s), {usage['prompt_tokens']} prompt + "
+            f"{usage['response_tokens']} response tokens, {usage['retries']} retries, "
+            f"{usage['failed']} failed, ~${usage['cost_usd']:.4f}"
+        )
     else:
         llm_issues = []
 
     print("[Pipeline] Running audit...")
-    issues = run_audit(nodes, reference_issues, entities)
+    audit = audit_document(
+        nodes, reference_issues, entities, references, blocks, text, workers=AUDIT_WORKERS,
+        duplicates=duplicates, definitions=definitions,
+    )
+    issues = audit.issues
+    slowest = max(audit.rule_seconds.items(), key=lambda kv: kv[1], default=None)
+    print(
+        f"[Pipeline] Audit: {len(audit.rule_seconds)} rule(s), {len(issues)} issue(s) in "
+        f"{audit.total_seconds * 1000:.1f} ms"
+        + (f" (slowest: {slowest[0]} {slowest[1] * 1000:.1f} ms)" if slowest else "")
+    )
     issues.extend(llm_issues)
 
+    print("[Pipeline] Scoring topic risk...")
+    risk = rank_topic_risk(nodes, references, reference_issues, entities, issues, risk_weights)
+    if risk:
+        top = risk[0]
+        print(f"[Pipeline] Topic risk: {len(risk)} topic(s); highest {top.topic_id} ({top.score:.3f})")
+
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
     print(f"[Pipeline] Writing deliverables to {out}...")
 
-    export_topic_map(nodes, str(out / "topic_map.json"))
+    export_topic_map(nodes, str(out / "topic_map.json"), summaries)
     print("  - topic_map.json")
     export_entity_catalogue(entities, str(out / "entity_catalogue.csv"))
     print("  - entity_catalogue.csv")
     export_entity_relationships(relationships, str(out / "entity_relationships.json"))
     print("  - entity_relationships.json")
-    export_ambiguity_report(issues, str(out / "ambiguity_report.csv"))
+    export_entity_cooccurrence(associations, str(out / "entity_cooccurrence.json"))
+    print("  - entity_cooccurrence.json")
+    export_ambiguity_report(issues, str(out / "ambiguity_report.csv"), index)
     print("  - ambiguity_report.csv")
+    export_topic_risk(risk, str(out / "topic_risk.csv"))
+    print("  - topic_risk.csv")
     export_reference_graph(graph, str(out / "cross_reference_graph.pdf"))
     print("  - cross_reference_graph.pdf")
+    if use_llm:
+        export_llm_metrics(
+            telemetry, str(out / "llm_metrics.json"), LLM_COST_PER_MTOK_INPUT, LLM_COST_PER_MTOK_OUTPUT
+        )
+        print("  - llm_metrics.json")
 
     print("[Pipeline] Done.")
 
@@ -1 +1,380 @@
-# LLM-based interpretation of implicit references.
+"""
+LLM-based interpretation of implicit references.
+
+Implicit references ("the registration requirements above", "as described in
+the renewal section") name no topic ID, so the deterministic detector cannot
+link them. Sending every block to the model is too slow, so this runs in two
+stages:
+
+1. Candidate selection (deterministic): sentences containing a cue phrase
+   (CUE_PHRASES: "above", "as described in", "pursuant to", ...) whose words
+   overlap the title of some other topic, scored against an inverted index
+   of topic-title terms weighted by rarity. Each candidate keeps a shortlist
+   of the best-matching target topics. Sentences with an explicit
+   "Topic N" reference are left to the deterministic detector.
+2. LLM linking: candidates are batched (LLM_REFERENCE_BATCH_SIZE per request,
+   bounded by LLM_CHUNK_TOKENS) with the titles of their shortlisted topics,
+   and the batches are sent concurrently. The model may only choose a target
+   from a candidate's own shortlist.
+
+Responses go through the shared LLM client, so they are cached, rate limited
+and retried like entity enrichment. Links become TopicReferences with
+relation_type="implicit" spanning the candidate sentence. Blocks that repeat
+an earlier block verbatim (structure/duplicate_detector.py) are not sent;
+the first occurrence's links are copied with shifted offsets.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any
+
+from semantic_topic_mapper.ingestion.document_index import DocumentIndex
+from semantic_topic_mapper.llm.rate_limiter import estimate_tokens
+from semantic_topic_mapper.llm.telemetry import llm_stage
+from semantic_topic_mapper.llm.validator import StreamingItemParser, iter_response_items
+from semantic_topic_mapper.models.reference_models import TopicReference
+from semantic_topic_mapper.models.topic_models import TopicBlock, TopicID
+from semantic_topic_mapper.structure.duplicate_detector import DuplicateBlock, exact_repeats
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt's expected JSON response shape changes (invalidates cached responses).
+RESPONSE_SCHEMA_VERSION = "1"
+
+# Phrases that point at another part of the document without naming it by ID.
+CUE_PHRASES = (
+    r"above",
+    r"below",
+    r"aforementioned",
+    r"aforesaid",
+    r"foregoing",
+    r"preceding",
+    r"previous(?:ly)?",
+    r"earlier",
+    r"herein(?:after|above|below)?",
+    r"(?:as|where) (?:described|defined|set out|set forth|specified|provided|outlined|stated|required|noted) (?:in|under|by)",
+    r"referred to in",
+    r"in accordance with",
+    r"pursuant to",
+    r"subject to",
+    r"under the",
+    r"(?:this|that|the) (?:section|part|chapter|provision)",
+)
+_CUE = re.compile(r"\b(?:" + "|".join(CUE_PHRASES) + r")\b", re.IGNORECASE)
+_EXPLICIT_TOPIC = re.compile(r"\btopic\s+\d", re.IGNORECASE)
+_WORD = re.compile(r"[A-Za-z][A-Za-z\-]+")
+
+# Words that carry no topic identity in titles or sentences.
+_STOPWORDS = frozenset(
+    "and the for with from into upon under over than that this these those such other "
+    "any all each per its their are was were been being have has had not but nor yet "
+    "shall must may will can should would general provisions requirements requirement "
+    "section topic part".split()
+)
+
+# A term shared by more than this share of titles (and more than _MIN_TERM_DF
+# titles) is too common to suggest a target.
+_MAX_TERM_SHARE = 0.1
+_MIN_TERM_DF = 3
+
+
+@dataclass
+class TitleIndex:
+    """Inverted index from normalized title terms to topic IDs, with term weights."""
+
+    topics: dict[str, TopicID]
+    titles: dict[str, str]
+    postings: dict[str, list[str]]
+    weights: dict[str, float]
+
+
+@dataclass
+class ImplicitCandidate:
+    """A sentence that may refer to another topic, with its shortlist of targets."""
+
+    source: TopicBlock
+    start_char: int
+    end_char: int
+    text: str
+    cue: str
+    targets: list[str]
+
+
+def title_terms(text: str) -> set[str]:
+    """Lower-cased content words with a plural "s" removed (a light stemmer)."""
+    terms = set()
+    for word in _WORD.findall(text):
+        word = word.lower()
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        if len(word) >= 3 and word not in _STOPWORDS:
+            terms.add(word)
+    return terms
+
+
+def build_title_index(blocks: list[TopicBlock]) -> TitleIndex:
+    """Index the title terms of every titled block; rare terms get higher weight (IDF)."""
+    topics: dict[str, TopicID] = {}
+    titles: dict[str, str] = {}
+    postings: dict[str, list[str]] = {}
+    for block in blocks:
+        if block.topic_id is None or not block.title or block.topic_id.raw in topics:
+            continue
+        raw = block.topic_id.raw
+        topics[raw] = block.topic_id
+        titles[raw] = block.title.strip()
+        for term in title_terms(block.title):
+            postings.setdefault(term, []).append(raw)
+    n = max(1, len(titles))
+    max_df = max(_MIN_TERM_DF, int(n * _MAX_TERM_SHARE))
+    weights = {
+        term: math.log(1 + n / len(ids))
+        for term, ids in postings.items()
+        if len(ids) <= max_df
+    }
+    return TitleIndex(topics, titles, postings, weights)
+
+
+def select_candidates(
+    blocks: list[TopicBlock],
+    text: str,
+    index: DocumentIndex,
+    titles: TitleIndex,
+    max_targets: int = 8,
+) -> list[ImplicitCandidate]:
+    """
+    Sentences (in document order) that contain a cue phrase, no explicit
+    topic reference, and at least one distinctive title term of another topic.
+    Targets are ranked by summed term weight, ties in document order.
+    """
+    order = {raw: i for i, raw in enumerate(titles.topics)}
+    candidates: list[ImplicitCandidate] = []
+    for block in blocks:
+        if block.topic_id is None:
+            continue
+        newline = block.raw_text.find("\n")
+        body_start = block.start_char + (newline + 1 if newline >= 0 else len(block.raw_text))
+        body_end = block.start_char + len(block.raw_text)
+        seen: set[int] = set()
+        for cue in _CUE.finditer(text, body_start, body_end):
+            sentence = index.sentence_of(cue.start())
+            if sentence in seen:
+                continue
+            seen.add(sentence)
+            start, end = index.sentence_span(sentence)
+            start, end = max(start, body_start), min(end, body_end)
+            sentence_text = text[start:end].strip()
+            if not sentence_text or _EXPLICIT_TOPIC.search(sentence_text):
+                continue
+            scores: dict[str, float] = {}
+            for term in title_terms(sentence_text):
+                weight = titles.weights.get(term)
+                if weight is None:
+                    continue
+                for raw in titles.postings[term]:
+                    if raw != block.topic_id.raw:
+                        scores[raw] = scores.get(raw, 0.0) + weight
+            if not scores:
+                continue
+            ranked = sorted(scores, key=lambda raw: (-scores[raw], order[raw]))[: max(1, max_targets)]
+            candidates.append(
+                ImplicitCandidate(block, start, end, sentence_text, cue.group(0), ranked)
+            )
+    return candidates
+
+
+def batch_candidates(
+    candidates: list[ImplicitCandidate],
+    titles: TitleIndex,
+    batch_size: int = 20,
+    max_tokens: int = 3000,
+) -> list[list[ImplicitCandidate]]:
+    """Consecutive batches of at most batch_size candidates and ~max_tokens of prompt text."""
+    batches: list[list[ImplicitCandidate]] = []
+    batch: list[ImplicitCandidate] = []
+    batch_titles: set[str] = set()
+    size = 0
+    for cand in candidates:
+        new_titles = [raw for raw in cand.targets if raw not in batch_titles]
+        cost = estimate_tokens(cand.text) + sum(estimate_tokens(titles.titles[r]) + 2 for r in new_titles) + 10
+        if batch and (len(batch) >= max(1, batch_size) or size + cost > max_tokens):
+            batches.append(batch)
+            batch, batch_titles, size = [], set(), 0
+            cost = estimate_tokens(cand.text) + sum(estimate_tokens(titles.titles[r]) + 2 for r in cand.targets) + 10
+        batch.append(cand)
+        batch_titles.update(cand.targets)
+        size += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def build_reference_prompt(batch: list[ImplicitCandidate], titles: TitleIndex) -> str:
+    """Prompt for one batch: shortlisted section titles, then numbered passages."""
+    section_ids: list[str] = []
+    for cand in batch:
+        section_ids.extend(raw for raw in cand.targets if raw not in section_ids)
+    sections = "\n".join(f"{raw}: {titles.titles[raw]}" for raw in section_ids)
+    passages = "\n".join(
+        f"C{i + 1} (in section {cand.source.topic_id.raw}; candidates: {', '.join(cand.targets)}): "
+        f"{json.dumps(cand.text, ensure_ascii=False)}"
+        for i, cand in enumerate(batch)
+    )
+    return f"""You are a document analyst. Each numbered passage below may refer implicitly to another section of the same document (for example "the registration requirements above"). For each passage, decide which of its candidate sections it refers to, if any.
+
+Sections (id: title):
+{sections}
+
+Passages:
+{passages}
+
+Respond with ONLY a single JSON object, no other text:
+{{"references": [{{"candidate": "<passage id, e.g. C1>", "target": "<section id from that passage's candidates>"}}]}}
+
+Only include a passage if it clearly refers to one of its own candidate sections; a passage may refer to more than one. Leave "references" empty if none do."""
+
+
+def _stream_llm_text(prompt: str, description: str) -> Iterable[str]:
+    """Response text pieces for a prompt (temperature 0), as they arrive."""
+    from semantic_topic_mapper.llm.client import stream_content_text
+
+    return stream_content_text(
+        prompt,
+        temperature=0.0,
+        debug_label=description,
+        schema_version=RESPONSE_SCHEMA_VERSION,
+    )
+
+
+def _llm_items(prompt: str, description: str) -> Iterator[Any]:
+    """Schema-valid "references" items as the response streams in; failures are logged."""
+    parser = StreamingItemParser(("references",))
+    try:
+        with llm_stage("implicit_references"):
+            for _, item in iter_response_items(_stream_llm_text(prompt, description), ("references",), parser):
+                yield item
+    except ValueError as e:
+        logger.warning("LLM %s: config/API key issue: %s", description, e)
+        return
+    except Exception as e:
+        logger.warning("LLM %s: %s", description, e)
+        return
+    if not parser.saw_object:
+        logger.warning("LLM %s: empty response or no JSON object", description)
+
+
+def link_batch(batch: list[ImplicitCandidate], titles: TitleIndex, label: str = "") -> list[TopicReference]:
+    """Ask the LLM to link one batch; keep only targets from each candidate's shortlist."""
+    description = f"implicit reference linking {label}".strip()
+    refs: list[TopicReference] = []
+    seen: set[tuple[int, str]] = set()
+    for item in _llm_items(build_reference_prompt(batch, titles), description):
+        number = item.candidate.strip().upper().lstrip("C")
+        if not number.isdigit() or not 1 <= int(number) <= len(batch):
+            continue
+        position = int(number) - 1
+        cand = batch[position]
+        target = item.target.strip()
+        if target not in cand.targets or (position, target) in seen:
+            continue
+        seen.add((position, target))
+        refs.append(_implicit_reference(cand, titles.topics[target]))
+    return refs
+
+
+def _implicit_reference(cand: ImplicitCandidate, target: TopicID) -> TopicReference:
+    region_type, region_label = "paragraph", None
+    for sub in cand.source.subclauses:
+        if sub.start_char <= cand.start_char < sub.end_char:
+            region_type, region_label = "subclause", sub.label
+            break
+    return TopicReference(
+        source_topic_id=cand.source.topic_id,
+        target_topic_id=target,
+        relation_type="implicit",
+        start_char=cand.start_char,
+        end_char=cand.end_char,
+        source_region_type=region_type,
+        source_region_label=region_label,
+    )
+
+
+@dataclass
+class ImplicitReferenceRun:
+    """Outcome of one enrichment run (for pipeline reporting)."""
+
+    references: list[TopicReference]
+    candidates: int
+    requests: int
+    reused: int = 0
+
+
+def enrich_implicit_references(
+    blocks: list[TopicBlock],
+    text: str,
+    index: DocumentIndex,
+    duplicates: list[DuplicateBlock] | None = None,
+) -> ImplicitReferenceRun:
+    """
+    Select candidate sentences, link them with concurrent batched LLM calls,
+    and return implicit TopicReferences in candidate (document) order.
+    Candidates in verbatim repeats (duplicates) take the links of the same
+    sentence in the first occurrence instead of being sent.
+    Settings: LLM_REFERENCE_BATCH_SIZE, LLM_REFERENCE_TARGETS, LLM_CHUNK_TOKENS,
+    LLM_MAX_CONCURRENCY.
+    """
+    from semantic_topic_mapper.config import (
+        LLM_CHUNK_TOKENS,
+        LLM_MAX_CONCURRENCY,
+        LLM_REFERENCE_BATCH_SIZE,
+        LLM_REFERENCE_TARGETS,
+    )
+
+    titles = build_title_index(blocks)
+    candidates = select_candidates(blocks, text, index, titles, LLM_REFERENCE_TARGETS)
+    repeats = exact_repeats(duplicates)
+    pending = [c for c in candidates if c.source.topic_id.raw not in repeats]
+    batches = batch_candidates(pending, titles, LLM_REFERENCE_BATCH_SIZE, LLM_CHUNK_TOKENS)
+    results: list[list[TopicReference]] = []
+    if batches:
+        labels = [f"batch {i + 1}/{len(batches)}" for i in range(len(batches))]
+        with ThreadPoolExecutor(max_workers=max(1, min(len(batches), LLM_MAX_CONCURRENCY))) as pool:
+            results = list(pool.map(lambda args: link_batch(args[0], titles, args[1]), zip(batches, labels)))
+    linked = [ref for refs in results for ref in refs]
+    copied = _copy_repeat_links(linked, candidates, repeats)
+    refs = sorted(linked + copied, key=lambda r: r.start_char)
+    return ImplicitReferenceRun(refs, len(candidates), len(batches), len(copied))
+
+
+def _copy_repeat_links(
+    linked: list[TopicReference],
+    candidates: list[ImplicitCandidate],
+    repeats: dict[str, DuplicateBlock],
+) -> list[TopicReference]:
+    """Links for candidates in verbatim repeats, copied from the same sentence of the first occurrence."""
+    by_span: dict[tuple[str, int], list[TopicReference]] = {}
+    for ref in linked:
+        by_span.setdefault((ref.source_topic_id.raw, ref.start_char), []).append(ref)
+    copied: list[TopicReference] = []
+    for cand in candidates:
+        dup = repeats.get(cand.source.topic_id.raw)
+        if dup is None:
+            continue
+        for ref in by_span.get((dup.canonical_topic_id.raw, cand.start_char - dup.offset_delta), ()):
+            if ref.target_topic_id.raw != dup.topic_id.raw and ref.target_topic_id.raw in cand.targets:
+                copied.append(
+                    replace(
+                        ref,
+                        source_topic_id=dup.topic_id,
+                        start_char=ref.start_char + dup.offset_delta,
+                        end_char=ref.end_char + dup.offset_delta,
+                    )
+                )
+    return copied
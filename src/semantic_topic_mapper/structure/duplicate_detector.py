@@ -0,0 +1,194 @@
+"""
+Near-duplicate topic blocks (repeated clauses and boilerplate).
+
+Runs after segmentation. Each block body (the text after its header line)
+is reduced to a set of word shingles (DUPLICATE_SHINGLE_WORDS consecutive
+lowercased words), hashed with a rolling polynomial hash over per-word CRC32
+values so each shingle costs O(1). A MinHash signature (_NUM_PERM universal
+hash functions, min over the shingles) estimates the Jaccard similarity of
+two blocks as the share of equal signature slots.
+
+Candidate pairs come from locality-sensitive hashing: signatures are cut into
+_BANDS bands and blocks sharing any band land in the same bucket. Each
+bucket member is compared with the bucket's first member only, so a clause
+repeated n times costs n comparisons, not n^2, and the whole pass is near
+linear in document size. A block is reported as a DuplicateBlock of the
+earliest of those candidates it matches at or above DUPLICATE_THRESHOLD,
+with that pair's similarity; matches are not chained, so when A~B and B~C
+but A and C differ more, C is reported against B, not A.
+
+Verbatim repeats are found first, by looking the body up in a dict of the
+bodies seen so far: a block whose body is character-for-character identical
+to an earlier one is reported against its first occurrence and flagged
+exact, even when an earlier near match exists. Stages that work on block
+bodies can then reuse the canonical results shifted by offset_delta instead
+of recomputing them (LLM topic summaries, implicit reference linking).
+Bodies shorter than DUPLICATE_MIN_WORDS words are ignored (headings,
+one-line stubs).
+
+Uses NumPy for the signatures when available; the pure-Python path gives the
+same signatures. Deterministic; does not use LLMs.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from semantic_topic_mapper.models.topic_models import TopicBlock, TopicID
+
+try:
+    import numpy as np
+except ImportError:  # optional; pure-Python fallback below
+    np = None
+
+
+_NUM_PERM = 64
+_BANDS = 16  # 4 rows per band: pairs near Jaccard 0.5 and above become candidates
+_PRIME = (1 << 31) - 1  # hash values and coefficients stay below 2**31, so a*x + b fits in 64 bits
+_ROLL_BASE = 1_000_003
+
+_WORD = re.compile(r"\w+")
+
+# Fixed seed: signatures (and therefore results) are identical across runs.
+_rng = random.Random(0x5EED)
+_PERM_A = [_rng.randrange(1, _PRIME) for _ in range(_NUM_PERM)]
+_PERM_B = [_rng.randrange(0, _PRIME) for _ in range(_NUM_PERM)]
+
+
+@dataclass
+class DuplicateBlock:
+    """
+    A block that repeats an earlier one.
+
+    - topic_id: the repeat; canonical_topic_id: its first occurrence
+    - similarity: estimated Jaccard similarity of the shingle sets (1.0 when exact)
+    - exact: bodies are identical, so body results can be reused
+    - offset_delta: repeat body start minus canonical body start (add to canonical offsets)
+    - start_char / end_char: the repeat's body span
+    """
+
+    topic_id: TopicID
+    canonical_topic_id: TopicID
+    similarity: float
+    exact: bool
+    offset_delta: int
+    start_char: int
+    end_char: int
+
+
+def block_body(block: TopicBlock) -> tuple[int, str]:
+    """(start offset, text) of the block without its header line."""
+    newline = block.raw_text.find("\n")
+    skip = newline + 1 if newline >= 0 else len(block.raw_text)
+    return block.start_char + skip, block.raw_text[skip:]
+
+
+def shingle_hashes(text: str, shingle_words: int = 5) -> set[int]:
+    """Rolling hashes (mod 2**31 - 1) of every run of shingle_words consecutive lowercased words."""
+    return _word_shingles(_WORD.findall(text.lower()), shingle_words)
+
+
+def _word_shingles(tokens: list[str], shingle_words: int) -> set[int]:
+    """shingle_hashes() for an already tokenized, lowercased text."""
+    words = [zlib.crc32(w.encode("utf-8")) for w in tokens]
+    k = max(1, shingle_words)
+    if len(words) < k:
+        return {_roll(words)} if words else set()
+    drop = pow(_ROLL_BASE, k - 1, _PRIME)
+    h = _roll(words[:k])
+    hashes = {h}
+    for i in range(k, len(words)):
+        h = ((h - words[i - k] * drop) * _ROLL_BASE + words[i]) % _PRIME
+        hashes.add(h)
+    return hashes
+
+
+def _roll(words: Sequence[int]) -> int:
+    h = 0
+    for w in words:
+        h = (h * _ROLL_BASE + w) % _PRIME
+    return h
+
+
+def minhash_signature(hashes: set[int]) -> tuple[int, ...]:
+    """_NUM_PERM minima of (a * x + b) mod 2**31 - 1 over the shingle hashes."""
+    if np is not None:
+        x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        a = np.asarray(_PERM_A, dtype=np.uint64)[:, None]
+        b = np.asarray(_PERM_B, dtype=np.uint64)[:, None]
+        return tuple(((a * x + b) % _PRIME).min(axis=1).tolist())
+    return tuple(min((a * x + b) % _PRIME for x in hashes) for a, b in zip(_PERM_A, _PERM_B))
+
+
+def _similarity(left: tuple[int, ...], right: tuple[int, ...]) -> float:
+    return sum(1 for x, y in zip(left, right) if x == y) / _NUM_PERM
+
+
+def find_duplicate_blocks(
+    blocks: list[TopicBlock],
+    shingle_words: int | None = None,
+    threshold: float | None = None,
+    min_words: int | None = None,
+) -> list[DuplicateBlock]:
+    """
+    Repeats of earlier blocks, in document order (see module docstring).
+    Defaults: DUPLICATE_SHINGLE_WORDS, DUPLICATE_THRESHOLD, DUPLICATE_MIN_WORDS.
+    """
+    if shingle_words is None or threshold is None or min_words is None:
+        from semantic_topic_mapper.config import (
+            DUPLICATE_MIN_WORDS,
+            DUPLICATE_SHINGLE_WORDS,
+            DUPLICATE_THRESHOLD,
+        )
+
+        shingle_words = DUPLICATE_SHINGLE_WORDS if shingle_words is None else shingle_words
+        threshold = DUPLICATE_THRESHOLD if threshold is None else threshold
+        min_words = DUPLICATE_MIN_WORDS if min_words is None else min_words
+
+    ordered = sorted((b for b in blocks if b.topic_id is not None), key=lambda b: b.start_char)
+    bodies = [block_body(b) for b in ordered]
+    signatures: dict[int, tuple[int, ...]] = {}
+    for i, (_, body) in enumerate(bodies):
+        words = _WORD.findall(body.lower())
+        if len(words) >= max(1, min_words):
+            signatures[i] = minhash_signature(_word_shingles(words, shingle_words))
+
+    rows = _NUM_PERM // _BANDS
+    buckets: dict[tuple[int, tuple[int, ...]], int] = {}
+    first_with_body: dict[str, int] = {}
+    duplicates: list[DuplicateBlock] = []
+
+    for i, sig in signatures.items():
+        candidates = set()
+        for band in range(_BANDS):
+            first = buckets.setdefault((band, sig[band * rows : (band + 1) * rows]), i)
+            if first != i:
+                candidates.add(first)
+        start, body = bodies[i]
+        canonical = first_with_body.setdefault(body, i)
+        exact = canonical != i
+        if not exact:
+            canonical = next((j for j in sorted(candidates) if _similarity(signatures[j], sig) >= threshold), None)
+            if canonical is None:
+                continue
+        duplicates.append(
+            DuplicateBlock(
+                topic_id=ordered[i].topic_id,
+                canonical_topic_id=ordered[canonical].topic_id,
+                similarity=1.0 if exact else _similarity(signatures[canonical], sig),
+                exact=exact,
+                offset_delta=start - bodies[canonical][0],
+                start_char=start,
+                end_char=start + len(body),
+            )
+        )
+    return duplicates
+
+
+def exact_repeats(duplicates: list[DuplicateBlock] | None) -> dict[str, DuplicateBlock]:
+    """topic_id.raw -> DuplicateBlock for the repeats whose body results can be reused."""
+    return {d.topic_id.raw: d for d in duplicates or () if d.exact}
@@ -9,7 +9,9 @@ Later stages (e.g. block extraction, hierarchy_builder) will segment text and as
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Iterator
 
+from semantic_topic_mapper.ingestion.document_index import DocumentIndex
 from semantic_topic_mapper.models.topic_models import TopicID
 from semantic_topic_mapper.structure.topic_id_parser import parse_topic_id
 
@@ -31,11 +33,14 @@ class HeaderCandidate:
     line_text: str
 
 
-def detect_headers(text: str) -> list[HeaderCandidate]:
+def detect_headers(text: str, index: DocumentIndex | None = None) -> list[HeaderCandidate]:
     """
     Detect lines that start new topics. Returns only lines that confidently
     match known header patterns. Does not build hierarchy or modify text.
 
+    When the shared DocumentIndex is given, lines are sliced from its
+    precomputed line starts instead of re-splitting the document.
+
     Supported patterns:
     - A: "TOPIC X: TITLE" (case-insensitive TOPIC, valid ID, then : and optional title)
     - B: "2.1 Initial Registration" (line starts with valid topic ID, then whitespace and title).
@@ -51,12 +56,8 @@ def detect_headers(text: str) -> list[HeaderCandidate]:
         return []
 
     results: list[HeaderCandidate] = []
-    pos = 0
-    lines = text.splitlines(keepends=True)
 
-    for line in lines:
-        start_char = pos
-        pos += len(line)
+    for start_char, line in _iter_lines(text, index):
         stripped = line.strip()
 
         if not stripped:
@@ -101,6 +102,19 @@ def detect_headers(text: str) -> list[HeaderCandidate]:
     return results
 
 
+def _iter_lines(text: str, index: DocumentIndex | None) -> Iterator[tuple[int, str]]:
+    """Yield (start_char, line including terminator) for each line of text."""
+    if index is not None:
+        for line in range(index.line_count):
+            start, end = index.line_span(line)
+            yield start, text[start:end]
+        return
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        yield pos, line
+        pos += len(line)
+
+
 def _title_looks_like_header(title_part: str) -> bool:
     """
     Conservative heuristic: reject titles that look like full sentences.
@@ -56,7 +56,7 @@ def build_topic_hierarchy(blocks: list[TopicBlock]) -> dict[str, TopicNode]:
 
     # 3. Sort children_ids for every node (numeric-aware)
     for node in nodes.values():
-        node.children_ids.sort(key=_topic_sort_key)
+        node.children_ids.sort(key=topic_sort_key)
 
     return nodes
 
@@ -110,7 +110,7 @@ def _find_or_create_parent(topic_id: TopicID, nodes: dict[str, TopicNode]) -> To
     return synthetic.topic_id
 
 
-def _topic_sort_key(topic_id: TopicID) -> tuple:
+def topic_sort_key(topic_id: TopicID) -> tuple:
     """
     Sort key for topic IDs: numeric parts compared as ints, letter parts as (type, value).
     E.g. 2.1, 2.2, 2.10, 2.10.a order correctly.
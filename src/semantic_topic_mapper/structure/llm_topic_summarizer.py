@@ -0,0 +1,324 @@
+"""
+LLM topic summaries, computed bottom-up over the topic hierarchy.
+
+Summarizing every block with the whole document as context would cost one
+large request per topic. Instead the TopicNode tree is reduced level by level
+(map-reduce):
+
+1. Leaves (height 0) are summarized from their own text, packed into batches
+   (LLM_SUMMARY_BATCH_SIZE topics per request, bounded by LLM_CHUNK_TOKENS)
+   that are sent concurrently.
+2. Each parent (height h) is summarized from its own text plus its
+   children's summaries, once every child (height < h) is done; parents of
+   the same height are batched and sent concurrently the same way. Synthetic
+   nodes have no text and are summarized from their children alone.
+
+Each summary is cached under a hash of its subtree (topic ID, title and text
+of the node and, recursively, of its descendants), so a rerun only asks the
+model about subtrees whose content changed; an edited leaf invalidates the
+leaf and its ancestors, nothing else. A parent summarized while some child
+had no summary is not cached, so the next run redoes it; children with
+nothing to summarize (heading only, no children) do not count. Keys include
+the backend, so stub summaries are never served to a live run. The cache
+reuses the response cache store (llm/cache.py) in its own file,
+LLM_SUMMARY_CACHE_PATH. A leaf whose
+text repeats an earlier leaf verbatim (structure/duplicate_detector.py) is
+not sent; it takes the first occurrence's summary.
+
+Responses go through the shared LLM client (rate limiting, retries, response
+cache, telemetry stage "topic_summaries").
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from semantic_topic_mapper.llm.cache import LLMResponseCache
+from semantic_topic_mapper.llm.rate_limiter import estimate_tokens
+from semantic_topic_mapper.llm.telemetry import llm_stage
+from semantic_topic_mapper.llm.validator import StreamingItemParser, iter_response_items
+from semantic_topic_mapper.models.topic_models import TopicNode
+from semantic_topic_mapper.structure.duplicate_detector import DuplicateBlock, exact_repeats
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt or the expected JSON response shape changes
+# (invalidates cached responses and cached summaries).
+RESPONSE_SCHEMA_VERSION = "1"
+
+
+@dataclass
+class SummaryTask:
+    """One topic to summarize: its own text and its children's summaries (id, title, summary)."""
+
+    topic_id: str
+    title: str
+    text: str
+    child_summaries: list[tuple[str, str, str]] = field(default_factory=list)
+
+
+@dataclass
+class TopicSummaryRun:
+    """Outcome of one summarization run (for pipeline reporting)."""
+
+    summaries: dict[str, str]
+    cached: int
+    requests: int
+    reused: int = 0
+
+
+def _own_text(node: TopicNode) -> str:
+    """Block text without its header line ("" for synthetic nodes)."""
+    if node.block is None:
+        return ""
+    _, _, body = node.block.raw_text.partition("\n")
+    return body.strip()
+
+
+def _title(node: TopicNode) -> str:
+    return (node.block.title if node.block is not None else None) or ""
+
+
+def subtree_hashes(nodes: dict[str, TopicNode]) -> dict[str, str]:
+    """topic_id.raw -> sha256 over the node's ID, title and text and its children's subtree hashes."""
+    hashes: dict[str, str] = {}
+
+    def visit(raw: str) -> str:
+        if raw in hashes:
+            return hashes[raw]
+        node = nodes[raw]
+        h = hashlib.sha256()
+        for part in (raw, _title(node), _own_text(node)):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        for child in node.children_ids:
+            if child.raw in nodes:
+                h.update(visit(child.raw).encode("ascii"))
+        hashes[raw] = h.hexdigest()
+        return hashes[raw]
+
+    for raw in nodes:
+        visit(raw)
+    return hashes
+
+
+def node_heights(nodes: dict[str, TopicNode]) -> dict[str, int]:
+    """topic_id.raw -> height in the tree (0 for leaves, 1 + tallest child otherwise)."""
+    heights: dict[str, int] = {}
+
+    def visit(raw: str) -> int:
+        if raw not in heights:
+            children = [c.raw for c in nodes[raw].children_ids if c.raw in nodes]
+            heights[raw] = 1 + max(visit(c) for c in children) if children else 0
+        return heights[raw]
+
+    for raw in nodes:
+        visit(raw)
+    return heights
+
+
+def _task_tokens(task: SummaryTask) -> int:
+    children = sum(estimate_tokens(s) + estimate_tokens(t) + 4 for _, t, s in task.child_summaries)
+    return estimate_tokens(task.text) + estimate_tokens(task.title) + children + 10
+
+
+def batch_tasks(tasks: list[SummaryTask], batch_size: int = 8, max_tokens: int = 3000) -> list[list[SummaryTask]]:
+    """Consecutive batches of at most batch_size tasks and ~max_tokens of prompt text."""
+    batches: list[list[SummaryTask]] = []
+    batch: list[SummaryTask] = []
+    size = 0
+    for task in tasks:
+        cost = _task_tokens(task)
+        if batch and (len(batch) >= max(1, batch_size) or size + cost > max_tokens):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(task)
+        size += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def build_summary_prompt(batch: list[SummaryTask], max_text_chars: int = 9000) -> str:
+    """Prompt for one batch: each topic's text (truncated) and its subtopic summaries."""
+    sections = []
+    for task in batch:
+        text = task.text if len(task.text) <= max_text_chars else task.text[:max_text_chars] + " [...]"
+        lines = [f"### Topic {task.topic_id}: {task.title or '(untitled)'}"]
+        lines.append(f'Text:\n"""\n{text}\n"""' if text else "Text: (none; heading only)")
+        if task.child_summaries:
+            lines.append("Subtopic summaries:")
+            lines.extend(f"- {cid} {ctitle}: {summary}" for cid, ctitle, summary in task.child_summaries)
+        sections.append("\n".join(lines))
+    topics = "\n\n".join(sections)
+    return f"""You are a document analyst. Write a one-paragraph summary (2-4 sentences) of each topic below for a reviewer who has not read the document. For a topic with subtopic summaries, summarize the topic as a whole: its own text and what its subtopics cover. Do not invent obligations, parties or numbers that are not in the text.
+
+{topics}
+
+Respond with ONLY a single JSON object, no other text:
+{{"summaries": [{{"topic_id": "<topic id as given above>", "summary": "<one paragraph>"}}]}}
+
+Every topic above must appear exactly once."""
+
+
+def _stream_llm_text(prompt: str, description: str) -> Iterable[str]:
+    """Response text pieces for a prompt (temperature 0), as they arrive."""
+    from semantic_topic_mapper.llm.client import stream_content_text
+
+    return stream_content_text(
+        prompt,
+        temperature=0.0,
+        debug_label=description,
+        schema_version=RESPONSE_SCHEMA_VERSION,
+    )
+
+
+def _llm_items(prompt: str, description: str) -> Iterator[Any]:
+    """Schema-valid "summaries" items as the response streams in; failures are logged."""
+    parser = StreamingItemParser(("summaries",))
+    try:
+        with llm_stage("topic_summaries"):
+            for _, item in iter_response_items(_stream_llm_text(prompt, description), ("summaries",), parser):
+                yield item
+    except ValueError as e:
+        logger.warning("LLM %s: config/API key issue: %s", description, e)
+        return
+    except Exception as e:
+        logger.warning("LLM %s: %s", description, e)
+        return
+    if not parser.saw_object:
+        logger.warning("LLM %s: empty response or no JSON object", description)
+
+
+def summarize_batch(batch: list[SummaryTask], label: str = "", max_text_chars: int = 9000) -> dict[str, str]:
+    """Ask the LLM to summarize one batch; keep the first summary for each topic in the batch."""
+    description = f"topic summaries {label}".strip()
+    wanted = {task.topic_id for task in batch}
+    result: dict[str, str] = {}
+    for item in _llm_items(build_summary_prompt(batch, max_text_chars), description):
+        topic_id = item.topic_id.strip()
+        summary = " ".join(item.summary.split())
+        if topic_id in wanted and topic_id not in result and summary:
+            result[topic_id] = summary
+    return result
+
+
+_summary_cache: LLMResponseCache | None = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> LLMResponseCache | None:
+    """
+    Process-wide summary cache at LLM_SUMMARY_CACHE_PATH (no TTL or size bound),
+    or None when LLM_CACHE_ENABLED is false. Honours LLM_CACHE_READ_ONLY.
+    """
+    global _summary_cache
+    from semantic_topic_mapper.config import (
+        LLM_CACHE_ENABLED,
+        LLM_CACHE_READ_ONLY,
+        LLM_SUMMARY_CACHE_PATH,
+    )
+    from semantic_topic_mapper.llm.backends import store_path
+
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = LLMResponseCache(store_path(LLM_SUMMARY_CACHE_PATH), read_only=LLM_CACHE_READ_ONLY)
+        return _summary_cache
+
+
+def summarize_topics(
+    nodes: dict[str, TopicNode],
+    duplicates: list[DuplicateBlock] | None = None,
+) -> TopicSummaryRun:
+    """
+    Summarize every topic bottom-up (see module docstring) and return
+    topic_id.raw -> summary for the topics that got one. A topic whose
+    summary is missing (failed call, omitted by the model) is left out, and
+    its parent is summarized from the children that have one. Leaves that
+    are verbatim repeats of an earlier leaf (duplicates) reuse its summary.
+    Settings: LLM_SUMMARY_BATCH_SIZE, LLM_CHUNK_TOKENS, LLM_MAX_CONCURRENCY, LLM_MODEL.
+    """
+    from semantic_topic_mapper.config import (
+        LLM_CHUNK_TOKENS,
+        LLM_MAX_CONCURRENCY,
+        LLM_MODEL,
+        LLM_SUMMARY_BATCH_SIZE,
+    )
+
+    from semantic_topic_mapper.llm.backends import get_backend
+
+    cache = get_summary_cache()
+    backend = get_backend().name
+    hashes = subtree_hashes(nodes)
+    heights = node_heights(nodes)
+    keys = {
+        raw: LLMResponseCache.make_key(LLM_MODEL, h, 0.0, RESPONSE_SCHEMA_VERSION, backend)
+        for raw, h in hashes.items()
+    }
+    max_text_chars = max(1000, LLM_CHUNK_TOKENS * 3)
+    repeats = {
+        raw: dup.canonical_topic_id.raw
+        for raw, dup in exact_repeats(duplicates).items()
+        if heights.get(raw) == 0 and heights.get(dup.canonical_topic_id.raw) == 0
+    }
+    summaries: dict[str, str] = {}
+    partial: set[str] = set()  # summarized without every child's summary; not cached
+    empty: set[str] = set()  # no text and nothing below: never summarized
+    cached = requests = reused = 0
+
+    for height in range(max(heights.values(), default=-1) + 1):
+        tasks: list[SummaryTask] = []
+        for raw, node in nodes.items():
+            if heights[raw] != height:
+                continue
+            hit = cache.get(keys[raw]) if cache is not None else None
+            if hit is not None:
+                summaries[raw] = hit
+                cached += 1
+                continue
+            if raw in repeats:
+                continue
+            children = [
+                (c.raw, _title(nodes[c.raw]), summaries[c.raw]) for c in node.children_ids if c.raw in summaries
+            ]
+            expected = [c for c in node.children_ids if c.raw not in empty]
+            if len(children) < len(expected):
+                partial.add(raw)
+            text = _own_text(node)
+            if text or children:
+                tasks.append(SummaryTask(raw, _title(node), text, children))
+            elif not expected:
+                empty.add(raw)
+        batches = batch_tasks(tasks, LLM_SUMMARY_BATCH_SIZE, LLM_CHUNK_TOKENS)
+        results: list[dict[str, str]] = []
+        if batches:
+            requests += len(batches)
+            labels = [f"height {height} batch {i + 1}/{len(batches)}" for i in range(len(batches))]
+            with ThreadPoolExecutor(max_workers=max(1, min(len(batches), LLM_MAX_CONCURRENCY))) as pool:
+                results = list(
+                    pool.map(lambda args: summarize_batch(args[0], args[1], max_text_chars), zip(batches, labels))
+                )
+        for result in results:
+            for raw, summary in result.items():
+                summaries[raw] = summary
+                if cache is not None and raw not in partial:
+                    cache.put(keys[raw], LLM_MODEL, summary)
+        if height == 0:
+            for raw, canonical in repeats.items():
+                if raw not in summaries and canonical in summaries:
+                    summaries[raw] = summaries[canonical]
+                    reused += 1
+                    if cache is not None:
+                        cache.put(keys[raw], LLM_MODEL, summaries[raw])
+
+    return TopicSummaryRun(
+        {raw: summaries[raw] for raw in nodes if raw in summaries}, cached, requests, reused
+    )
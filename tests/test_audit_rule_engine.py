@@ -0,0 +1,83 @@
+r"""
+Audit rule engine tests: single traversal, issue order, shared indexes, parallel chunks.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_audit_rule_engine.py -v
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue, audit_document, default_rules
+from semantic_topic_mapper.audit.rule_engine import AuditContext, AuditEngine, AuditRule
+from semantic_topic_mapper.entities.entity_models import Entity, EntityMention
+from semantic_topic_mapper.models.reference_models import TopicReference
+from semantic_topic_mapper.models.topic_models import TopicBlock
+from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.topic_id_parser import parse_topic_id
+
+
+def _tid(raw: str):
+    return parse_topic_id(raw)
+
+
+def _fixture():
+    blocks = [TopicBlock(_tid(r), f"T{r}", f"{r} text", i * 10, i * 10 + 9) for i, r in enumerate(["1", "1.1", "2.1.1", "2"])]
+    nodes = build_topic_hierarchy(blocks)  # adds synthetic 2.1
+    refs = [TopicReference(_tid("2"), _tid("1.1"), "explicit", 30, 40, "paragraph")] * 2
+    entities = [
+        Entity("E1", "Board", None, _tid("1"), [EntityMention(_tid(r), 0, 5, "Board", "paragraph", None) for r in ("1", "2", "1")]),
+        Entity("E2", "Auditor", None, _tid("2"), [EntityMention(_tid("2"), 0, 7, "Auditor", "paragraph", None)]),
+    ]
+    return nodes, refs, entities
+
+
+class _IncomingRefs(AuditRule):
+    """Example rule on the shared reverse-reference index."""
+
+    name = "heavily_referenced"
+
+    def visit_topic(self, node, ctx: AuditContext):
+        count = len(ctx.incoming_references.get(node.topic_id.raw, []))
+        if count > 1:
+            yield AuditIssue("heavily_referenced", "info", f"{count}", node.topic_id, None, None)
+
+
+def test_single_pass_order_indexes_and_timings() -> None:
+    nodes, refs, entities = _fixture()
+    run = audit_document(nodes, [], entities, refs, rules=default_rules() + [_IncomingRefs()])
+    assert [i.issue_type for i in run.issues] == [
+        "heavily_referenced",  # topic 1.1 (topics phase, node order)
+        "missing_topic_content",  # synthetic 2.1
+        "undefined_entity",
+        "undefined_entity",
+        "single_mention_entity",
+    ]
+    assert set(run.rule_seconds) == {r.name for r in default_rules()} | {"heavily_referenced"}
+
+    ctx = AuditContext(nodes=nodes, entities=entities, references=refs)
+    ctx.build_indexes()
+    assert ctx.topics_by_entity["E1"] == ["1", "2"]
+    assert [e.entity_id for e in ctx.entities_by_topic["2"]] == ["E1", "E2"]
+
+    with pytest.raises(ValueError):
+        AuditEngine([_IncomingRefs(), _IncomingRefs()])
+
+
+def test_parallel_chunks_match_serial_output() -> None:
+    nodes, refs, entities = _fixture()
+    entities = entities * 20
+    serial = audit_document(nodes, [], entities, refs).issues
+    parallel = audit_document(nodes, [], entities, refs, workers=4).issues
+    assert [vars(i) for i in parallel] == [vars(i) for i in serial]
@@ -0,0 +1,78 @@
+r"""
+Consistency rule tests: conflicting definitions, term spelling variants, reference names vs titles.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_consistency_checker.py -v
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.audit.ambiguity_detector import audit_document
+from semantic_topic_mapper.audit.consistency_checker import ConsistencyRule
+from semantic_topic_mapper.entities.definition_linker import link_entity_definitions
+from semantic_topic_mapper.entities.deterministic_entity_detector import detect_entities
+from semantic_topic_mapper.ingestion.document_index import build_document_index
+from semantic_topic_mapper.references.reference_detector import detect_references
+from semantic_topic_mapper.structure.header_detector import detect_headers
+from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
+
+_TEXT = """1 Definitions
+"Client" means a person receiving advice.
+The term "Client" means a person receiving advice.
+2 Annual Renewal
+Each client is reviewed under Topic 3 (Fee Schedule). Client files are kept.
+CLIENT RECORDS are archived as set out in Topic 2 (Annual Review).
+3 Fees and Schedules
+"Client" means any natural person or entity receiving advice.
+The Client pays fees (see below). A client may object under Topic 2 (Annual Review).
+"""
+
+
+def _run(text: str):
+    index = build_document_index(text)
+    blocks = segment_into_topic_blocks(text, detect_headers(text, index))
+    entities = detect_entities(blocks, workers=1)
+    definitions = link_entity_definitions(entities, blocks, index)
+    run = audit_document(
+        build_topic_hierarchy(blocks), [], entities, detect_references(blocks), blocks, text,
+        rules=[ConsistencyRule()], definitions=definitions,
+    )
+    return definitions, entities, run.issues
+
+
+def test_all_definitions_collected_first_one_linked() -> None:
+    definitions, entities, _ = _run(_TEXT)
+    assert [(d.term, d.topic_id.raw) for d in definitions] == [("Client", "1"), ("Client", "1"), ("Client", "3")]
+    client = next(e for e in entities if e.canonical_name == "Client")
+    assert client.definition_text == "a person receiving advice"
+    assert _TEXT[definitions[2].start_char : definitions[2].end_char] == '"Client" means any natural person or entity receiving advice'
+
+
+def test_consistency_issues() -> None:
+    _, _, issues = _run(_TEXT)
+    assert [(i.issue_type, i.topic_id.raw, i.message) for i in issues] == [
+        ("inconsistent_usage", "3", 'Topic 2 is referred to as "Annual Review" but titled "Annual Renewal".'),
+        ("inconsistent_definition", "3",
+         'Term "Client" has 2 different definitions (first in 1); this definition differs.'),
+        ("inconsistent_usage", "2", 'Defined term "Client" is also written as "client" (2x).'),
+    ]
+
+
+def test_definition_span_covers_the_whole_sentence() -> None:
+    text = '1 Definitions\n"Client" means a person who, e.g. a firm,\nholds an account.\n'
+    index = build_document_index(text)
+    blocks = segment_into_topic_blocks(text, detect_headers(text, index))
+    (definition,) = link_entity_definitions([], blocks, index)
+    assert definition.text == "a person who, e.g. a firm, holds an account"
+    assert text[definition.start_char : definition.end_char] == '"Client" means a person who, e.g. a firm,\nholds an account'
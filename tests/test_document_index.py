@@ -0,0 +1,57 @@
+r"""
+Document index (line and sentence boundaries) tests.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python tests/test_document_index.py
+
+Or: python -m pytest tests/test_document_index.py -v (with PYTHONPATH=src)
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.ingestion.document_index import build_document_index
+
+_DOC = """TOPIC 1: GOVERNANCE
+1.1 Oversight
+A named Compliance Officer shall report to the Board of Directors each quarter.
+In practice the Board of Directors oversees a Compliance Officer.
+"""
+
+
+def test_sentence_index_boundaries() -> None:
+    index = build_document_index(_DOC)
+    offset = _DOC.index("oversees")
+    start, end = index.sentence_span_at(offset)
+    assert _DOC[start:end].startswith("In practice the Board of Directors oversees")
+    # Header lines and abbreviations do not merge into / split sentences
+    assert _DOC[index.sentence_span_at(_DOC.index("Oversight"))[0]:].startswith("1.1 Oversight")
+    e_g = build_document_index("Fees, e.g. Annual Fees, apply. Next sentence.")
+    assert e_g.sentence_starts.tolist() == [0, 31]
+
+
+def test_line_lookup_matches_splitlines() -> None:
+    text = "a\r\nbb\rccc\n\ndd"
+    index = build_document_index(text)
+    expected, pos = [], 0
+    for line in text.splitlines(keepends=True):
+        expected.append(pos)
+        pos += len(line)
+    assert index.line_starts.tolist() == expected
+    pos = index.locate(text.index("ccc") + 2)
+    assert (pos.line, pos.column) == (3, 3)
+
+
+if __name__ == "__main__":
+    test_sentence_index_boundaries()
+    test_line_lookup_matches_splitlines()
+    print("All tests passed.")
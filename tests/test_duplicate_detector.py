@@ -0,0 +1,106 @@
+r"""
+Duplicate block detector tests: MinHash/LSH repeats, canonical first occurrence, audit findings.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_duplicate_detector.py -v
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.audit.ambiguity_detector import DuplicateBlockRule, audit_document
+from semantic_topic_mapper.ingestion.document_index import build_document_index
+from semantic_topic_mapper.structure import duplicate_detector
+from semantic_topic_mapper.structure.duplicate_detector import find_duplicate_blocks, shingle_hashes
+from semantic_topic_mapper.structure.header_detector import detect_headers
+from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
+
+_CLAUSE = (
+    "The Firm shall retain all records described in the record keeping section for at least "
+    "seven years and make them available to the regulator on request, including electronic "
+    "communications, trade confirmations, client agreements and complaint files."
+)
+
+_TEXT = f"""1 Records
+{_CLAUSE}
+2 Conduct
+Advisers act in the best interest of each client and disclose every conflict of interest in writing before any advice is given.
+3 Branch Records
+{_CLAUSE}
+4 Affiliate Records
+{_CLAUSE.replace("complaint files", "complaint registers")}
+5 Short
+See above.
+6 Short Again
+See above.
+"""
+
+
+def _blocks():
+    return segment_into_topic_blocks(_TEXT, detect_headers(_TEXT, build_document_index(_TEXT)))
+
+
+def test_shingles_roll_over_words() -> None:
+    assert shingle_hashes("A b c d", 2) == shingle_hashes("a  B\nc d", 2)
+    assert len(shingle_hashes("a b c d", 2)) == 3
+    assert shingle_hashes("a b c d", 2) != shingle_hashes("a b c e", 2)
+
+
+def test_repeats_point_at_first_occurrence(monkeypatch: pytest.MonkeyPatch) -> None:
+    found = find_duplicate_blocks(_blocks(), shingle_words=5, threshold=0.8, min_words=5)
+    assert [(d.topic_id.raw, d.canonical_topic_id.raw, d.exact) for d in found] == [
+        ("3", "1", True),
+        ("4", "1", False),
+    ]
+    exact, near = found
+    assert exact.similarity == 1.0 and 0.8 <= near.similarity < 1.0
+    assert _TEXT[exact.start_char : exact.end_char].strip() == _CLAUSE
+    assert _TEXT[exact.start_char - exact.offset_delta :].startswith(_CLAUSE)
+
+    monkeypatch.setattr(duplicate_detector, "np", None)
+    assert find_duplicate_blocks(_blocks(), shingle_words=5, threshold=0.8, min_words=5) == found
+
+
+def test_duplicate_block_audit_issues() -> None:
+    blocks = _blocks()
+    found = find_duplicate_blocks(blocks, shingle_words=5, threshold=0.8, min_words=5)
+    run = audit_document(build_topic_hierarchy(blocks), [], [], rules=[DuplicateBlockRule()], duplicates=found)
+    assert [(i.issue_type, i.topic_id.raw, i.message) for i in run.issues] == [
+        ("duplicate_block", "3", "Topic 3 repeats Topic 1 verbatim."),
+        ("duplicate_block", "4", f"Topic 4 repeats Topic 1 nearly (similarity {found[1].similarity:.2f})."),
+    ]
+
+
+def test_near_repeats_are_not_chained() -> None:
+    words = [f"w{i}" for i in range(100)]
+    a = " ".join(words)
+    b = " ".join(words[:94] + [f"b{i}" for i in range(6)])
+    c = " ".join([f"c{i}" for i in range(6)] + b.split()[6:])
+    text = f"1 A\n{a}\n2 B\n{b}\n3 C\n{c}\n"
+    blocks = segment_into_topic_blocks(text, detect_headers(text, build_document_index(text)))
+    found = find_duplicate_blocks(blocks, shingle_words=5, threshold=0.85, min_words=5)
+    assert [(d.topic_id.raw, d.canonical_topic_id.raw) for d in found] == [("2", "1"), ("3", "2")]
+    assert all(d.similarity >= 0.85 for d in found)  # 3 vs 1 estimates 0.83
+
+
+def test_verbatim_repeat_of_a_near_repeat_is_exact() -> None:
+    words = [f"w{i}" for i in range(100)]
+    a = " ".join(words)
+    b = " ".join(words[:90] + [f"b{i}" for i in range(10)])
+    text = f"1 A\n{a}\n2 B\n{b}\n3 C\n{b}\n"
+    blocks = segment_into_topic_blocks(text, detect_headers(text, build_document_index(text)))
+    found = find_duplicate_blocks(blocks, shingle_words=5, threshold=0.7, min_words=5)
+    assert [(d.topic_id.raw, d.canonical_topic_id.raw, d.exact) for d in found] == [("2", "1", False), ("3", "2", True)]
+    assert found[1].similarity == 1.0
@@ -0,0 +1,88 @@
+r"""
+Deterministic entity detection tests.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python tests/test_entity_detection.py
+
+Or: python -m pytest tests/test_entity_detection.py -v (with PYTHONPATH=src)
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.entities.deterministic_entity_detector import (
+    _balanced_chunks,
+    detect_entities,
+)
+from semantic_topic_mapper.entities.entity_stoplist import (
+    BloomFilter,
+    build_stoplist,
+    load_stoplist,
+    save_stoplist,
+)
+from semantic_topic_mapper.structure.header_detector import detect_headers
+from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
+
+_SAMPLE = _root / "data" / "sample_document.txt"
+
+
+def _sample_blocks():
+    text = _SAMPLE.read_text(encoding="utf-8")
+    return segment_into_topic_blocks(text, detect_headers(text))
+
+
+def test_balanced_chunks_cover_blocks_in_order() -> None:
+    blocks = _sample_blocks()
+    chunks = _balanced_chunks(blocks, 8)
+    assert 1 < len(chunks) <= 8
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(blocks)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+
+
+def test_parallel_detection_matches_serial() -> None:
+    blocks = _sample_blocks()
+    serial = detect_entities(blocks, workers=1)
+    parallel = detect_entities(blocks, workers=2, min_parallel_chars=0)
+    assert serial
+    assert parallel == serial
+
+
+def test_build_stoplist_keeps_mid_sentence_entities() -> None:
+    docs = [
+        "The Firm must act.\nThe Firm shall report to the Board of Directors.\n"
+        "Approval by the Board of Directors is required. The Firm keeps records.",
+        "The Firm may appeal. Notice goes to the Board of Directors.",
+    ]
+    phrases = build_stoplist(docs, min_documents=2, min_occurrences=3)
+    assert phrases == ["The Firm"]
+
+
+def test_stoplist_files_and_filtering(tmp_path: Path) -> None:
+    blocks = _sample_blocks()
+    names = [e.canonical_name for e in detect_entities(blocks)]
+    dropped = names[:2]
+    for filename, bloom in (("stop.txt", False), ("stop.bloom", True)):
+        path = save_stoplist(dropped, tmp_path / filename, bloom=bloom)
+        stoplist = load_stoplist(path)
+        assert isinstance(stoplist, BloomFilter) == bloom
+        kept = [e.canonical_name for e in detect_entities(blocks, stoplist=stoplist)]
+        assert kept == names[2:]
+
+
+if __name__ == "__main__":
+    test_balanced_chunks_cover_blocks_in_order()
+    test_parallel_detection_matches_serial()
+    test_build_stoplist_keeps_mid_sentence_entities()
+    import tempfile
+    with tempfile.TemporaryDirectory() as d:
+        test_stoplist_files_and_filtering(Path(d))
+    print("All tests passed.")
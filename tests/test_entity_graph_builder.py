@@ -0,0 +1,96 @@
+r"""
+Entity co-occurrence (entity_graph_builder) tests.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python tests/test_entity_graph_builder.py
+
+Or: python -m pytest tests/test_entity_graph_builder.py -v (with PYTHONPATH=src)
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.entities import entity_graph_builder
+from semantic_topic_mapper.entities.entity_graph_builder import (
+    build_entity_topic_incidence,
+    compute_entity_cooccurrence,
+)
+from semantic_topic_mapper.entities.entity_models import Entity, EntityMention
+from semantic_topic_mapper.structure.topic_id_parser import parse_topic_id
+
+
+def _entity(entity_id: str, name: str, topics: list[str]) -> Entity:
+    mentions = []
+    for i, raw in enumerate(topics):
+        tid = parse_topic_id(raw)
+        assert tid is not None
+        mentions.append(
+            EntityMention(
+                topic_id=tid,
+                start_char=i * 10,
+                end_char=i * 10 + len(name),
+                text=name,
+                region_type="paragraph",
+                region_label=None,
+            )
+        )
+    return Entity(
+        entity_id=entity_id,
+        canonical_name=name,
+        entity_type=None,
+        first_seen_topic=mentions[0].topic_id,
+        mentions=mentions,
+    )
+
+
+def _sample_entities() -> list[Entity]:
+    return [
+        _entity("E1", "Compliance Officer", ["1.1", "2.1", "2.1", "3.1"]),
+        _entity("E2", "Board of Directors", ["1.1", "2.1", "4.1"]),
+        _entity("E3", "Commission", ["3.1", "4.1", "5.1"]),
+        _entity("E4", "Client", ["5.1"]),
+    ]
+
+
+def test_incidence_is_binary() -> None:
+    inc = build_entity_topic_incidence(_sample_entities())
+    assert inc.shape == (4, 5)
+    # E1 mentions 2.1 twice but is incident to it once
+    assert len(inc.rows) == 3 + 3 + 3 + 1
+
+
+def test_cooccurrence_scores() -> None:
+    assoc = compute_entity_cooccurrence(_sample_entities(), min_cooccurrence=1)
+    pairs = {(a.source_entity_id, a.target_entity_id): a for a in assoc}
+    e1_e2 = pairs[("E1", "E2")]
+    assert e1_e2.cooccurrence == 2
+    assert e1_e2.jaccard == 0.5
+    # log2(2 * 5 / (3 * 3))
+    assert abs(e1_e2.pmi - 0.152003) < 1e-6
+    assert ("E1", "E4") not in pairs
+    strong = compute_entity_cooccurrence(_sample_entities(), min_cooccurrence=2)
+    assert [(a.source_entity_id, a.target_entity_id) for a in strong] == [("E1", "E2")]
+
+
+def test_fallback_matches_sparse_path() -> None:
+    inc = build_entity_topic_incidence(_sample_entities())
+    expected = entity_graph_builder._cooccurrence_arrays(inc, 1)
+    if entity_graph_builder.sparse is not None:
+        assert entity_graph_builder._cooccurrence_sparse(inc, 1) == expected
+    assert [(a, b) for a, b, *_ in expected] == [(0, 1), (0, 2), (1, 2), (2, 3)]
+
+
+if __name__ == "__main__":
+    test_incidence_is_binary()
+    test_cooccurrence_scores()
+    test_fallback_matches_sparse_path()
+    print("All tests passed.")
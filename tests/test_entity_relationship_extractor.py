@@ -0,0 +1,62 @@
+r"""
+Deterministic entity relationship extraction tests.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python tests/test_entity_relationship_extractor.py
+
+Or: python -m pytest tests/test_entity_relationship_extractor.py -v (with PYTHONPATH=src)
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.entities.deterministic_entity_detector import detect_entities
+from semantic_topic_mapper.entities.entity_relationship_extractor import (
+    extract_entity_relationships,
+)
+from semantic_topic_mapper.ingestion.document_index import build_document_index
+from semantic_topic_mapper.structure.header_detector import detect_headers
+from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
+
+_DOC = """TOPIC 1: GOVERNANCE
+1.1 Oversight
+A named Compliance Officer shall report to the Board of Directors each quarter.
+In practice the Board of Directors oversees a Compliance Officer.
+1.2 Notices
+A firm must notify the Board of Directors of any breach; a Compliance Officer keeps the records.
+"""
+
+
+def _names(entities, relationships) -> list[tuple[str, str, str]]:
+    by_id = {e.entity_id: e.canonical_name for e in entities}
+    return [
+        (by_id[r.source_entity_id], r.relation_type, by_id[r.target_entity_id])
+        for r in relationships
+    ]
+
+
+def test_verb_rules_resolve_within_sentence() -> None:
+    blocks = segment_into_topic_blocks(_DOC, detect_headers(_DOC))
+    entities = detect_entities(blocks)
+    rels = extract_entity_relationships(entities, blocks, build_document_index(_DOC))
+    assert _names(entities, rels) == [
+        ("Compliance Officer", "reports_to", "the Board of Directors"),
+        ("the Board of Directors", "oversees", "Compliance Officer"),
+    ]
+    assert [r.topic_id.raw for r in rels] == ["1.1", "1.1"]
+    # Per-block indexing (no shared index) gives the same result
+    assert extract_entity_relationships(entities, blocks) == rels
+
+
+if __name__ == "__main__":
+    test_verb_rules_resolve_within_sentence()
+    print("All tests passed.")
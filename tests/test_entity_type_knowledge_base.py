@@ -0,0 +1,142 @@
+r"""
+Entity type knowledge base tests (SQLite in a temp dir; no LLM calls).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_entity_type_knowledge_base.py -v
+"""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper import config
+from semantic_topic_mapper.entities import llm_entity_enricher as enricher
+from semantic_topic_mapper.entities import type_knowledge_base as kb_module
+from semantic_topic_mapper.entities.entity_models import Entity
+from semantic_topic_mapper.entities.type_knowledge_base import (
+    EntityTypeKnowledgeBase,
+    document_id,
+    normalize_entity_name,
+)
+from semantic_topic_mapper.llm import backends, cache as cache_module
+from semantic_topic_mapper.llm.backends import BackendResponse
+from semantic_topic_mapper.llm.resilience import reset_resilience_state
+from semantic_topic_mapper.llm.stub_server import enrichment_responder
+
+
+def test_votes_confidence_and_manual_override(tmp_path: Path) -> None:
+    assert normalize_entity_name("  The  Commission, ") == normalize_entity_name("commission")
+
+    kb = EntityTypeKnowledgeBase(tmp_path / "kb.sqlite3", min_confidence=0.6)
+    kb.record({"Compliance Officer": "role", "the Commission": "organization"}, document="a.txt")
+    kb.record({"Compliance Officer": "role"}, document="b.txt")
+    kb.record({"Compliance Officer": "other"}, document="c.txt")
+    known = kb.lookup(["compliance officer", "Commission", "Unseen"])
+    assert known["compliance officer"].entity_type == "role"
+    assert round(known["compliance officer"].confidence, 2) == 0.67
+    assert known["Commission"].first_document == "a.txt"
+    assert "Unseen" not in known
+
+    kb.record({"Compliance Officer": "other"}, document="d.txt")  # 2 vs 2: below 0.6
+    assert kb.lookup(["Compliance Officer"]) == {}
+    kb.set_type("Compliance Officer", "role")
+    assert kb.lookup(["Compliance Officer"])["Compliance Officer"].source == "manual"
+    kb.close()
+
+    read_only = EntityTypeKnowledgeBase(tmp_path / "kb.sqlite3", read_only=True)
+    read_only.record({"New": "role"})
+    assert read_only.lookup(["New"]) == {} and len(read_only.entries()) == 2
+
+
+def test_rerecording_a_document_does_not_add_votes(tmp_path: Path) -> None:
+    kb = EntityTypeKnowledgeBase(tmp_path / "kb.sqlite3")
+    kb.record({"Board": "role"}, document="a.txt")
+    kb.record({"Board": "organization"}, document="b.txt")
+    kb.record({"Board": "organization"}, document="b.txt")  # same document again
+    assert kb.lookup(["Board"])["Board"].confidence == 0.5
+
+    kb.record({"Board": "role"}, document="b.txt")  # b.txt changed its answer
+    known = kb.lookup(["Board"])["Board"]
+    assert (known.entity_type, known.votes, known.confidence) == ("role", 2, 1.0)
+    kb.close()
+
+
+def test_documents_are_told_apart_by_content() -> None:
+    assert document_id("input.txt", "one text") != document_id("input.txt", "another text")
+    assert document_id("input.txt", "one text").startswith("input.txt@")
+
+
+class _Answering:
+    def __init__(self, name: str, answer=enrichment_responder):
+        self.name = name
+        self.answer = answer
+        self.calls = 0
+
+    def generate(self, prompt: str, temperature: float) -> BackendResponse:
+        self.calls += 1
+        return BackendResponse(self.answer(prompt), {"candidates": [{"finish_reason": "STOP"}]})
+
+
+def test_stub_answers_are_never_learned(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(config, "ENTITY_KB_PATH", tmp_path / "kb.sqlite3")
+    monkeypatch.setattr(config, "ENTITY_KB_ENABLED", True)
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "LLM_CACHE_PATH", tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(kb_module, "_kb", None)
+    monkeypatch.setattr(cache_module, "_cache", None)
+    reset_resilience_state()
+    stub, live = _Answering("stub"), _Answering("gemini", lambda prompt: "{}")
+    try:
+        for backend in (stub, live):
+            backends.set_backend(backend)
+            entities = [Entity("E1", "Board", None, "1", [])]
+            enricher.run_entity_enrichment(entities, "text", concurrent=False, mode="prefix", document="a.txt")
+        assert stub.calls and live.calls == stub.calls  # the live run is not served stub answers
+        assert kb_module._kb.entries() == []
+    finally:
+        backends.set_backend(None)
+        kb_module._kb.close()
+        cache_module._cache.close()
+        monkeypatch.setattr(kb_module, "_kb", None)
+        monkeypatch.setattr(cache_module, "_cache", None)
+
+
+def test_enrichment_classifies_only_unknown_names(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(config, "ENTITY_KB_PATH", tmp_path / "kb.sqlite3")
+    monkeypatch.setattr(config, "ENTITY_KB_ENABLED", True)
+    monkeypatch.setattr(config, "LLM_BACKEND", "gemini")
+    monkeypatch.setattr(kb_module, "_kb", None)
+    asked: list[list[str]] = []
+
+    def fake(prompt: str, description: str):
+        if description == "entity type enrichment":
+            names = json.loads(prompt.split("use these exact strings):\n")[1].split("\n")[0])
+            asked.append(names)
+            return [json.dumps({"entities": [{"name": n, "type": "role"} for n in names]})]
+        return ["{}"]
+
+    monkeypatch.setattr(enricher, "_stream_llm_text", fake)
+
+    def entities() -> list[Entity]:
+        return [Entity("E1", "Board", None, "1", []), Entity("E2", "CFO", None, "1", [])]
+
+    first = entities()
+    enricher.run_entity_enrichment(first, "text", concurrent=False, mode="prefix", document="a.txt")
+    second = entities() + [Entity("E3", "Auditor", None, "1", [])]
+    plan = enricher.plan_enrichment_units(second, "text", mode="prefix")
+    assert plan.known_types == {"Board": "role", "CFO": "role"} and plan.request_count(False) == 3
+    enricher.run_entity_enrichment(second, "text", concurrent=False, plan=plan, document="b.txt")
+
+    assert asked == [["Board", "CFO"], ["Auditor"]]
+    assert [e.entity_type for e in second] == ["role", "role", "role"]
+    kb_module._kb.close()
+    monkeypatch.setattr(kb_module, "_kb", None)
@@ -0,0 +1,45 @@
+r"""
+Sibling gap analyzer tests: one range issue per run of missing topic numbers.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_gap_analyzer.py -v
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.audit.ambiguity_detector import audit_document
+from semantic_topic_mapper.audit.gap_analyzer import SiblingGapRule, find_gaps
+from semantic_topic_mapper.models.topic_models import TopicBlock
+from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.topic_id_parser import parse_topic_id
+
+
+def _ids(*raws: str):
+    return [parse_topic_id(r) for r in raws]
+
+
+def test_runs_reported_as_ranges() -> None:
+    gaps = [(first, last, count, nxt.raw) for first, last, count, nxt in find_gaps(_ids("2.7", "2.1", "2.2", "2.10", "2.8"))]
+    assert gaps == [("2.3", "2.6", 4, "2.7"), ("2.9", "2.9", 1, "2.10")]
+    assert [g[:3] for g in find_gaps(_ids("4.b", "4.e"))] == [("4.a", "4.a", 1), ("4.c", "4.d", 2)]
+    assert list(find_gaps(_ids("12.1", "12.2", "12.f"))) == []  # mixed scheme: letters ignored
+
+
+def test_issues_for_children_and_top_level_topics() -> None:
+    raws = ["1", "1.1", "1.4", "3"]
+    blocks = [TopicBlock(parse_topic_id(r), "T", f"{r} Title\nbody", i * 20, i * 20 + 12) for i, r in enumerate(raws)]
+    issues = audit_document(build_topic_hierarchy(blocks), [], [], rules=[SiblingGapRule()]).issues
+    assert [(i.message, i.topic_id.raw, i.start_char, i.end_char) for i in issues] == [
+        ("Topics 1.2–1.3 missing (2 numbers) before 1.4.", "1.4", 40, 49),
+        ("Topic 2 missing before 3.", "3", 60, 67),
+    ]
@@ -0,0 +1,106 @@
+r"""
+LLM backend tests: record/replay and the local stub server (no network).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_backends.py -v
+"""
+from __future__ import annotations
+
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper import config
+from semantic_topic_mapper.llm import backends
+from semantic_topic_mapper.llm.backends import (
+    BackendResponse,
+    RecordingBackend,
+    ReplayBackend,
+    ReplayMissError,
+)
+from semantic_topic_mapper.llm.client import generate_content_text
+from semantic_topic_mapper.llm.resilience import reset_resilience_state
+from semantic_topic_mapper.llm.stub_server import parse_latency, run_stub_server
+
+
+class _Echo:
+    name = "echo"
+
+    def generate(self, prompt: str, temperature: float) -> BackendResponse:
+        return BackendResponse(prompt.upper(), {"candidates": [{"parts": [{"text": prompt.upper()}]}]})
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+    reset_resilience_state()
+    yield
+    backends.set_backend(None)
+
+
+def test_record_then_replay(tmp_path: Path) -> None:
+    backends.set_backend(RecordingBackend(_Echo(), tmp_path))
+    assert generate_content_text("hello") == "HELLO"
+
+    backends.set_backend(ReplayBackend(tmp_path))
+    assert generate_content_text("hello") == "HELLO"
+    assert generate_content_text("never recorded") is None
+    with pytest.raises(ReplayMissError):
+        ReplayBackend(tmp_path).generate("never recorded", 0.0)
+
+
+def test_replay_reads_llm_debug_dumps(tmp_path: Path) -> None:
+    (tmp_path / "entity_type_enrichment_prompt.txt").write_text("prompt A", encoding="utf-8")
+    (tmp_path / "entity_type_enrichment_response.json").write_text(
+        json.dumps({"candidates": [{"finish_reason": "STOP", "parts": [{"text": '{"entities": []}'}]}]}),
+        encoding="utf-8",
+    )
+    replay = ReplayBackend(tmp_path)
+    assert len(replay) == 1
+    assert replay.generate("prompt A", 0.0).text == '{"entities": []}'
+
+
+def test_stub_latency_and_errors() -> None:
+    assert parse_latency("0.25")() == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")() <= 0.2
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1")
+
+    body = json.dumps({"contents": [{"parts": [{"text": 'names:\n["Board", "CFO"]\n'}]}]}).encode()
+    with run_stub_server(error_rate=1.0, error_codes=(429,), seed=0) as server:
+        url = f"{server.url}/v1beta/models/m:generateContent"
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(urllib.request.Request(url, data=body, method="POST"))
+        assert err.value.code == 429 and server.error_count == 1
+
+    from semantic_topic_mapper.llm.stub_server import enrichment_responder
+
+    with run_stub_server(enrichment_responder) as server:
+        url = f"{server.url}/v1beta/models/m:generateContent"
+        with urllib.request.urlopen(urllib.request.Request(url, data=body, method="POST")) as resp:
+            payload = json.loads(resp.read())
+        text = payload["candidates"][0]["content"]["parts"][0]["text"]
+        assert [e["name"] for e in json.loads(text)["entities"]] == ["Board", "CFO"]
+
+
+def test_stub_backend_keeps_stores_out_of_cache_dir() -> None:
+    store = Path(".cache") / "llm_responses.sqlite3"
+    assert backends.store_path(store) == store  # default backend
+    stub = backends.StubBackend(latency=0.0)
+    backends.set_backend(stub)
+    scratch = backends.store_path(store)
+    assert scratch.name == store.name and scratch.parent == Path(stub.scratch_dir.name)
+    backends.set_backend(None)  # closes the stub and removes its directory
+    assert not scratch.parent.exists()
@@ -0,0 +1,105 @@
+r"""
+LLM response cache tests (no network; the Gemini client is never constructed).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_cache.py -v
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.llm import cache as cache_module
+from semantic_topic_mapper.llm import client as client_module
+from semantic_topic_mapper.llm.cache import LLMResponseCache
+
+
+def test_key_depends_on_all_parts() -> None:
+    base = LLMResponseCache.make_key("m", "prompt", 0.0, "1", "gemini")
+    assert base == LLMResponseCache.make_key("m", "prompt", 0, "1", "gemini")
+    assert base != LLMResponseCache.make_key("m2", "prompt", 0.0, "1", "gemini")
+    assert base != LLMResponseCache.make_key("m", "prompt", 0.5, "1", "gemini")
+    assert base != LLMResponseCache.make_key("m", "prompt", 0.0, "2", "gemini")
+    assert base != LLMResponseCache.make_key("m", "prompt!", 0.0, "1", "gemini")
+    assert base != LLMResponseCache.make_key("m", "prompt", 0.0, "1", "stub")
+
+
+def test_ttl_and_lru_eviction(tmp_path: Path) -> None:
+    cache = LLMResponseCache(tmp_path / "c.sqlite3", ttl_seconds=60, max_entries=2)
+    cache.put("a", "m", "A")
+    cache.put("b", "m", "B")
+    assert cache.get("a") == "A"  # refreshes "a"
+    cache.put("c", "m", "C")  # evicts least recently used: "b"
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    cache._conn.execute("UPDATE llm_responses SET created_at = created_at - 120 WHERE key = 'c'")
+    assert cache.get("c") is None
+    assert (cache.stats.hits, cache.stats.expired, cache.stats.evictions) == (2, 1, 1)
+    cache.close()
+
+
+def test_read_only_never_writes(tmp_path: Path) -> None:
+    path = tmp_path / "c.sqlite3"
+    missing = LLMResponseCache(path, read_only=True)
+    missing.put("a", "m", "A")
+    assert missing.get("a") is None and not path.exists()
+    LLMResponseCache(path).put("a", "m", "A")
+    ro = LLMResponseCache(path, read_only=True)
+    assert ro.get("a") == "A"
+    ro.put("b", "m", "B")
+    assert ro.get("b") is None
+
+
+def test_generate_content_text_served_from_cache(tmp_path: Path, monkeypatch) -> None:
+    from semantic_topic_mapper import config
+
+    cache = LLMResponseCache(tmp_path / "c.sqlite3")
+    cache.put(LLMResponseCache.make_key(config.LLM_MODEL, "hello", 0.0, "1", "gemini"), config.LLM_MODEL, "{}")
+    monkeypatch.setattr(cache_module, "_cache", cache)
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+
+    def no_network():
+        raise AssertionError("client must not be created on a cache hit")
+
+    monkeypatch.setattr(client_module, "get_genai_client", no_network)
+    assert client_module.generate_content_text("hello") == "{}"
+    assert cache.stats.hits == 1
+
+
+def test_answers_are_reused_only_by_their_backend_and_when_complete(tmp_path: Path, monkeypatch) -> None:
+    from semantic_topic_mapper import config
+    from semantic_topic_mapper.llm import backends
+    from semantic_topic_mapper.llm.backends import BackendResponse
+
+    class _Fixed:
+        def __init__(self, name: str, finish_reason: str):
+            self.name = name
+            self.finish_reason = finish_reason
+            self.calls = 0
+
+        def generate(self, prompt: str, temperature: float) -> BackendResponse:
+            self.calls += 1
+            return BackendResponse("{}", {"candidates": [{"finish_reason": self.finish_reason, "parts": [{"text": "{}"}]}]})
+
+    monkeypatch.setattr(cache_module, "_cache", LLMResponseCache(tmp_path / "c.sqlite3"))
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    stub, live = _Fixed("stub", "FinishReason.STOP"), _Fixed("gemini", "MAX_TOKENS")
+    try:
+        backends.set_backend(stub)
+        client_module.generate_content_text("hello")
+        client_module.generate_content_text("hello")
+        backends.set_backend(live)
+        client_module.generate_content_text("hello")
+        client_module.generate_content_text("hello")
+    finally:
+        backends.set_backend(None)
+        cache_module._cache.close()
+    assert (stub.calls, live.calls) == (1, 2)  # stub answer kept for stub only; truncated answer not kept
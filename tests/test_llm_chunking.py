@@ -0,0 +1,144 @@
+r"""
+Chunked (map-reduce) LLM enrichment tests (no network).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_chunking.py -v
+"""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper import config
+from semantic_topic_mapper.entities import llm_entity_enricher as enricher
+from semantic_topic_mapper.entities.entity_models import Entity, EntityMention
+from semantic_topic_mapper.llm.chunking import batch_entities_by_chunk, pack_topic_chunks
+from semantic_topic_mapper.models.topic_models import TopicBlock, TopicID
+
+
+@pytest.fixture(autouse=True)
+def _no_knowledge_base(monkeypatch):
+    monkeypatch.setattr(config, "ENTITY_KB_ENABLED", False)
+
+
+def _blocks(spec: list[tuple[str, int]]) -> tuple[list[TopicBlock], str]:
+    """Blocks of the given (topic id, length) laid out back to back."""
+    blocks: list[TopicBlock] = []
+    text = ""
+    for raw, length in spec:
+        body = (f"{raw} ".ljust(39, "x") + "\n") * (length // 40)
+        parts = tuple(raw.split("."))
+        tid = TopicID(raw=raw, parts=parts, level=len(parts))
+        blocks.append(TopicBlock(tid, None, body, len(text), len(text) + len(body)))
+        text += body
+    return blocks, text
+
+
+def test_chunks_follow_hierarchy_and_budget() -> None:
+    blocks, text = _blocks([("1", 80), ("1.1", 80), ("2", 200), ("2.1", 400), ("2.2", 320), ("3", 80)])
+    chunks = pack_topic_chunks(blocks, text, max_tokens=100)  # 400 chars
+    assert [c.topic_ids for c in chunks] == [["1", "1.1"], ["2"], ["2.1"], ["2.2", "3"]]
+    assert all(c.end_char - c.start_char <= 400 for c in chunks)
+    assert chunks[0].start_char == 0 and chunks[-1].end_char == len(text)
+
+    # A single block over budget is split at line breaks.
+    blocks, text = _blocks([("1", 1000)])
+    pieces = pack_topic_chunks(blocks, text, max_tokens=100)
+    assert len(pieces) == 3 and all(text[p.end_char - 1] == "\n" for p in pieces)
+
+
+def _entity(eid: str, name: str, starts: list[int]) -> Entity:
+    tid = TopicID(raw="1", parts=("1",), level=1)
+    mentions = [EntityMention(tid, s, s + len(name), name, "paragraph", None) for s in starts]
+    return Entity(eid, name, None, tid, mentions)
+
+
+def test_entities_batched_by_mention_chunk() -> None:
+    blocks, text = _blocks([("1", 400), ("2", 400)])
+    chunks = pack_topic_chunks(blocks, text, max_tokens=100)
+    board = _entity("E1", "Board", [500, 10])
+    cfo = _entity("E2", "CFO", [450])
+    units = batch_entities_by_chunk([board, cfo], chunks, text, max_entities=1)
+    assert [(u.label, [e.entity_id for e in u.entities]) for u in units] == [
+        ("chunk 1/2", ["E1"]),
+        ("chunk 2/2 batch 1", ["E2"]),
+        ("chunk 2/2 batch 2", ["E1"]),
+    ]
+    assert units[1].text == text[400:800]
+
+
+def test_chunked_enrichment_reduces_per_entity(monkeypatch) -> None:
+    blocks, text = _blocks([("1", 400), ("2", 400), ("3", 400)])
+    monkeypatch.setattr(config, "LLM_CHUNK_TOKENS", 100)
+    votes = iter(["role", "organization", "organization"])
+
+    def fake(prompt: str, description: str):
+        if description.startswith("entity type enrichment"):
+            return {"entities": [{"name": "Board", "type": next(votes)}]}
+        if description.startswith("LLM relationship extraction"):
+            return {"relationships": [{"source": "Board", "target": "CFO", "relation_type": "oversees"}]}
+        return {"ambiguous_entities": [{"name": "CFO", "reason": description}]}
+
+    monkeypatch.setattr(enricher, "_stream_llm_text", lambda p, d: [json.dumps(fake(p, d))])
+    entities = [_entity("E1", "Board", [10, 410, 810]), _entity("E2", "CFO", [20, 420, 820])]
+    relationships, issues = enricher.run_entity_enrichment(
+        entities, text, concurrent=False, blocks=blocks, mode="chunked"
+    )
+    assert entities[0].entity_type == "organization"
+    assert len(relationships) == 1
+    assert [i.message for i in issues] == ["entity ambiguity detection chunk 1/3"]
+
+
+def test_snippet_units_merge_windows_and_scale_with_entities() -> None:
+    from semantic_topic_mapper.llm.snippets import SNIPPET_SEPARATOR, build_snippet_units
+
+    text = ("filler " * 200) + "the Board meets the CFO " + ("filler " * 400) + "the Board again"
+    board_at = [text.index("Board"), text.rindex("Board")]
+    cfo_at = [text.index("CFO")]
+    entities = [_entity("E1", "Board", board_at), _entity("E2", "CFO", cfo_at)]
+    (unit,) = build_snippet_units(entities, text, window_chars=30, per_entity=3)
+    assert [e.entity_id for e in unit.entities] == ["E1", "E2"]
+    first, second = unit.text.split(SNIPPET_SEPARATOR)
+    assert "the Board meets the CFO" in first  # overlapping windows merged
+    assert second.endswith("the Board again")
+    assert len(unit.text) < 200
+
+    # A tight budget splits entities into separate requests.
+    units = build_snippet_units(entities, text, window_chars=30, max_tokens=20)
+    assert [[e.entity_id for e in u.entities] for u in units] == [["E1"], ["E2"]]
+
+    plan = enricher.plan_enrichment_units(entities, text, mode="snippets")
+    assert plan.tokens_saved > 0 and plan.excerpt_chars is None
+
+
+def test_combined_enrichment_fans_out_one_response(monkeypatch) -> None:
+    calls: list[str] = []
+
+    def fake(prompt: str, description: str):
+        calls.append(description)
+        return {
+            "entities": [{"name": "Board", "type": "organization"}, {"name": "Ghost", "type": "role"}],
+            "relationships": [{"source": "Board", "target": "CFO", "relation_type": "oversees"}],
+            "ambiguous_entities": "not a list",
+        }
+
+    monkeypatch.setattr(enricher, "_stream_llm_text", lambda p, d: [json.dumps(fake(p, d))])
+    entities = [_entity("E1", "Board", [0]), _entity("E2", "CFO", [10])]
+    relationships, issues = enricher.run_entity_enrichment(
+        entities, "Board and CFO", concurrent=True, mode="prefix", combined=True
+    )
+    assert calls == ["combined entity enrichment"]
+    assert entities[0].entity_type == "organization" and entities[1].entity_type is None
+    assert [(r.source_entity_id, r.relation_type) for r in relationships] == [("E1", "oversees")]
+    assert issues == []
@@ -0,0 +1,96 @@
+r"""
+Rate limiter and concurrent entity enrichment tests (no network).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_concurrency.py -v
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper import config
+from semantic_topic_mapper.entities import llm_entity_enricher as enricher
+from semantic_topic_mapper.entities.entity_models import Entity
+from semantic_topic_mapper.llm.rate_limiter import TokenBucketRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def _no_knowledge_base(monkeypatch):
+    monkeypatch.setattr(config, "ENTITY_KB_ENABLED", False)
+
+
+def test_rate_limiter_bursts_then_waits() -> None:
+    limiter = TokenBucketRateLimiter(requests_per_minute=600)  # 10/s, burst 600
+    assert limiter.enabled
+    t0 = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - t0 < 0.05
+    assert not TokenBucketRateLimiter().enabled
+
+    tokens = TokenBucketRateLimiter(tokens_per_minute=60)  # 1 token/s
+    tokens.acquire(60)
+    t0 = time.monotonic()
+    tokens.acquire(0)  # zero-cost request still passes
+    tokens.acquire(1)
+    assert time.monotonic() - t0 >= 0.5
+
+
+def _fake_llm(monkeypatch, delay: float) -> list[str]:
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def fake(prompt: str, description: str):
+        time.sleep(delay)
+        with lock:
+            calls.append(description)
+        if description == "entity type enrichment":
+            return {"entities": [{"name": "Risk Committee", "type": "organization"}]}
+        if description == "LLM relationship extraction":
+            return {"relationships": [
+                {"source": "Risk Committee", "target": "Board", "relation_type": "reports_to"}
+            ]}
+        return {"ambiguities": []}
+
+    monkeypatch.setattr(enricher, "_stream_llm_text", lambda p, d: [json.dumps(fake(p, d))])
+    return calls
+
+
+def _entities() -> list[Entity]:
+    return [
+        Entity("E1", "Risk Committee", None, "1", []),
+        Entity("E2", "Board", None, "1", []),
+    ]
+
+
+def test_concurrent_enrichment_matches_serial(monkeypatch) -> None:
+    calls = _fake_llm(monkeypatch, delay=0.2)
+    serial_entities = _entities()
+    serial = enricher.run_entity_enrichment(serial_entities, "text", concurrent=False)
+
+    concurrent_entities = _entities()
+    t0 = time.monotonic()
+    result = enricher.run_entity_enrichment(concurrent_entities, "text", concurrent=True)
+    elapsed = time.monotonic() - t0
+
+    assert result == serial
+    assert [r.relation_type for r in result[0]] == ["reports_to"]
+    assert [e.entity_type for e in concurrent_entities] == [e.entity_type for e in serial_entities]
+    assert concurrent_entities[0].entity_type == "organization"
+    assert len(calls) == 6
+    assert elapsed < 0.5  # three 0.2 s calls overlap
+
@@ -0,0 +1,80 @@
+r"""
+Implicit reference enrichment tests: candidate pre-filtering and LLM linking
+(fake LLM; no network).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_references.py -v
+"""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.ingestion.document_index import build_document_index
+from semantic_topic_mapper.references import llm_reference_enricher as refs
+from semantic_topic_mapper.structure.header_detector import detect_headers
+from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
+
+_TEXT = """TOPIC 1: REGISTRATION
+1.1 Initial Registration
+Every firm files a registration form before trading.
+1.2 Annual Renewal
+Registrations lapse after one year.
+TOPIC 2: MARKETING
+2.1 Advertising Standards
+Advertisements must be fair.
+2.2 Client Onboarding
+Firms onboard clients only after the registration steps described above are complete.
+Advertising must follow the standards in Topic 2.1 below.
+The weather was fine, as noted above.
+"""
+
+
+def _setup():
+    index = build_document_index(_TEXT)
+    blocks = segment_into_topic_blocks(_TEXT, detect_headers(_TEXT, index))
+    return blocks, index, refs.build_title_index(blocks)
+
+
+def test_candidates_need_cue_and_title_overlap() -> None:
+    blocks, index, titles = _setup()
+    candidates = refs.select_candidates(blocks, _TEXT, index, titles)
+    assert [(c.source.topic_id.raw, c.cue) for c in candidates] == [("2.2", "above")]
+    (cand,) = candidates
+    assert cand.text.startswith("Firms onboard clients") and cand.text.endswith("complete.")
+    assert cand.targets[:2] == ["1", "1.1"]
+    assert _TEXT[cand.start_char : cand.end_char].strip() == cand.text
+
+    batches = refs.batch_candidates(candidates * 5, titles, batch_size=2)
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+
+def test_links_only_shortlisted_targets(monkeypatch) -> None:
+    blocks, index, titles = _setup()
+    prompts: list[str] = []
+
+    def fake(prompt: str, description: str):
+        prompts.append(prompt)
+        return [json.dumps({"references": [
+            {"candidate": "C1", "target": "1.1"},
+            {"candidate": "C1", "target": "1.1"},  # duplicate
+            {"candidate": "C1", "target": "2.1"},  # not shortlisted
+            {"candidate": "C9", "target": "1"},  # no such passage
+        ]})]
+
+    monkeypatch.setattr(refs, "_stream_llm_text", fake)
+    run = refs.enrich_implicit_references(blocks, _TEXT, index)
+    assert (run.candidates, run.requests) == (1, 1)
+    assert "1.1: Initial Registration" in prompts[0]
+    (ref,) = run.references
+    assert ref.relation_type == "implicit"
+    assert (ref.source_topic_id.raw, ref.target_topic_id.raw) == ("2.2", "1.1")
@@ -0,0 +1,192 @@
+r"""
+LLM deadline, retry, hedging and circuit-breaker tests (no network).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_resilience.py -v
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper import config
+from semantic_topic_mapper.entities import llm_entity_enricher as enricher
+from semantic_topic_mapper.entities.entity_models import Entity
+from semantic_topic_mapper.llm import resilience
+from semantic_topic_mapper.llm.resilience import (
+    CircuitBreaker,
+    LLMDeadlineExceeded,
+    call_with_resilience,
+    run_with_deadline,
+)
+
+
+class _ServerError(Exception):
+    code = 503
+
+
+class _BadRequest(Exception):
+    code = 400
+
+
+@pytest.fixture(autouse=True)
+def _fast_retries(monkeypatch):
+    monkeypatch.setattr(config, "LLM_RETRY_BASE_DELAY", 0.001)
+    monkeypatch.setattr(config, "LLM_MAX_RETRIES", 3)
+    monkeypatch.setattr(config, "LLM_BREAKER_THRESHOLD", 3)
+    monkeypatch.setattr(config, "LLM_BREAKER_COOLDOWN", 60)
+    monkeypatch.setattr(config, "ENTITY_KB_ENABLED", False)
+    resilience.reset_resilience_state()
+    yield
+    resilience.reset_resilience_state()
+
+
+def test_retries_transient_errors_only() -> None:
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _ServerError("unavailable")
+        return "ok"
+
+    assert call_with_resilience(flaky) == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+
+    def bad():
+        calls.append(1)
+        raise _BadRequest("invalid")
+
+    with pytest.raises(_BadRequest):
+        call_with_resilience(bad)
+    assert len(calls) == 1
+
+
+def test_deadline_and_hedge() -> None:
+    with pytest.raises(LLMDeadlineExceeded):
+        run_with_deadline(lambda: time.sleep(0.5), deadline=0.05)
+
+    started = []
+    lock = threading.Lock()
+
+    def slow_first():
+        with lock:
+            started.append(time.monotonic())
+            first = len(started) == 1
+        time.sleep(0.5 if first else 0.01)
+        return "first" if first else "hedge"
+
+    t0 = time.monotonic()
+    assert run_with_deadline(slow_first, deadline=2.0, hedge_after=0.05) == "hedge"
+    assert time.monotonic() - t0 < 0.4 and len(started) == 2
+
+
+def test_breaker_opens_and_probes() -> None:
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow() and breaker.open_count == 1
+    time.sleep(0.06)
+    assert breaker.allow() and not breaker.allow()  # one probe at a time
+    breaker.record_success()
+    assert not breaker.is_open
+
+
+def test_open_breaker_degrades_enrichment(monkeypatch) -> None:
+    from semantic_topic_mapper.llm import client as client_module
+
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+
+    class _Models:
+        def generate_content(self, **kwargs):
+            raise _ServerError("unavailable")
+
+        def generate_content_stream(self, **kwargs):
+            raise _ServerError("unavailable")
+
+    class _Client:
+        models = _Models()
+
+    monkeypatch.setattr(client_module, "get_genai_client", lambda: _Client())
+    entities = [Entity("E1", "Board", None, None, [])]
+    relationships, issues = enricher.run_entity_enrichment(
+        entities, "The Board.", concurrent=False, mode="prefix"
+    )
+    assert relationships == [] and entities[0].entity_type is None
+    assert [i.issue_type for i in issues] == ["llm_enrichment_skipped"]
+
+
+def test_non_retryable_errors_leave_the_breaker_alone(monkeypatch) -> None:
+    monkeypatch.setattr(config, "LLM_MAX_RETRIES", 0)
+
+    def fail(exc: Exception):
+        def attempt():
+            raise exc
+
+        with pytest.raises(type(exc)):
+            call_with_resilience(attempt)
+
+    fail(_ServerError("unavailable"))
+    fail(_ServerError("unavailable"))
+    fail(_BadRequest("invalid"))  # must not reset the two failures above
+    fail(_ServerError("unavailable"))
+    assert resilience.get_circuit_breaker().is_open
+
+
+def test_waiting_for_a_call_slot_does_not_count_against_the_deadline(monkeypatch) -> None:
+    from semantic_topic_mapper.llm import backends
+    from semantic_topic_mapper.llm import client as client_module
+    from semantic_topic_mapper.llm.backends import BackendResponse
+
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(config, "LLM_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(config, "LLM_TIMEOUT", 0.3)
+    monkeypatch.setattr(config, "LLM_MAX_RETRIES", 0)
+    monkeypatch.setattr(config, "LLM_HEDGE_REQUESTS", False)
+    monkeypatch.setattr(client_module, "_call_slots", None)
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    class _Slow:
+        name = "slow"
+
+        def generate(self, prompt: str, temperature: float) -> BackendResponse:
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.2)
+            with lock:
+                in_flight[0] -= 1
+            return BackendResponse("{}", {})
+
+    backends.set_backend(_Slow())
+    try:
+        results: list[str | None] = []
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(client_module.generate_content_text(f"p{i}")))
+            for i in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        backends.set_backend(None)
+        monkeypatch.setattr(client_module, "_call_slots", None)
+    assert results == ["{}"] * 3  # the third call waits 0.4 s for its slot, longer than LLM_TIMEOUT
+    assert peak[0] == 1
@@ -0,0 +1,99 @@
+r"""
+LLM telemetry tests: per-call records and per-stage aggregation (fake backend; no network).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_telemetry.py -v
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper import config
+from semantic_topic_mapper.llm import backends, cache as cache_module
+from semantic_topic_mapper.llm.backends import BackendResponse
+from semantic_topic_mapper.llm.client import generate_content_text
+from semantic_topic_mapper.llm.resilience import reset_resilience_state
+from semantic_topic_mapper.llm.telemetry import get_llm_telemetry, llm_stage
+
+
+class _Flaky:
+    """Fails the first call with a retryable error; reports usage metadata only for "metered" prompts."""
+
+    name = "flaky"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str, temperature: float) -> BackendResponse:
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("reset")
+        raw: dict = {"candidates": [{"finish_reason": "STOP", "parts": [{"text": "{}"}]}]}
+        if prompt.startswith("metered"):
+            raw["usage_metadata"] = {"prompt_token_count": 100, "candidates_token_count": 7, "thoughts_token_count": 3}
+        return BackendResponse("{}", raw)
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "LLM_CACHE_PATH", tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(config, "LLM_RETRY_BASE_DELAY", 0.0)
+    monkeypatch.setattr(cache_module, "_cache", None)
+    reset_resilience_state()
+    get_llm_telemetry().reset()
+    yield
+    backends.set_backend(None)
+    if cache_module._cache is not None:
+        cache_module._cache.close()
+    monkeypatch.setattr(cache_module, "_cache", None)
+    get_llm_telemetry().reset()
+
+
+def test_records_usage_retries_and_cache_hits_per_stage() -> None:
+    backends.set_backend(_Flaky())
+    telemetry = get_llm_telemetry()
+    telemetry.begin_document("a.txt")
+    with llm_stage("entity_types"):
+        assert generate_content_text("metered prompt") == "{}"
+        assert generate_content_text("metered prompt") == "{}"  # cache hit
+    telemetry.begin_document("b.txt")
+    with llm_stage("relationships"):
+        assert generate_content_text("x" * 40) == "{}"
+
+    first, hit, estimated = telemetry.records()
+    assert (first.attempts, first.prompt_tokens, first.response_tokens, first.tokens_estimated) == (2, 100, 10, False)
+    assert hit.cache_hit and hit.stage == "entity_types"
+    assert (estimated.prompt_tokens, estimated.tokens_estimated, estimated.document) == (10, True, "b.txt")
+
+    summary = telemetry.summary(cost_per_mtok_input=1.0, cost_per_mtok_output=10.0)
+    types = summary["stages"]["entity_types"]
+    assert (types["calls"], types["cache_hits"], types["retries"], types["total_tokens"]) == (2, 1, 1, 110)
+    assert types["cost_usd"] == pytest.approx((100 * 1.0 + 10 * 10.0) / 1e6)
+    assert list(summary["documents"]) == ["a.txt", "b.txt"]
+    assert summary["documents"]["b.txt"]["totals"]["calls"] == 1
+
+
+def test_configuration_error_is_recorded_as_failed_call() -> None:
+    class _Misconfigured:
+        name = "misconfigured"
+
+        def generate(self, prompt: str, temperature: float) -> BackendResponse:
+            raise ValueError("LLM_API_KEY is not set")
+
+    backends.set_backend(_Misconfigured())
+    with pytest.raises(ValueError):
+        generate_content_text("prompt")
+    (record,) = get_llm_telemetry().records()
+    assert not record.ok and record.response_tokens == 0
@@ -0,0 +1,134 @@
+r"""
+Bottom-up topic summary tests: level order, batching and subtree-hash caching
+(fake LLM; no network).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_topic_summaries.py -v
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper import config
+from semantic_topic_mapper.ingestion.document_index import build_document_index
+from semantic_topic_mapper.structure import llm_topic_summarizer as summarizer
+from semantic_topic_mapper.structure.duplicate_detector import find_duplicate_blocks
+from semantic_topic_mapper.structure.header_detector import detect_headers
+from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
+
+_TEXT = """TOPIC 1: REGISTRATION
+Firms register before trading.
+1.1 Initial Registration
+Every firm files a registration form.
+1.2 Annual Renewal
+Registrations lapse after one year.
+3.2 Advertising Standards
+Advertisements must be fair.
+"""
+
+
+def _nodes(text: str):
+    blocks = segment_into_topic_blocks(text, detect_headers(text, build_document_index(text)))
+    return build_topic_hierarchy(blocks)
+
+
+@pytest.fixture
+def prompts(monkeypatch, tmp_path: Path) -> list[str]:
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "LLM_SUMMARY_CACHE_PATH", tmp_path / "summaries.sqlite3")
+    monkeypatch.setattr(config, "LLM_SUMMARY_BATCH_SIZE", 2)
+    monkeypatch.setattr(summarizer, "_summary_cache", None)
+    seen: list[str] = []
+
+    def fake(prompt: str, description: str):
+        seen.append(prompt)
+        ids = re.findall(r"^### Topic (\S+):", prompt, re.MULTILINE)
+        return [json.dumps({"summaries": [{"topic_id": t, "summary": f"S{t}"} for t in ids]})]
+
+    monkeypatch.setattr(summarizer, "_stream_llm_text", fake)
+    yield seen
+    summarizer._summary_cache.close()
+    monkeypatch.setattr(summarizer, "_summary_cache", None)
+
+
+def test_leaves_first_then_parents_from_child_summaries(prompts: list[str]) -> None:
+    run = summarizer.summarize_topics(_nodes(_TEXT))
+    assert run.summaries == {t: f"S{t}" for t in ("1", "1.1", "1.2", "3", "3.2")}
+    assert (run.cached, run.requests) == (0, 3)  # leaves in two batches, then 1 and synthetic 3
+    leaf_prompts, (parents,) = prompts[:2], prompts[2:]
+    assert all("Subtopic summaries" not in p for p in leaf_prompts)
+    assert "- 1.1 Initial Registration: S1.1" in parents and "Firms register before trading." in parents
+    assert "### Topic 3: (untitled)\nText: (none; heading only)" in parents
+
+
+def test_only_changed_subtrees_are_resummarized(prompts: list[str]) -> None:
+    summarizer.summarize_topics(_nodes(_TEXT))
+    prompts.clear()
+    run = summarizer.summarize_topics(_nodes(_TEXT.replace("lapse after one year", "lapse yearly")))
+    assert run.cached == 3  # 1.1, 3.2 and 3 unchanged
+    assert [re.findall(r"^### Topic (\S+):", p, re.MULTILINE) for p in prompts] == [["1.2"], ["1"]]
+
+
+def test_verbatim_repeat_leaf_reuses_first_summary(prompts: list[str]) -> None:
+    text = _TEXT.replace("Advertisements must be fair.", "Every firm files a registration form.")
+    blocks = segment_into_topic_blocks(text, detect_headers(text, build_document_index(text)))
+    duplicates = find_duplicate_blocks(blocks, shingle_words=2, threshold=0.8, min_words=3)
+    assert [(d.topic_id.raw, d.canonical_topic_id.raw, d.exact) for d in duplicates] == [("3.2", "1.1", True)]
+    run = summarizer.summarize_topics(build_topic_hierarchy(blocks), duplicates)
+    assert run.summaries["3.2"] == "S1.1" and run.reused == 1
+    assert all("### Topic 3.2:" not in p for p in prompts)
+
+
+def test_parent_with_missing_child_summary_is_not_cached(prompts: list[str], monkeypatch) -> None:
+    fake = summarizer._stream_llm_text
+
+    def omit_1_2(prompt: str, description: str):
+        return [re.sub(r'\{"topic_id": "1\.2", "summary": "S1\.2"\},? ?', "", fake(prompt, description)[0])]
+
+    monkeypatch.setattr(summarizer, "_stream_llm_text", omit_1_2)
+    assert "1.2" not in summarizer.summarize_topics(_nodes(_TEXT)).summaries
+    monkeypatch.setattr(summarizer, "_stream_llm_text", fake)
+    prompts.clear()
+    run = summarizer.summarize_topics(_nodes(_TEXT))
+    assert [re.findall(r"^### Topic (\S+):", p, re.MULTILINE) for p in prompts] == [["1.2"], ["1"]]
+    assert run.summaries["1"] == "S1"
+
+
+def test_heading_only_child_does_not_keep_parent_uncached(prompts: list[str]) -> None:
+    text = _TEXT.replace("3.2 Advertising", "1.3 Reserved\n3.2 Advertising")
+    first = summarizer.summarize_topics(_nodes(text))
+    assert "1.3" not in first.summaries and first.summaries["1"] == "S1"
+    prompts.clear()
+    run = summarizer.summarize_topics(_nodes(text))
+    assert prompts == [] and run.cached == 5
+
+
+def test_stub_summaries_are_not_served_to_live_runs(prompts: list[str], monkeypatch) -> None:
+    from semantic_topic_mapper.llm import backends
+
+    class _Stub:
+        name = "stub"
+
+    monkeypatch.setattr(config, "LLM_BACKEND", "gemini")
+    backends.set_backend(_Stub())
+    try:
+        summarizer.summarize_topics(_nodes(_TEXT))
+    finally:
+        backends.set_backend(None)
+    prompts.clear()
+    run = summarizer.summarize_topics(_nodes(_TEXT))
+    assert run.cached == 0 and len(prompts) == 3
@@ -0,0 +1,69 @@
+r"""
+Streaming LLM response validation tests (no network).
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_llm_validator.py -v
+"""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.llm.schemas import validate_item
+from semantic_topic_mapper.llm.validator import StreamingItemParser, iter_response_items
+
+_SECTIONS = ("entities", "relationships", "ambiguous_entities")
+
+
+def _response() -> str:
+    body = json.dumps({
+        "note": "ignored [ { ] }",
+        "entities": [
+            {"name": 'The "Board" \\ Chair', "type": "role"},
+            {"name": "Ghost", "type": "planet"},
+            "not an object",
+        ],
+        "relationships": [{"source": "A", "target": "B", "relation_type": "oversees", "extra": 1}],
+        "other": [{"name": "X", "type": "role"}],
+        "ambiguous_entities": [{"name": "A", "reason": 7}, {"name": "", "reason": "x"}],
+    })
+    return "Here you go:\n```json\n" + body + "\n```\n"
+
+
+def test_items_identical_for_any_chunking() -> None:
+    text = _response()
+    whole = [(s, i.model_dump()) for s, i in iter_response_items([text], _SECTIONS)]
+    assert whole == [
+        ("entities", {"name": 'The "Board" \\ Chair', "type": "role"}),
+        ("relationships", {"source": "A", "target": "B", "relation_type": "oversees"}),
+        ("ambiguous_entities", {"name": "A", "reason": "7"}),
+    ]
+    for size in (1, 2, 5, 17):
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        assert [(s, i.model_dump()) for s, i in iter_response_items(chunks, _SECTIONS)] == whole
+
+
+def test_items_emitted_before_response_ends() -> None:
+    parser = StreamingItemParser(["entities"])
+    assert parser.feed('{"entities": [{"name": "A", "type": "role"}, {"na') == [
+        ("entities", {"name": "A", "type": "role"})
+    ]
+    assert parser.feed('me": "B", "type": "other"}') == [("entities", {"name": "B", "type": "other"})]
+    assert not parser.complete
+    parser.feed("]}")
+    assert parser.complete and len(parser._buf) < 10  # consumed text is not kept
+
+    truncated = StreamingItemParser(["entities"])
+    truncated.feed('{"entities": [{"name": "A", "type": "role"}, {"name": "B", "ty')
+    assert truncated.saw_object and not truncated.complete
+    assert validate_item("entities", {"name": "A", "type": "role"}) is not None
+    assert validate_item("unknown", {"name": "A"}) is None
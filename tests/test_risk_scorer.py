@@ -0,0 +1,100 @@
+r"""
+Topic risk scorer tests: signal columns, weighted ranking, NumPy/fallback parity, CSV export.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_risk_scorer.py -v
+"""
+from __future__ import annotations
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.audit import risk_scorer
+from semantic_topic_mapper.audit.ambiguity_detector import AuditIssue
+from semantic_topic_mapper.audit.risk_scorer import build_risk_features, parse_risk_weights, rank_topic_risk
+from semantic_topic_mapper.entities.entity_models import Entity, EntityMention
+from semantic_topic_mapper.models.reference_models import TopicReference
+from semantic_topic_mapper.models.topic_models import TopicBlock
+from semantic_topic_mapper.outputs.topic_risk_exporter import export_topic_risk
+from semantic_topic_mapper.references.reference_graph_builder import ReferenceIssue
+from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.topic_id_parser import parse_topic_id
+
+
+def _fixture():
+    texts = {"1": "1 Scope\nshort", "2": "2 Duties\n" + "x" * 400, "3": "3 Misc\nsome text here"}
+    blocks, start = [], 0
+    for raw, text in texts.items():
+        blocks.append(TopicBlock(parse_topic_id(raw), text.split("\n")[0][2:], text, start, start + len(text)))
+        start += len(text) + 1
+    nodes = build_topic_hierarchy(blocks)
+    t = parse_topic_id
+    references = [
+        TopicReference(t("2"), t("1"), "explicit", 0, 5, "paragraph"),
+        TopicReference(t("3"), t("1"), "explicit", 0, 5, "paragraph"),
+    ]
+    reference_issues = [ReferenceIssue(t("2"), t("9"), "missing_topic", 10, 15)]
+
+    def entity(eid: str, defined: bool, *topics: str) -> Entity:
+        mentions = [EntityMention(t(raw), 0, 1, eid, "paragraph", None) for raw in topics]
+        return Entity(eid, eid, None, t(topics[0]), mentions, "def" if defined else None)
+
+    entities = [entity("A", False, "3", "3"), entity("B", True, "3", "1")]
+    issues = [
+        AuditIssue("undefined_entity", "warning", "A undefined", t("3"), None, None),
+        AuditIssue("missing_topic", "error", "broken", t("2"), None, None),
+    ]
+    return nodes, references, reference_issues, entities, issues
+
+
+def test_feature_columns_aligned_to_topics() -> None:
+    features = build_risk_features(*_fixture())
+    assert features.topic_ids == ["1", "2", "3"]
+    columns = {name: [float(v) for v in col] for name, col in features.columns.items()}
+    assert columns["in_degree"] == [2.0, 0.0, 0.0]
+    assert columns["broken_refs"] == [0.0, 1.0, 0.0]
+    assert columns["undefined_entity_density"] == [0.0, 0.0, 0.5]
+    assert columns["ambiguity_issues"] == [0.0, 0.0, 1.0]  # reference issue types counted as broken_refs
+    assert columns["text_length"][1] > columns["text_length"][2] > columns["text_length"][0]
+
+
+def test_weights_change_ranking_and_fallback_matches(monkeypatch: pytest.MonkeyPatch) -> None:
+    rows = rank_topic_risk(*_fixture(), weights=parse_risk_weights(""))
+    assert [r.rank for r in rows] == [1, 2, 3]
+    assert all(0.0 <= r.score <= 1.0 for r in rows)
+    assert rows[0].topic_id == "3"
+    only_in_degree = parse_risk_weights(
+        "in_degree=1,broken_refs=0,undefined_entity_density=0,ambiguity_issues=0,text_length=0"
+    )
+    assert rank_topic_risk(*_fixture(), weights=only_in_degree)[0].topic_id == "1"
+
+    monkeypatch.setattr(risk_scorer, "np", None)
+    fallback = rank_topic_risk(*_fixture(), weights=parse_risk_weights(""))
+    assert [(r.topic_id, r.score, r.features) for r in fallback] == [(r.topic_id, r.score, r.features) for r in rows]
+
+    with pytest.raises(ValueError):
+        parse_risk_weights("length=1")
+    for bad in ("broken_refs=-1", "broken_refs=inf", "broken_refs=nan"):
+        with pytest.raises(ValueError):
+            parse_risk_weights(bad)
+
+
+def test_export_ranked_csv(tmp_path: Path) -> None:
+    path = tmp_path / "topic_risk.csv"
+    export_topic_risk(rank_topic_risk(*_fixture()), str(path))
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["rank"] for r in rows] == ["1", "2", "3"]
+    assert rows[0]["topic_id"] == "3" and rows[0]["undefined_entity_density"] == "0.5"
+    assert float(rows[0]["score"]) >= float(rows[1]["score"]) >= float(rows[2]["score"])
@@ -0,0 +1,85 @@
+r"""
+Unresolved-obligation rule tests: candidates around "specified"/"prescribed", resolution by index lookups.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_unresolved_detector.py -v
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.audit.ambiguity_detector import audit_document
+from semantic_topic_mapper.audit.unresolved_detector import UnresolvedObligationRule
+from semantic_topic_mapper.entities.definition_linker import link_entity_definitions
+from semantic_topic_mapper.entities.deterministic_entity_detector import detect_entities
+from semantic_topic_mapper.ingestion.document_index import build_document_index
+from semantic_topic_mapper.references.reference_detector import detect_references
+from semantic_topic_mapper.structure.header_detector import detect_headers
+from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.segmenter import segment_into_topic_blocks
+
+_TEXT = """1 Definitions
+"Filing Period" means the thirty days after each quarter end.
+2 Filings
+Firms file the form prescribed by the Regulator within the filing period specified in Topic 1.
+Reports follow the layout specified in Appendix C and the template set out in Schedule A.
+Corrections are made within specified timeframes. Each filing is approved by the Regulator.
+3 Schedule A Template
+The template lists the required fields.
+"""
+
+
+def _issues(text: str):
+    index = build_document_index(text)
+    blocks = segment_into_topic_blocks(text, detect_headers(text, index))
+    entities = detect_entities(blocks, workers=1)
+    link_entity_definitions(entities, blocks, index)
+    run = audit_document(
+        build_topic_hierarchy(blocks), [], entities, detect_references(blocks), blocks, text,
+        rules=[UnresolvedObligationRule()],
+    )
+    return run.issues
+
+
+def test_unresolved_obligations_reported_once_each() -> None:
+    issues = _issues(_TEXT)
+    assert [(i.topic_id.raw, i.message) for i in issues] == [
+        ("2", '"form prescribed by the Regulator": no definition or value is given for "form"; Regulator is not defined either.'),
+        ("2", '"layout specified in Appendix C" points at Appendix C, which the document does not contain.'),
+        ("2", '"specified timeframes": no definition or value is given for "timeframes".'),
+    ]
+    first = issues[0]
+    assert _TEXT[first.start_char : first.end_char] == "form prescribed by the Regulator"
+
+
+def test_definitions_and_targets_resolve_candidates() -> None:
+    text = _TEXT.replace("the form prescribed", "the Filing Period prescribed").replace(
+        "Appendix C", "Schedule A"
+    )
+    messages = [i.message for i in _issues(text)]
+    assert messages == ['"specified timeframes": no definition or value is given for "timeframes".']
+
+
+def test_internal_pointers_and_general_sources_are_not_flagged() -> None:
+    text = _TEXT.split("2 Filings")[0] + """2 Conditions
+The conditions set out below apply.
+The duties set out in this Topic apply.
+Notices are given in the manner specified in writing.
+Interest accrues at the rates prescribed by law.
+"""
+    assert _issues(text) == []
+
+
+def test_container_title_with_punctuation_resolves() -> None:
+    text = _TEXT + "4 Appendix C: Report Format\nThe layout of each report.\n"
+    messages = [i.message for i in _issues(text)]
+    assert not any("Appendix C" in m for m in messages)
@@ -0,0 +1,73 @@
+r"""
+Vague-language rule tests: trie-compiled lexicon, longest-phrase matches, topic/subclause attribution.
+
+Run from project root with PYTHONPATH including src:
+
+    $env:PYTHONPATH = "src"
+    python -m pytest tests/test_vague_language.py -v
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Ensure src is on path when run from project root
+_root = Path(__file__).resolve().parents[1]
+_src = _root / "src"
+if _src.exists() and str(_src) not in sys.path:
+    sys.path.insert(0, str(_src))
+
+from semantic_topic_mapper.audit.ambiguity_detector import audit_document
+from semantic_topic_mapper.audit.vague_language import (
+    VagueLanguageRule,
+    compile_phrase_pattern,
+    load_vague_lexicon,
+)
+from semantic_topic_mapper.models.topic_models import Subclause, TopicBlock
+from semantic_topic_mapper.structure.hierarchy_builder import build_topic_hierarchy
+from semantic_topic_mapper.structure.topic_id_parser import parse_topic_id
+
+
+def test_lexicon_compiles_to_longest_whole_word_matches() -> None:
+    pattern = compile_phrase_pattern(("reasonabl*", "reasonable steps", "as soon as possible", "as soon as practicable", "and/or"))
+    text = "Take Reasonable\n  steps, act reasonably, as soon as practicable and/or as soon as we can; unreasonable."
+    assert [" ".join(m.group(0).split()) for m in pattern.finditer(text)] == [
+        "Reasonable steps",
+        "reasonably",
+        "as soon as practicable",
+        "and/or",
+    ]
+    assert compile_phrase_pattern(()) is None
+
+
+def test_load_lexicon_file(tmp_path: Path) -> None:
+    path = tmp_path / "lexicon.txt"
+    path.write_text("# hedges\npromptly\n\nwhere appropriate  # common\n", encoding="utf-8")
+    assert load_vague_lexicon(path) == ("promptly", "where appropriate")
+    assert "promptly" in load_vague_lexicon(None)
+
+
+def test_issues_attributed_to_topic_and_subclause() -> None:
+    sections = [
+        ("1", "1 Duties\nAct promptly.\n(a) Keep records where appropriate.\n"),
+        ("2", "2 Reports\nFile reports as needed.\n"),
+    ]
+    text, blocks = "", []
+    for raw, body in sections:
+        blocks.append(TopicBlock(parse_topic_id(raw), body.split("\n")[0][2:], body, len(text), len(text) + len(body)))
+        text += body
+    nodes = build_topic_hierarchy(blocks)
+    rule = VagueLanguageRule(["promptly", "where appropriate", "as needed"])
+    issues = audit_document(nodes, [], [], blocks=blocks, text=text, rules=[rule]).issues
+    assert [(i.topic_id.raw, i.message) for i in issues] == [
+        ("1", 'Vague wording "promptly" in 1.'),
+        ("1", 'Vague wording "where appropriate" in 1(a).'),
+        ("2", 'Vague wording "as needed" in 2.'),
+    ]
+    assert text[issues[1].start_char : issues[1].end_char] == "where appropriate"
+
+    # Segmenter-provided subclauses take precedence over line labels.
+    start = text.index("Act")
+    blocks[0].subclauses = [Subclause("x", "Act promptly.", start, start + 13)]
+    issues = audit_document(nodes, [], [], blocks=blocks, text=text, rules=[rule]).issues
+    assert [i.message for i in issues][:2] == ['Vague wording "promptly" in 1(x).', 'Vague wording "where appropriate" in 1.']